@@ -16,3 +16,17 @@ class RankSuite(object):
 
     def time_filter(self, filter, shape):
         getattr(rank, filter)(self.image, self.selem)
+
+
+class RankMedianMethodSuite(object):
+
+    param_names = ["method", "radius"]
+    params = [['sliding', 'constant_time'], [5, 30]]
+
+    def setup(self, method, radius):
+        self.image = np.random.randint(0, 4095, size=(512, 512),
+                                       dtype=np.uint16)
+        self.selem = np.ones((2 * radius + 1, 2 * radius + 1), dtype=np.uint8)
+
+    def time_median(self, method, radius):
+        rank.median(self.image, self.selem, method=method)
@@ -0,0 +1,57 @@
+"""Discrete Fourier transforms preserving single precision.
+
+`scipy.fft` (scipy >= 1.4) computes the transforms of single precision
+arrays in single precision and can use several workers. With older versions
+of scipy, `numpy.fft` is used instead: the transforms are then computed in
+double precision and cast back to the precision of the input.
+"""
+
+import numpy as np
+
+try:
+    from scipy import fft as _fft
+    _has_scipy_fft = True
+except ImportError:
+    _fft = np.fft
+    _has_scipy_fft = False
+
+# next_fast_len was implemented in scipy 0.18
+# In case it cannot be imported, we use the id function
+try:
+    from scipy.fftpack import next_fast_len
+except ImportError:
+    next_fast_len = lambda size: size
+
+
+def _complex_dtype(dtype):
+    """Complex dtype matching the precision of the real `dtype`."""
+    return np.result_type(dtype, np.complex64)
+
+
+def _transform(name, a, s, axes, workers, out_dtype):
+    func = getattr(_fft, name)
+    if _has_scipy_fft:
+        return func(a, s=s, axes=axes, workers=workers)
+    return func(a, s=s, axes=axes).astype(out_dtype, copy=False)
+
+
+def fftn(a, s=None, axes=None, workers=None):
+    """N-D discrete Fourier transform, see `numpy.fft.fftn`."""
+    return _transform('fftn', a, s, axes, workers, _complex_dtype(a.dtype))
+
+
+def ifftn(a, s=None, axes=None, workers=None):
+    """N-D inverse discrete Fourier transform, see `numpy.fft.ifftn`."""
+    return _transform('ifftn', a, s, axes, workers, _complex_dtype(a.dtype))
+
+
+def rfftn(a, s=None, axes=None, workers=None):
+    """N-D discrete Fourier transform of a real array, see
+    `numpy.fft.rfftn`."""
+    return _transform('rfftn', a, s, axes, workers, _complex_dtype(a.dtype))
+
+
+def irfftn(a, s=None, axes=None, workers=None):
+    """Inverse of `rfftn`, see `numpy.fft.irfftn`."""
+    out_dtype = np.finfo(_complex_dtype(a.dtype)).dtype
+    return _transform('irfftn', a, s, axes, workers, out_dtype)
@@ -0,0 +1,23 @@
+import numpy as np
+from skimage._shared.fft import fftn, ifftn, rfftn, irfftn
+from skimage._shared.testing import assert_almost_equal
+from skimage._shared import testing
+
+
+@testing.parametrize('dtype', [np.float32, np.float64])
+def test_fft_precision(dtype):
+    np.random.seed(0)
+    image = np.random.rand(10, 12).astype(dtype)
+    complex_dtype = np.result_type(dtype, np.complex64)
+
+    spectrum = rfftn(image, s=(16, 12))
+    assert spectrum.dtype == complex_dtype
+    assert_almost_equal(spectrum, np.fft.rfftn(image, s=(16, 12)), decimal=4)
+    result = irfftn(spectrum, s=(16, 12))
+    assert result.dtype == dtype
+    assert_almost_equal(result[:10], image, decimal=5)
+
+    spectrum = fftn(image, axes=(1,))
+    assert spectrum.dtype == complex_dtype
+    assert_almost_equal(spectrum, np.fft.fftn(image, axes=(1,)), decimal=4)
+    assert_almost_equal(ifftn(spectrum, axes=(1,)), image, decimal=5)
@@ -1,7 +1,7 @@
 from ._canny import canny
 from ._cascade import Cascade
 from ._daisy import daisy
-from ._hog import hog
+from ._hog import hog, hog_batch, hog_windows
 from .texture import (greycomatrix, greycoprops,
                       local_binary_pattern,
                       multiblock_lbp,
@@ -15,13 +15,14 @@ from .corner import (corner_kitchen_rosenfeld, corner_harris,
                      hessian_matrix_eigvals, hessian_matrix_det,
                      corner_moravec, corner_orientations,
                      shape_index)
-from .template import match_template
-from .register_translation import register_translation
-from .masked_register_translation import masked_register_translation
+from .template import match_template, match_templates, TemplateMatcher
+from .register_translation import register_translation, TranslationRegistrar
+from .masked_register_translation import (masked_register_translation,
+                                          MaskedTranslationRegistrar)
 from .brief import BRIEF
 from .censure import CENSURE
 from .orb import ORB
-from .match import match_descriptors
+from .match import match_descriptors, DescriptorIndex
 from .util import plot_matches
 from .blob import blob_dog, blob_log, blob_doh
 from .haar import (haar_like_feature, haar_like_feature_coord,
@@ -32,6 +33,8 @@ __all__ = ['canny',
            'Cascade',
            'daisy',
            'hog',
+           'hog_batch',
+           'hog_windows',
            'greycomatrix',
            'greycoprops',
            'local_binary_pattern',
@@ -54,12 +57,17 @@ __all__ = ['canny',
            'corner_fast',
            'corner_orientations',
            'match_template',
+           'match_templates',
+           'TemplateMatcher',
            'register_translation',
+           'TranslationRegistrar',
            'masked_register_translation',
+           'MaskedTranslationRegistrar',
            'BRIEF',
            'CENSURE',
            'ORB',
            'match_descriptors',
+           'DescriptorIndex',
            'plot_matches',
            'blob_dog',
            'blob_doh',
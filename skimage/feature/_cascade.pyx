@@ -8,7 +8,6 @@
 import numpy as np
 cimport numpy as cnp
 cimport safe_openmp as openmp
-from safe_openmp cimport have_openmp
 from libc.stdlib cimport malloc, free
 from libcpp.vector cimport vector
 from skimage._shared.transform cimport integrate
@@ -393,6 +392,13 @@ cdef float rect_intersection_score(Detection rect_a, Detection rect_b):
     return intersection_area / smaller_area
 
 
+def _get_num_threads(num_threads):
+    """Number of threads to use, OpenMP's default if `num_threads` is None."""
+    if num_threads is None:
+        return openmp.omp_get_max_threads()
+    return max(1, num_threads)
+
+
 cdef class Cascade:
     """Class for cascade of classifiers that is used for object detection.
 
@@ -618,10 +624,146 @@ cdef class Cascade:
 
         return int_img
 
+    def _get_scale_table(self, img_shape, float scale_factor,
+                         float step_ratio, min_size, max_size):
+        """Get the search windows of each scale and the rows to search.
+
+        Parameters
+        ----------
+        img_shape : tuple (int, int)
+            Shape of the searched images.
+        scale_factor : float
+            The scale by which searching window is multiplied on each step.
+        step_ratio : float
+            The ratio by which the search step in multiplied on each scale
+            of the image.
+        min_size : typle (int, int)
+            Minimum size of the search window.
+        max_size : typle (int, int)
+            Maximum size of the search window.
+
+        Returns
+        -------
+        scale_factors : 1-D floats ndarray
+            Scale factor of each scale.
+        windows : (S, 3) ndarray
+            Step, height and width of the search window of each scale.
+        rows : (R, 2) ndarray
+            Scale number and row of each row of windows to search, by
+            increasing scale and row.
+        """
+
+        cdef:
+            Py_ssize_t scale_number
+            Py_ssize_t current_step
+            Py_ssize_t current_height
+            Py_ssize_t current_width
+            Py_ssize_t max_row
+            Py_ssize_t max_col
+            float current_scale_factor
+            float[::1] scale_factors
+
+        scale_factors = self._get_valid_scale_factors(min_size, max_size,
+                                                      scale_factor)
+        windows = np.empty((scale_factors.shape[0], 3), dtype=np.intp)
+        rows = []
+
+        for scale_number in range(scale_factors.shape[0]):
+
+            current_scale_factor = scale_factors[scale_number]
+            current_step = <Py_ssize_t>round(current_scale_factor * step_ratio)
+            current_height = <Py_ssize_t>(self.window_height * current_scale_factor)
+            current_width = <Py_ssize_t>(self.window_width * current_scale_factor)
+            windows[scale_number] = (current_step, current_height,
+                                     current_width)
+            max_row = img_shape[0] - current_height
+            max_col = img_shape[1] - current_width
+
+            # Check if scaled detection window fits in image.
+            if (max_row < 0) or (max_col < 0) or current_step < 1:
+                continue
+
+            scale_rows = np.empty((len(range(0, max_row, current_step)), 2),
+                                  dtype=np.intp)
+            scale_rows[:, 0] = scale_number
+            scale_rows[:, 1] = np.arange(0, max_row, current_step)
+            rows.append(scale_rows)
+
+        if rows:
+            rows = np.ascontiguousarray(np.concatenate(rows))
+        else:
+            rows = np.empty((0, 2), dtype=np.intp)
+
+        return np.asarray(scale_factors), windows, rows
+
+    cdef vector[Detection] _detect(self, float[:, ::1] int_img,
+                                   float[::1] scale_factors,
+                                   Py_ssize_t[:, ::1] windows,
+                                   Py_ssize_t[:, ::1] rows,
+                                   int num_threads):
+        """Classify all the search windows of the rows of a scale table.
+
+        The rows are searched in parallel, each row collecting its detections
+        in its own buffer, and the buffers are concatenated in the order of
+        the rows, so that the detections do not depend on the number of
+        threads.
+        """
+
+        cdef:
+            Py_ssize_t row_number
+            Py_ssize_t scale_number
+            Py_ssize_t current_row
+            Py_ssize_t current_col
+            Py_ssize_t current_step
+            Py_ssize_t current_height
+            Py_ssize_t current_width
+            Py_ssize_t max_col
+            Py_ssize_t img_width = int_img.shape[1]
+            Py_ssize_t number_of_rows = rows.shape[0]
+            vector[vector[Detection]] row_detections
+            vector[Detection] output
+            Detection new_detection
+
+        row_detections.resize(number_of_rows)
+
+        # As the amount of work between the rows is not equal we use `dynamic`
+        # schedule which enables the threads to use computing power on demand.
+        for row_number in prange(number_of_rows, schedule='dynamic',
+                                 num_threads=num_threads, nogil=True):
+
+            scale_number = rows[row_number, 0]
+            current_row = rows[row_number, 1]
+            current_step = windows[scale_number, 0]
+            current_height = windows[scale_number, 1]
+            current_width = windows[scale_number, 2]
+            max_col = img_width - current_width
+
+            current_col = 0
+            while current_col < max_col:
+
+                if self.classify(int_img, current_row, current_col,
+                                 scale_factors[scale_number]):
+
+                    new_detection = Detection()
+                    new_detection.r = current_row
+                    new_detection.c = current_col
+                    new_detection.width = current_width
+                    new_detection.height = current_height
+
+                    row_detections[row_number].push_back(new_detection)
+
+                current_col = current_col + current_step
+
+        for row_number in range(number_of_rows):
+            output.insert(output.end(), row_detections[row_number].begin(),
+                          row_detections[row_number].end())
+
+        return output
 
     def detect_multi_scale(self, img, float scale_factor, float step_ratio,
                            min_size, max_size, min_neighbour_number=4,
-                           intersection_score_threshold=0.5):
+                           intersection_score_threshold=0.5,
+                           num_threads=None):
         """Search for the object on multiple scales of input image.
 
         The function takes the input image, the scale factor by which the
@@ -652,6 +794,9 @@ cdef class Cascade:
             The minimum value of value of ratio
             (intersection area) / (small rectangle ratio) in order to merge
             two detections into one.
+        num_threads : int, optional
+            Number of threads searching the windows. By default, the number
+            of threads of OpenMP is used.
 
         Returns
         -------
@@ -662,91 +807,87 @@ cdef class Cascade:
             'height' - height of detected window.
         """
 
-        cdef:
-            Py_ssize_t max_row
-            Py_ssize_t max_col
-            Py_ssize_t current_height
-            Py_ssize_t current_width
-            Py_ssize_t current_row
-            Py_ssize_t current_col
-            Py_ssize_t current_step
-            Py_ssize_t number_of_scales
-            Py_ssize_t img_height
-            Py_ssize_t img_width
-            Py_ssize_t scale_number
-            Py_ssize_t window_height = self.window_height
-            Py_ssize_t window_width = self.window_width
-            int result
-            float[::1] scale_factors
-            float[:, ::1] int_img
-            float current_scale_factor
-            vector[Detection] output
-            Detection new_detection
+        cdef vector[Detection] output
 
         int_img = self._get_contiguous_integral_image(img)
-        img_height = int_img.shape[0]
-        img_width = int_img.shape[1]
-
-        scale_factors = self._get_valid_scale_factors(min_size, max_size, scale_factor)
-        number_of_scales = scale_factors.shape[0]
+        scale_factors, windows, rows = self._get_scale_table(
+            int_img.shape, scale_factor, step_ratio, min_size, max_size)
 
-        # Initialize lock to enable thread-safe writes to the array
-        # in concurrent loop.
-        cdef openmp.omp_lock_t mylock
-
-        if have_openmp:
-            openmp.omp_init_lock(&mylock)
-
-
-        # As the amount of work between the threads is not equal we use `dynamic`
-        # schedule which enables them to use computing power on demand.
-        for scale_number in prange(0, number_of_scales, schedule='dynamic', nogil=True):
-
-            current_scale_factor = scale_factors[scale_number]
-            current_step = <Py_ssize_t>round(current_scale_factor * step_ratio)
-            current_height = <Py_ssize_t>(window_height * current_scale_factor)
-            current_width = <Py_ssize_t>(window_width * current_scale_factor)
-            max_row = img_height - current_height
-            max_col = img_width - current_width
+        output = self._detect(int_img, scale_factors, windows, rows,
+                              _get_num_threads(num_threads))
 
-            # Check if scaled detection window fits in image.
-            if (max_row < 0) or (max_col < 0):
-                continue
-
-            current_row = 0
-            current_col = 0
-
-            while current_row < max_row:
-                while current_col < max_col:
+        return list(_group_detections(output, intersection_score_threshold,
+                                      min_neighbour_number))
 
-                    result = self.classify(int_img, current_row, current_col, scale_factors[scale_number])
+    def detect_multi_scale_video(self, frames, float scale_factor,
+                                 float step_ratio, min_size, max_size,
+                                 min_neighbour_number=4,
+                                 intersection_score_threshold=0.5,
+                                 num_threads=None):
+        """Search for the object on multiple scales of each frame of a video.
 
-                    if result:
+        Gives the detections of `detect_multi_scale` for each frame. The
+        search windows of each scale and the integral image buffers are only
+        computed when the shape of the frames changes, instead of once per
+        frame.
 
-                        new_detection = Detection()
-                        new_detection.r = current_row
-                        new_detection.c = current_col
-                        new_detection.width = current_width
-                        new_detection.height = current_height
+        Parameters
+        ----------
+        frames : iterable of 2-D or 3-D ndarrays
+            Frames of the video, e.g. a stack of frames or a generator
+            reading them.
+        scale_factor : float
+            The scale by which searching window is multiplied on each step.
+        step_ratio : float
+            The ratio by which the search step in multiplied on each scale
+            of the image, see `detect_multi_scale`.
+        min_size : typle (int, int)
+            Minimum size of the search window.
+        max_size : typle (int, int)
+            Maximum size of the search window.
+        min_neighbour_number : int
+            Minimum amount of intersecting detections in order for detection
+            to be approved by the function.
+        intersection_score_threshold : float
+            The minimum value of value of ratio
+            (intersection area) / (small rectangle ratio) in order to merge
+            two detections into one.
+        num_threads : int, optional
+            Number of threads searching the windows. By default, the number
+            of threads of OpenMP is used.
 
-                        if have_openmp:
-                            openmp.omp_set_lock(&mylock)
+        Yields
+        ------
+        output : list of dicts
+            Detections in the frame, in the format of `detect_multi_scale`.
+        """
 
-                        output.push_back(new_detection)
+        cdef vector[Detection] output
+        cdef int threads = _get_num_threads(num_threads)
 
-                        if have_openmp:
-                            openmp.omp_unset_lock(&mylock)
+        shape = None
+        for frame in frames:
+            frame = np.asarray(frame)
+            if len(frame.shape) > 2:
+                frame = rgb2gray(frame)
 
-                    current_col = current_col + current_step
+            if frame.shape != shape:
+                shape = frame.shape
+                scale_factors, windows, rows = self._get_scale_table(
+                    shape, scale_factor, step_ratio, min_size, max_size)
+                int_img_sum = np.empty(shape, dtype=np.float64)
+                int_img = np.empty(shape, dtype=np.float32)
 
-                current_row = current_row + current_step
-                current_col = 0
+            # Same as `_get_contiguous_integral_image`, in the buffers.
+            np.cumsum(frame, axis=0, out=int_img_sum)
+            np.cumsum(int_img_sum, axis=1, out=int_img_sum)
+            int_img[...] = int_img_sum
 
-        if have_openmp:
-            openmp.omp_destroy_lock(&mylock)
+            output = self._detect(int_img, scale_factors, windows, rows,
+                                  threads)
 
-        return list(_group_detections(output, intersection_score_threshold,
-                                      min_neighbour_number))
+            yield list(_group_detections(output, intersection_score_threshold,
+                                         min_neighbour_number))
 
     def _load_xml(self, xml_file, eps=1e-5):
         """Load the parameters of cascade classifier into the class.
@@ -293,3 +293,326 @@ def hog(image, orientations=9, pixels_per_cell=(8, 8), cells_per_block=(3, 3),
         return normalized_blocks, hog_image
     else:
         return normalized_blocks
+
+
+# number of pixels whose gradients are computed at a time by hog_batch
+_HOG_BATCH_PIXELS = 1 << 22
+
+
+def _hog_stack_gradient(images, multichannel):
+    """Gradient magnitudes and orientations of a stack of images.
+
+    Parameters
+    ----------
+    images : (N, M, P[, C]) ndarray
+        Stack of images, of float dtype.
+    multichannel : bool
+        Whether the last axis of `images` holds channels, in which case the
+        gradient of the channel with the highest gradient magnitude is used
+        at each pixel.
+
+    Returns
+    -------
+    magnitude, orientation : (N, M, P) ndarray
+        Gradient magnitude and orientation in degrees in ``[0, 180)``, as
+        computed by `hog`.
+    """
+    g_row = np.zeros(images.shape, dtype=np.double)
+    g_row[:, 1:-1] = images[:, 2:] - images[:, :-2]
+    g_col = np.zeros(images.shape, dtype=np.double)
+    g_col[:, :, 1:-1] = images[:, :, 2:] - images[:, :, :-2]
+
+    if multichannel:
+        # For each pixel select the channel with the highest gradient
+        # magnitude
+        idcs_max = np.hypot(g_row, g_col).argmax(axis=-1)
+        nn, rr, cc = np.ogrid[:images.shape[0], :images.shape[1],
+                              :images.shape[2]]
+        g_row = g_row[nn, rr, cc, idcs_max]
+        g_col = g_col[nn, rr, cc, idcs_max]
+
+    magnitude = np.hypot(g_col, g_row)
+    orientation = np.rad2deg(np.arctan2(g_row, g_col)) % 180
+    return magnitude, orientation
+
+
+def _hog_normalize_blocks(histograms, cells_per_block, method, eps=1e-5):
+    """Normalize all the blocks of a grid of cell histograms at once.
+
+    Parameters
+    ----------
+    histograms : (..., R, C, O) ndarray
+        Orientation histograms of a grid of cells.
+    cells_per_block : 2-tuple (int, int)
+        Number of cells in each block.
+    method : str {'L1', 'L1-sqrt', 'L2', 'L2-Hys'}
+        Block normalization method, see `hog`.
+
+    Returns
+    -------
+    normalized_blocks : (..., R - b_row + 1, C - b_col + 1, b_row, b_col, O) ndarray
+        Normalized blocks, as computed by `_hog_normalize_block`.
+    """
+    b_row, b_col = cells_per_block
+    n_blocks_row = histograms.shape[-3] - b_row + 1
+    n_blocks_col = histograms.shape[-2] - b_col + 1
+    strides = histograms.strides
+    blocks = np.lib.stride_tricks.as_strided(
+        histograms,
+        shape=(histograms.shape[:-3] + (n_blocks_row, n_blocks_col,
+                                        b_row, b_col, histograms.shape[-1])),
+        strides=strides[:-1] + strides[-3:],
+        writeable=False)
+    axes = (-3, -2, -1)
+
+    if method == 'L1':
+        out = blocks / (np.sum(np.abs(blocks), axis=axes, keepdims=True)
+                        + eps)
+    elif method == 'L1-sqrt':
+        out = np.sqrt(blocks / (np.sum(np.abs(blocks), axis=axes,
+                                       keepdims=True) + eps))
+    elif method == 'L2':
+        out = blocks / np.sqrt(np.sum(blocks ** 2, axis=axes, keepdims=True)
+                               + eps ** 2)
+    elif method == 'L2-Hys':
+        out = blocks / np.sqrt(np.sum(blocks ** 2, axis=axes, keepdims=True)
+                               + eps ** 2)
+        out = np.minimum(out, 0.2)
+        out = out / np.sqrt(np.sum(out ** 2, axis=axes, keepdims=True)
+                            + eps ** 2)
+    else:
+        raise ValueError('Selected block normalization method is invalid.')
+
+    return out
+
+
+def hog_batch(images, orientations=9, pixels_per_cell=(8, 8),
+              cells_per_block=(3, 3), block_norm='L2-Hys',
+              transform_sqrt=False, multichannel=None, num_threads=1):
+    """Extract Histogram of Oriented Gradients (HOG) for a stack of images.
+
+    The descriptor of each image is the feature vector computed by `hog`,
+    the images being processed together: the gradients and the block
+    normalization are computed on the whole stack with array operations, and
+    the cell histograms of several images in parallel.
+
+    Parameters
+    ----------
+    images : (N, M, P[, C]) ndarray
+        Stack of images of the same shape.
+    orientations : int, optional
+        Number of orientation bins.
+    pixels_per_cell : 2-tuple (int, int), optional
+        Size (in pixels) of a cell.
+    cells_per_block : 2-tuple (int, int), optional
+        Number of cells in each block.
+    block_norm : str {'L1', 'L1-sqrt', 'L2', 'L2-Hys'}, optional
+        Block normalization method, see `hog`.
+    transform_sqrt : bool, optional
+        Apply power law compression to normalize the images before
+        processing.
+    multichannel : boolean, optional
+        If True, the last `images` dimension is considered as a color channel,
+        otherwise as spatial. By default, a stack with 4 dimensions is
+        considered multichannel.
+    num_threads : int, optional
+        Number of threads computing the cell histograms.
+
+    Returns
+    -------
+    descriptors : (N, D) ndarray of float32
+        HOG descriptor of each image, ``descriptors[i]`` being equal to
+        ``hog(images[i], ...)`` up to single precision.
+
+    Examples
+    --------
+    >>> images = np.random.rand(10, 128, 64)
+    >>> descriptors = hog_batch(images, pixels_per_cell=(8, 8),
+    ...                         cells_per_block=(2, 2))
+    >>> descriptors.shape
+    (10, 3780)
+
+    """
+    images = np.asarray(images)
+
+    if multichannel is None:
+        multichannel = (images.ndim == 4)
+
+    ndim_spatial = images.ndim - 2 if multichannel else images.ndim - 1
+    if ndim_spatial != 2:
+        raise ValueError('Only stacks of images with 2 spatial dimensions are '
+                         'supported. If using with color/multichannel '
+                         'images, specify `multichannel=True`.')
+
+    if block_norm not in ('L1', 'L1-sqrt', 'L2', 'L2-Hys'):
+        raise ValueError('Selected block normalization method is invalid.')
+
+    n_images = images.shape[0]
+    s_row, s_col = images.shape[1:3]
+    c_row, c_col = pixels_per_cell
+    b_row, b_col = cells_per_block
+
+    n_cells_row = int(s_row // c_row)  # number of cells along row-axis
+    n_cells_col = int(s_col // c_col)  # number of cells along col-axis
+    n_blocks_row = (n_cells_row - b_row) + 1
+    n_blocks_col = (n_cells_col - b_col) + 1
+    n_features = (max(n_blocks_row, 0) * max(n_blocks_col, 0)
+                  * b_row * b_col * orientations)
+
+    descriptors = np.empty((n_images, n_features), dtype=np.float32)
+
+    # process the images by chunks to bound the memory of the gradients
+    chunk_size = max(1, _HOG_BATCH_PIXELS // images[0].size)
+    for start in range(0, n_images, chunk_size):
+        stop = min(start + chunk_size, n_images)
+        chunk = images[start:stop]
+
+        if transform_sqrt:
+            chunk = np.sqrt(chunk)
+        if chunk.dtype.kind in 'biu':
+            # convert integer images to float
+            # to avoid problems with subtracting unsigned numbers
+            chunk = chunk.astype('float')
+
+        magnitude, orientation = _hog_stack_gradient(chunk, multichannel)
+
+        orientation_histogram = np.zeros((stop - start, n_cells_row,
+                                          n_cells_col, orientations))
+        _hoghistogram.hog_histograms_batch(magnitude, orientation,
+                                           c_col, c_row,
+                                           n_cells_col, n_cells_row,
+                                           orientations,
+                                           orientation_histogram,
+                                           num_threads)
+
+        normalized_blocks = _hog_normalize_blocks(orientation_histogram,
+                                                  cells_per_block, block_norm)
+        descriptors[start:stop] = normalized_blocks.reshape(stop - start, -1)
+
+    return descriptors
+
+
+def hog_windows(image, window_shape, step=1, orientations=9,
+                pixels_per_cell=(8, 8), cells_per_block=(3, 3),
+                block_norm='L2-Hys', transform_sqrt=False, multichannel=None,
+                num_threads=1):
+    """Extract the HOG descriptors of a dense grid of sliding windows.
+
+    The gradients, cell histograms and normalized blocks are computed once
+    for the whole image, and the descriptor of each window is a view of the
+    blocks it covers, instead of calling `hog` on each crop of the image.
+    The windows are aligned on the cells of the image.
+
+    Parameters
+    ----------
+    image : (M, N[, C]) ndarray
+        Input image.
+    window_shape : 2-tuple (int, int)
+        Size (in pixels) of a window. Pixels beyond the last complete cell of
+        a window are ignored, as in `hog`.
+    step : int or 2-tuple (int, int), optional
+        Number of cells between consecutive windows along each axis.
+    orientations : int, optional
+        Number of orientation bins.
+    pixels_per_cell : 2-tuple (int, int), optional
+        Size (in pixels) of a cell.
+    cells_per_block : 2-tuple (int, int), optional
+        Number of cells in each block.
+    block_norm : str {'L1', 'L1-sqrt', 'L2', 'L2-Hys'}, optional
+        Block normalization method, see `hog`.
+    transform_sqrt : bool, optional
+        Apply power law compression to normalize the image before
+        processing.
+    multichannel : boolean, optional
+        If True, the last `image` dimension is considered as a color channel,
+        otherwise as spatial.
+    num_threads : int, optional
+        Number of threads computing the cell histograms.
+
+    Returns
+    -------
+    windows : (W_row, W_col, n_blocks_row, n_blocks_col, n_cells_row, n_cells_col, n_orient) ndarray
+        Read-only view of the HOG descriptor of each window: the window
+        ``windows[i, j]`` has its top-left corner at pixel
+        ``(i * step[0] * pixels_per_cell[0], j * step[1] * pixels_per_cell[1])``
+        and ``windows[i, j].ravel()`` is its feature vector.
+
+    Notes
+    -----
+    The gradients of the pixels on the border of a window are computed from
+    their neighbors outside the window, where `hog` applied to the crop sets
+    them to zero, so that the descriptors slightly differ from those of the
+    crops on the first and last rows and columns of cells.
+
+    Examples
+    --------
+    >>> image = np.random.rand(256, 128)
+    >>> windows = hog_windows(image, (128, 64), step=2,
+    ...                       cells_per_block=(2, 2))
+    >>> windows.shape
+    (9, 5, 15, 7, 2, 2, 9)
+    >>> windows[0, 0].ravel().shape
+    (3780,)
+
+    """
+    image = np.atleast_2d(image)
+
+    if multichannel is None:
+        multichannel = (image.ndim == 3)
+
+    ndim_spatial = image.ndim - 1 if multichannel else image.ndim
+    if ndim_spatial != 2:
+        raise ValueError('Only images with 2 spatial dimensions are '
+                         'supported. If using with color/multichannel '
+                         'images, specify `multichannel=True`.')
+
+    step_row, step_col = (step, step) if np.isscalar(step) else step
+    if step_row < 1 or step_col < 1:
+        raise ValueError('`step` must be a positive number of cells.')
+
+    s_row, s_col = image.shape[:2]
+    c_row, c_col = pixels_per_cell
+    b_row, b_col = cells_per_block
+
+    n_cells_row = int(s_row // c_row)  # number of cells along row-axis
+    n_cells_col = int(s_col // c_col)  # number of cells along col-axis
+    # number of cells and blocks of a window along each axis
+    w_cells_row = int(window_shape[0] // c_row)
+    w_cells_col = int(window_shape[1] // c_col)
+    w_blocks_row = w_cells_row - b_row + 1
+    w_blocks_col = w_cells_col - b_col + 1
+    if w_blocks_row < 1 or w_blocks_col < 1:
+        raise ValueError('`window_shape` must contain at least one block.')
+    if w_cells_row > n_cells_row or w_cells_col > n_cells_col:
+        raise ValueError('`window_shape` must not be larger than the image.')
+
+    if transform_sqrt:
+        image = np.sqrt(image)
+    if image.dtype.kind in 'biu':
+        # convert integer image to float
+        # to avoid problems with subtracting unsigned numbers
+        image = image.astype('float')
+
+    magnitude, orientation = _hog_stack_gradient(image[np.newaxis],
+                                                 multichannel)
+
+    orientation_histogram = np.zeros((1, n_cells_row, n_cells_col,
+                                      orientations))
+    _hoghistogram.hog_histograms_batch(magnitude, orientation, c_col, c_row,
+                                       n_cells_col, n_cells_row, orientations,
+                                       orientation_histogram, num_threads)
+
+    normalized_blocks = np.ascontiguousarray(_hog_normalize_blocks(
+        orientation_histogram[0], cells_per_block, block_norm))
+
+    n_windows_row = (n_cells_row - w_cells_row) // step_row + 1
+    n_windows_col = (n_cells_col - w_cells_col) // step_col + 1
+    strides = normalized_blocks.strides
+    windows = np.lib.stride_tricks.as_strided(
+        normalized_blocks,
+        shape=((n_windows_row, n_windows_col, w_blocks_row, w_blocks_col)
+               + normalized_blocks.shape[2:]),
+        strides=(strides[0] * step_row, strides[1] * step_col) + strides,
+        writeable=False)
+
+    return windows
@@ -2,6 +2,9 @@
 # cython: boundscheck=False
 # cython: wraparound=False
 
+from libc.stdlib cimport malloc, free
+from cython.parallel import prange, parallel
+
 import numpy as np
 cimport numpy as cnp
 
@@ -155,3 +158,86 @@ def hog_histograms(double[:, ::1] gradient_columns,
 
                 r_i += 1
                 r += cell_rows
+
+
+def hog_histograms_batch(double[:, :, ::1] magnitude,
+                         double[:, :, ::1] orientation,
+                         int cell_columns, int cell_rows,
+                         int number_of_cells_columns,
+                         int number_of_cells_rows,
+                         int number_of_orientations,
+                         cnp.float64_t[:, :, :, ::1] orientation_histogram,
+                         int num_threads=1):
+    """Extract the orientation histograms of the cells of several images.
+
+    The histograms are identical to those of `hog_histograms`, the images
+    being processed in parallel.
+
+    Parameters
+    ----------
+    magnitude : (N, M, P) ndarray
+        Gradient magnitudes of the images.
+    orientation : (N, M, P) ndarray
+        Gradient orientations of the images, in degrees in ``[0, 180)``.
+    cell_columns : int
+        Pixels per cell (columns).
+    cell_rows : int
+        Pixels per cell (rows).
+    number_of_cells_columns : int
+        Number of cells (columns).
+    number_of_cells_rows : int
+        Number of cells (rows).
+    number_of_orientations : int
+        Number of orientation bins.
+    orientation_histogram : (N, R, C, O) ndarray
+        The histogram array which is modified in place.
+    num_threads : int, optional
+        Number of threads.
+    """
+
+    cdef Py_ssize_t n, r_i, c_i, row, column, i
+    cdef Py_ssize_t size_rows = magnitude.shape[1]
+    cdef Py_ssize_t size_columns = magnitude.shape[2]
+    cdef int r_0 = cell_rows / 2
+    cdef int c_0 = cell_columns / 2
+    cdef int range_rows_stop = cell_rows / 2
+    cdef int range_rows_start = -range_rows_stop
+    cdef int range_columns_stop = cell_columns / 2
+    cdef int range_columns_start = -range_columns_stop
+    cdef float number_of_orientations_per_180 = \
+        180. / number_of_orientations
+    cdef double value
+    cdef float* totals
+
+    # bin edges, computed in single precision as in hog_histograms
+    cdef float[::1] edges = np.empty(number_of_orientations + 1,
+                                     dtype=np.float32)
+    for i in range(number_of_orientations + 1):
+        edges[i] = number_of_orientations_per_180 * i
+
+    with nogil, parallel(num_threads=num_threads):
+        totals = <float*>malloc(number_of_orientations * sizeof(float))
+        for n in prange(magnitude.shape[0], schedule='static'):
+            for r_i in range(number_of_cells_rows):
+                for c_i in range(number_of_cells_columns):
+                    for i in range(number_of_orientations):
+                        totals[i] = 0
+                    for row in range(r_0 + r_i * cell_rows + range_rows_start,
+                                     r_0 + r_i * cell_rows + range_rows_stop):
+                        if row < 0 or row >= size_rows:
+                            continue
+                        for column in range(
+                                c_0 + c_i * cell_columns + range_columns_start,
+                                c_0 + c_i * cell_columns + range_columns_stop):
+                            if column < 0 or column >= size_columns:
+                                continue
+                            value = orientation[n, row, column]
+                            for i in range(number_of_orientations):
+                                if edges[i] <= value < edges[i + 1]:
+                                    totals[i] = (totals[i]
+                                                 + magnitude[n, row, column])
+                                    break
+                    for i in range(number_of_orientations):
+                        orientation_histogram[n, r_i, c_i, i] = \
+                            totals[i] / (cell_rows * cell_columns)
+        free(totals)
@@ -1,11 +1,15 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
-from scipy.ndimage import gaussian_filter, gaussian_laplace
+from scipy.ndimage import gaussian_filter, gaussian_laplace, maximum_filter
 import math
 from math import sqrt, log
 from scipy import spatial
 from ..util import img_as_float
-from .peak import peak_local_max
+from .peak import peak_local_max, _exclude_border
 from ._hessian_det_appx import _hessian_matrix_det
+from .blob_cy import _prune_pairs
 from ..transform import integral_image
 from .._shared.utils import assert_nD
 
@@ -22,34 +26,34 @@ def _compute_disk_overlap(d, r1, r2):
 
     Parameters
     ----------
-    d : float
+    d : float or array
         Distance between centers.
-    r1 : float
+    r1 : float or array
         Radius of the first disk.
-    r2 : float
+    r2 : float or array
         Radius of the second disk.
 
     Returns
     -------
-    fraction: float
+    fraction: float or array
         Fraction of area of the overlap between the two disks.
     """
 
     ratio1 = (d ** 2 + r1 ** 2 - r2 ** 2) / (2 * d * r1)
     ratio1 = np.clip(ratio1, -1, 1)
-    acos1 = math.acos(ratio1)
+    acos1 = np.arccos(ratio1)
 
     ratio2 = (d ** 2 + r2 ** 2 - r1 ** 2) / (2 * d * r2)
     ratio2 = np.clip(ratio2, -1, 1)
-    acos2 = math.acos(ratio2)
+    acos2 = np.arccos(ratio2)
 
     a = -d + r2 + r1
     b = d - r2 + r1
     c = d + r2 - r1
     d = d + r2 + r1
     area = (r1 ** 2 * acos1 + r2 ** 2 * acos2 -
-            0.5 * sqrt(abs(a * b * c * d)))
-    return area / (math.pi * (min(r1, r2) ** 2))
+            0.5 * np.sqrt(np.abs(a * b * c * d)))
+    return area / (math.pi * (np.minimum(r1, r2) ** 2))
 
 
 def _compute_sphere_overlap(d, r1, r2):
@@ -59,16 +63,16 @@ def _compute_sphere_overlap(d, r1, r2):
 
     Parameters
     ----------
-    d : float
+    d : float or array
         Distance between centers.
-    r1 : float
+    r1 : float or array
         Radius of the first sphere.
-    r2 : float
+    r2 : float or array
         Radius of the second sphere.
 
     Returns
     -------
-    fraction: float
+    fraction: float or array
         Fraction of volume of the overlap between the two spheres.
 
     Notes
@@ -78,7 +82,7 @@ def _compute_sphere_overlap(d, r1, r2):
     """
     vol = (math.pi / (12 * d) * (r1 + r2 - d)**2 *
            (d**2 + 2 * d * (r1 + r2) - 3 * (r1**2 + r2**2) + 6 * r1 * r2))
-    return vol / (4./3 * math.pi * min(r1, r2) ** 3)
+    return vol / (4./3 * math.pi * np.minimum(r1, r2) ** 3)
 
 
 def _blob_overlap(blob1, blob2):
@@ -126,6 +130,49 @@ def _blob_overlap(blob1, blob2):
         return _compute_sphere_overlap(d, r1, r2)
 
 
+def _blob_overlap_pairs(blobs_array, pairs):
+    """Finds the overlapping area fraction of pairs of blobs.
+
+    Vectorized version of `_blob_overlap`.
+
+    Parameters
+    ----------
+    blobs_array : ndarray
+        A 2d array with each row representing 3 (or 4) values,
+        ``(row, col, sigma)`` or ``(pln, row, col, sigma)`` in 3D.
+    pairs : (P, 2) array of int
+        Indices of the blobs of each pair.
+
+    Returns
+    -------
+    f : (P, ) array
+        Fraction of overlapped area (or volume in 3D) of each pair.
+    """
+    n_dim = blobs_array.shape[1] - 1
+    root_ndim = sqrt(n_dim)
+    blobs1 = blobs_array[pairs[:, 0]]
+    blobs2 = blobs_array[pairs[:, 1]]
+
+    # extent of the blob is given by sqrt(2)*scale
+    r1 = blobs1[:, -1] * root_ndim
+    r2 = blobs2[:, -1] * root_ndim
+
+    d = np.sqrt(np.sum((blobs1[:, :-1] - blobs2[:, :-1]) ** 2, axis=1))
+
+    # one blob is inside the other, the smaller blob must die
+    inside = d <= np.abs(r1 - r2)
+    overlaps = inside.astype(np.double)
+
+    partial = ~inside & (d <= r1 + r2)
+    d, r1, r2 = d[partial], r1[partial], r2[partial]
+    if n_dim == 2:
+        overlaps[partial] = _compute_disk_overlap(d, r1, r2)
+    else:
+        overlaps[partial] = _compute_sphere_overlap(d, r1, r2)
+
+    return overlaps
+
+
 def _prune_blobs(blobs_array, overlap):
     """Eliminated blobs with area overlap.
 
@@ -150,23 +197,126 @@ def _prune_blobs(blobs_array, overlap):
     sigma = blobs_array[:, -1].max()
     distance = 2 * sigma * sqrt(blobs_array.shape[1] - 1)
     tree = spatial.cKDTree(blobs_array[:, :-1])
-    pairs = np.array(list(tree.query_pairs(distance)))
+    pairs = np.array(list(tree.query_pairs(distance)), dtype=np.intp)
     if len(pairs) == 0:
         return blobs_array
-    else:
-        for (i, j) in pairs:
-            blob1, blob2 = blobs_array[i], blobs_array[j]
-            if _blob_overlap(blob1, blob2) > overlap:
-                if blob1[-1] > blob2[-1]:
-                    blob2[-1] = 0
-                else:
-                    blob1[-1] = 0
 
-    return np.array([b for b in blobs_array if b[-1] > 0])
+    # visit the pairs in a deterministic order
+    pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+    overlaps = _blob_overlap_pairs(blobs_array, pairs)
+    alive = _prune_pairs(np.ascontiguousarray(blobs_array[:, -1]), pairs,
+                         overlaps, overlap)
+
+    return blobs_array[alive]
+
+
+def _filtered_images(filter_function, params, num_workers):
+    """Yield ``filter_function(param)`` for each parameter, in order.
+
+    With several workers, the images of the next `num_workers` parameters
+    are computed in parallel threads, so that at most `num_workers` images
+    are held in addition to those of the caller.
+    """
+    if num_workers == 1:
+        for param in params:
+            yield filter_function(param)
+        return
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = deque()
+        for param in params:
+            futures.append(executor.submit(filter_function, param))
+            if len(futures) == num_workers:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+
+
+def _scale_space_maxima(scale_images, n_scales, threshold, exclude_border,
+                        streaming):
+    """Local maxima of a scale space.
+
+    Parameters
+    ----------
+    scale_images : iterable of ndarray
+        Filter responses at increasing scales.
+    n_scales : int
+        Number of scales.
+    threshold : float
+        The absolute lower bound for scale space maxima.
+    exclude_border : int or bool
+        Whether to exclude maxima at the border of the scale space.
+    streaming : bool
+        If True, the maxima are found while iterating over the scales,
+        keeping only three adjacent scales in memory. Otherwise the scale
+        space cube is built and given to `peak_local_max`.
+
+    Returns
+    -------
+    local_maxima : (N, ndim + 1) array
+        Coordinates of the maxima, the last one being the index of the scale,
+        in the order given by `peak_local_max`.
+    """
+    if not streaming:
+        image_cube = np.stack(list(scale_images), axis=-1)
+        return peak_local_max(image_cube, threshold_abs=threshold,
+                              footprint=np.ones((3,) * image_cube.ndim),
+                              threshold_rel=0.0,
+                              exclude_border=exclude_border)
+
+    # the maximum over a 3x...x3 neighborhood of the cube is the maximum of
+    # the spatial maximum filters of three adjacent scales, zero outside of
+    # the cube
+    scale_images = iter(scale_images)
+    current = next(scale_images)
+    ndim = current.ndim
+    footprint = np.ones((3,) * ndim, dtype=bool)
+    current_max = maximum_filter(current, footprint=footprint,
+                                 mode='constant')
+    previous_max = 0
+    threshold = max(threshold, 0)
+    value_min = value_max = current.flat[0]
+
+    coords = []
+    for scale in range(n_scales):
+        value_min = min(value_min, current.min())
+        value_max = max(value_max, current.max())
+        if scale + 1 < n_scales:
+            following = next(scale_images)
+            following_max = maximum_filter(following, footprint=footprint,
+                                           mode='constant')
+        else:
+            following = following_max = 0
+
+        mask = current == np.maximum(np.maximum(previous_max, current_max),
+                                     following_max)
+        mask &= current > threshold
+        if exclude_border:
+            # as peak_local_max, remove one plane at the start and two at the
+            # end of each axis of the cube
+            if scale == 0 or scale >= n_scales - 2:
+                mask[...] = False
+            _exclude_border(mask, footprint, exclude_border)
+        scale_coords = np.nonzero(mask)
+        coords.append(np.column_stack(
+            scale_coords + (np.full(scale_coords[0].size, scale, np.intp),)))
+
+        previous_max = current_max
+        current, current_max = following, following_max
+
+    if value_min == value_max:
+        # constant scale space
+        return np.empty((0, ndim + 1), np.intp)
+
+    # same order as peak_local_max: decreasing raster order of the cube
+    coords = np.concatenate(coords)
+    order = np.lexsort(coords.T[::-1])[::-1]
+    return coords[order]
 
 
 def blob_dog(image, min_sigma=1, max_sigma=50, sigma_ratio=1.6, threshold=2.0,
-             overlap=.5, *, exclude_border=False):
+             overlap=.5, *, exclude_border=False, streaming=False,
+             dtype=None, num_workers=1):
     r"""Finds blobs in the given grayscale image.
 
     Blobs are found using the Difference of Gaussian (DoG) method [1]_.
@@ -201,6 +351,16 @@ def blob_dog(image, min_sigma=1, max_sigma=50, sigma_ratio=1.6, threshold=2.0,
     exclude_border : int or bool, optional
         If nonzero int, `exclude_border` excludes blobs from
         within `exclude_border`-pixels of the border of the image.
+    streaming : bool, optional
+        If True, the scale space is computed one scale at a time and its
+        local maxima are found while sweeping the scales, keeping three
+        adjacent scales in memory instead of the whole
+        ``image.shape + (n_scales,)`` cube. The blobs found are the same.
+    dtype : {np.float32, np.float64}, optional
+        Precision of the filtered images. By default, the precision of the
+        image converted with ``img_as_float``.
+    num_workers : int, optional
+        Number of scales filtered in parallel threads.
 
     Returns
     -------
@@ -253,6 +413,8 @@ def blob_dog(image, min_sigma=1, max_sigma=50, sigma_ratio=1.6, threshold=2.0,
     a 2-D image and :math:`\sqrt{3}\sigma` for a 3-D image.
     """
     image = img_as_float(image)
+    if dtype is not None:
+        image = image.astype(dtype, copy=False)
 
     # if both min and max sigma are scalar, function returns only one sigma
     scalar_sigma = np.isscalar(max_sigma) and np.isscalar(min_sigma)
@@ -275,20 +437,22 @@ def blob_dog(image, min_sigma=1, max_sigma=50, sigma_ratio=1.6, threshold=2.0,
     sigma_list = np.array([min_sigma * (sigma_ratio ** i)
                            for i in range(k + 1)])
 
-    gaussian_images = [gaussian_filter(image, s) for s in sigma_list]
-
-    # computing difference between two successive Gaussian blurred images
-    # multiplying with average standard deviation provides scale invariance
-    dog_images = [(gaussian_images[i] - gaussian_images[i + 1])
-                  * np.mean(sigma_list[i]) for i in range(k)]
-
-    image_cube = np.stack(dog_images, axis=-1)
-
-    # local_maxima = get_local_maxima(image_cube, threshold)
-    local_maxima = peak_local_max(image_cube, threshold_abs=threshold,
-                                  footprint=np.ones((3,) * (image.ndim + 1)),
-                                  threshold_rel=0.0,
-                                  exclude_border=exclude_border)
+    gaussian_images = _filtered_images(
+        lambda s: gaussian_filter(image, s), sigma_list, num_workers)
+
+    def dog_images():
+        # computing difference between two successive Gaussian blurred
+        # images multiplying with average standard deviation provides scale
+        # invariance
+        previous = next(gaussian_images)
+        for i in range(k):
+            current = next(gaussian_images)
+            yield (previous - current) * image.dtype.type(
+                np.mean(sigma_list[i]))
+            previous = current
+
+    local_maxima = _scale_space_maxima(dog_images(), k, threshold,
+                                       exclude_border, streaming)
     # Catch no peaks
     if local_maxima.size == 0:
         return np.empty((0, 3))
@@ -311,7 +475,8 @@ def blob_dog(image, min_sigma=1, max_sigma=50, sigma_ratio=1.6, threshold=2.0,
 
 
 def blob_log(image, min_sigma=1, max_sigma=50, num_sigma=10, threshold=.2,
-             overlap=.5, log_scale=False, *, exclude_border=False):
+             overlap=.5, log_scale=False, *, exclude_border=False,
+             streaming=False, dtype=None, num_workers=1):
     r"""Finds blobs in the given grayscale image.
 
     Blobs are found using the Laplacian of Gaussian (LoG) method [1]_.
@@ -350,6 +515,16 @@ def blob_log(image, min_sigma=1, max_sigma=50, num_sigma=10, threshold=.2,
     exclude_border : int or bool, optional
         If nonzero int, `exclude_border` excludes blobs from
         within `exclude_border`-pixels of the border of the image.
+    streaming : bool, optional
+        If True, the scale space is computed one scale at a time and its
+        local maxima are found while sweeping the scales, keeping three
+        adjacent scales in memory instead of the whole
+        ``image.shape + (n_scales,)`` cube. The blobs found are the same.
+    dtype : {np.float32, np.float64}, optional
+        Precision of the filtered images. By default, the precision of the
+        image converted with ``img_as_float``.
+    num_workers : int, optional
+        Number of scales filtered in parallel threads.
 
     Returns
     -------
@@ -397,6 +572,8 @@ def blob_log(image, min_sigma=1, max_sigma=50, num_sigma=10, threshold=.2,
     a 2-D image and :math:`\sqrt{3}\sigma` for a 3-D image.
     """
     image = img_as_float(image)
+    if dtype is not None:
+        image = image.astype(dtype, copy=False)
 
     # if both min and max sigma are scalar, function returns only one sigma
     scalar_sigma = (
@@ -429,15 +606,12 @@ def blob_log(image, min_sigma=1, max_sigma=50, num_sigma=10, threshold=.2,
 
     # computing gaussian laplace
     # average s**2 provides scale invariance
-    gl_images = [-gaussian_laplace(image, s) * s ** 2
-                 for s in np.mean(sigma_list, axis=1)]
-
-    image_cube = np.stack(gl_images, axis=-1)
+    gl_images = _filtered_images(
+        lambda s: -gaussian_laplace(image, s) * image.dtype.type(s ** 2),
+        np.mean(sigma_list, axis=1), num_workers)
 
-    local_maxima = peak_local_max(image_cube, threshold_abs=threshold,
-                                  footprint=np.ones((3,) * (image.ndim + 1)),
-                                  threshold_rel=0.0,
-                                  exclude_border=exclude_border)
+    local_maxima = _scale_space_maxima(gl_images, num_sigma, threshold,
+                                       exclude_border, streaming)
 
     # Catch no peaks
     if local_maxima.size == 0:
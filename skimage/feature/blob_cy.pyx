@@ -0,0 +1,50 @@
+#cython: cdivision=True
+#cython: boundscheck=False
+#cython: nonecheck=False
+#cython: wraparound=False
+
+import numpy as np
+
+cimport numpy as cnp
+
+
+def _prune_pairs(double[::1] sigmas, Py_ssize_t[:, ::1] pairs,
+                 double[::1] overlaps, double overlap):
+    """Greedy elimination of the smaller blob of overlapping pairs.
+
+    The pairs are visited in order, and the smaller blob of a pair whose
+    blobs are both still alive is eliminated if their overlap is greater than
+    `overlap` (the first blob of the pair in case of equal sigmas).
+
+    Parameters
+    ----------
+    sigmas : (N, ) array
+        Sigma of each blob.
+    pairs : (P, 2) array
+        Indices of the blobs of each pair.
+    overlaps : (P, ) array
+        Overlap fraction of each pair.
+    overlap : float
+        Overlap fraction above which the smaller blob is eliminated.
+
+    Returns
+    -------
+    alive : (N, ) array of bool
+        Blobs that are not eliminated.
+
+    """
+
+    cdef Py_ssize_t k, i, j
+    cdef cnp.uint8_t[::1] alive = np.ones(sigmas.shape[0], dtype=np.uint8)
+
+    with nogil:
+        for k in range(pairs.shape[0]):
+            i = pairs[k, 0]
+            j = pairs[k, 1]
+            if alive[i] and alive[j] and overlaps[k] > overlap:
+                if sigmas[i] > sigmas[j]:
+                    alive[j] = 0
+                else:
+                    alive[i] = 0
+
+    return np.asarray(alive).view(bool)
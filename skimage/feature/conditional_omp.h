@@ -21,5 +21,6 @@ void omp_init_lock(omp_lock_t *lock) {};
 void omp_destroy_lock(omp_lock_t *lock) {};
 void omp_set_lock(omp_lock_t *lock) {};
 void omp_unset_lock(omp_lock_t *lock) {};
+int omp_get_max_threads(void) { return 1; };
 #define have_openmp 0
 #endif
\ No newline at end of file
@@ -12,12 +12,7 @@ http://www.dirkpadfield.com/
 import numpy as np
 from functools import partial
 
-# next_fast_len was implemented in scipy 0.18
-# In case it cannot be imported, we use the id function
-try:
-    from scipy.fftpack import next_fast_len
-except ImportError:
-    next_fast_len = lambda size: size
+from .._shared.fft import rfftn, irfftn, next_fast_len
 
 
 def masked_register_translation(
@@ -25,7 +20,9 @@ def masked_register_translation(
         target_image,
         src_mask,
         target_mask=None,
-        overlap_ratio=3 / 10):
+        overlap_ratio=3 / 10,
+        dtype=np.float64,
+        workers=None):
     """
     Masked image translation registration by masked normalized
     cross-correlation.
@@ -52,6 +49,11 @@ def masked_register_translation(
         maximum translation, while a higher `overlap_ratio` leads to greater 
         robustness against spurious matches due to small overlap between 
         masked images.
+    dtype : {np.float64, np.float32}, optional
+        Precision of the cross-correlation.
+    workers : int, optional
+        Number of workers computing the FFTs, when supported by the FFT
+        backend (scipy >= 1.4).
 
     Returns
     -------
@@ -59,6 +61,10 @@ def masked_register_translation(
         Shift vector (in pixels) required to register ``target_image`` with
         ``src_image``. Axis ordering is consistent with numpy (e.g. Z, Y, X)
 
+    See Also
+    --------
+    MaskedTranslationRegistrar
+
     References
     ----------
     .. [1] Dirk Padfield. Masked Object Registration in the Fourier Domain.
@@ -77,23 +83,153 @@ def masked_register_translation(
             raise ValueError(
                 "Error: image sizes must match their respective mask sizes.")
 
-    # The mismatch in size will impact the center location of the
-    # cross-correlation
-    size_mismatch = np.array(target_image.shape) - np.array(src_image.shape)
-
     xcorr = cross_correlate_masked(target_image, src_image, 
                  target_mask, src_mask, axes=(0, 1), mode='full', 
-                 overlap_ratio=overlap_ratio)
+                 overlap_ratio=overlap_ratio, dtype=dtype, workers=workers)
+
+    return _shifts_from_correlation(xcorr, src_image.shape,
+                                    target_image.shape)
+
+
+def _shifts_from_correlation(xcorr, src_shape, target_shape):
+    """Shift registering the target image with the source image from their
+    masked normalized cross-correlation."""
+    # The mismatch in size will impact the center location of the
+    # cross-correlation
+    size_mismatch = np.array(target_shape) - np.array(src_shape)
 
     # Generalize to the average of multiple equal maxima
     maxima = np.transpose(np.nonzero(xcorr == xcorr.max()))
     center = np.mean(maxima, axis=0)
-    shifts = center - np.array(src_image.shape) + 1
+    shifts = center - np.array(src_shape) + 1
     return -shifts + (size_mismatch / 2)
 
 
+class MaskedTranslationRegistrar(object):
+    """Register many masked images to a fixed masked reference image.
+
+    Computes the shifts of `masked_register_translation` between a reference
+    image and each of several images. The spectra of the masked reference
+    image, of its mask and of its square are computed once per shape of the
+    registered images, instead of on each call.
+
+    Parameters
+    ----------
+    reference : ndarray
+        Reference image.
+    reference_mask : ndarray
+        Boolean mask for ``reference``. The mask should evaluate to ``True``
+        (or 1) on valid pixels.
+    overlap_ratio : float, optional
+        Minimum allowed overlap ratio between images, see
+        `masked_register_translation`.
+    dtype : {np.float64, np.float32}, optional
+        Precision of the cross-correlations.
+    workers : int, optional
+        Number of workers computing the FFTs, when supported by the FFT
+        backend (scipy >= 1.4).
+
+    See Also
+    --------
+    masked_register_translation
+
+    Examples
+    --------
+    >>> from skimage import data
+    >>> reference = data.camera()
+    >>> mask = np.ones(reference.shape, dtype=bool)
+    >>> mask[:100] = False
+    >>> images = np.stack([np.roll(reference, shift, axis=(0, 1))
+    ...                    for shift in [(7, -12), (-3, 5)]])
+    >>> registrar = MaskedTranslationRegistrar(reference, mask)
+    >>> registrar.register(images).tolist()
+    [[-7.0, 12.0], [3.0, -5.0]]
+
+    """
+
+    def __init__(self, reference, reference_mask, overlap_ratio=3 / 10,
+                 dtype=np.float64, workers=None):
+        self.reference = np.asarray(reference)
+        self.reference_mask = np.asarray(reference_mask)
+        if self.reference.shape != self.reference_mask.shape:
+            raise ValueError(
+                "Error: image sizes must match their respective mask sizes.")
+        self.overlap_ratio = overlap_ratio
+        self.dtype = _check_dtype(dtype)
+        self.workers = workers
+        self._spectra = {}
+
+    def _reference_spectra(self, target_shape):
+        """Spectra of the rotated reference for images of `target_shape`."""
+        if target_shape not in self._spectra:
+            axes = (0, 1)
+            fast_shape = _fast_shape(target_shape, self.reference.shape, axes)
+            # N-dimensional analog to rotation by 180deg is flip over all
+            # relevant axes.
+            spectra = _masked_spectra(
+                _flip(self.reference, axes=axes),
+                _flip(self.reference_mask, axes=axes),
+                fast_shape, axes, self.dtype, self.workers)
+            self._spectra[target_shape] = (fast_shape, spectra)
+        return self._spectra[target_shape]
+
+    def register(self, images, masks=None):
+        """Register an image or a sequence of images to the reference.
+
+        Parameters
+        ----------
+        images : ndarray or sequence of ndarray
+            Image to register, with the dimensionality of the reference, or
+            sequence (or stack) of such images, not necessarily of the same
+            size as the reference.
+        masks : ndarray or sequence of ndarray, optional
+            Boolean mask of each image. A single mask is used for all the
+            images. If None, the mask of the reference is used.
+
+        Returns
+        -------
+        shifts : ndarray
+            Shift vector (in pixels) required to register each image with
+            the reference, of shape ``(N, ndim)`` for a sequence of images.
+        """
+        ndim = self.reference.ndim
+        single = isinstance(images, np.ndarray) and images.ndim == ndim
+        if single:
+            images = [images]
+        if masks is None:
+            masks = self.reference_mask
+        if isinstance(masks, np.ndarray) and masks.ndim == ndim:
+            masks = [masks] * len(images)
+        if len(masks) != len(images):
+            raise ValueError("Error: one mask must be given per image.")
+
+        shifts = np.empty((len(images), ndim))
+        axes = (0, 1)
+        for i, (image, mask) in enumerate(zip(images, masks)):
+            image = np.asarray(image)
+            if image.shape != np.shape(mask):
+                raise ValueError(
+                    "Error: image sizes must match their respective mask "
+                    "sizes.")
+            fast_shape, reference_spectra = self._reference_spectra(
+                image.shape)
+            spectra = _masked_spectra(image, mask, fast_shape, axes,
+                                      self.dtype, self.workers)
+            xcorr = _masked_correlation(
+                spectra, reference_spectra, image.shape,
+                self.reference.shape, 'full', axes, fast_shape,
+                self.overlap_ratio, self.workers)
+            shifts[i] = _shifts_from_correlation(xcorr, self.reference.shape,
+                                                 image.shape)
+
+        if single:
+            return shifts[0]
+        return shifts
+
+
 def cross_correlate_masked(arr1, arr2, m1, m2, mode='full', axes=(-2, -1), 
-                           overlap_ratio=3 / 10):
+                           overlap_ratio=3 / 10, dtype=np.float64,
+                           workers=None):
     """
     Masked normalized cross-correlation between arrays.
 
@@ -127,6 +263,11 @@ def cross_correlate_masked(arr1, arr2, m1, m2, mode='full', axes=(-2, -1),
         maximum translation, while a higher `overlap_ratio` leads to greater 
         robustness against spurious matches due to small overlap between 
         masked images.
+    dtype : {np.float64, np.float32}, optional
+        Precision of the computations and of the output.
+    workers : int, optional
+        Number of workers computing the FFTs, when supported by the FFT
+        backend (scipy >= 1.4).
 
     Returns
     -------
@@ -150,11 +291,9 @@ def cross_correlate_masked(arr1, arr2, m1, m2, mode='full', axes=(-2, -1),
     if mode not in {'full', 'same'}:
         raise ValueError("Correlation mode {} is not valid.".format(mode))
 
-    fixed_image = np.array(arr1, dtype=np.float)
-    fixed_mask = np.array(m1, dtype=np.bool)
-    moving_image = np.array(arr2, dtype=np.float)
-    moving_mask = np.array(m2, dtype=np.bool)
-    eps = np.finfo(np.float).eps
+    dtype = _check_dtype(dtype)
+    fixed_image = np.asarray(arr1)
+    moving_image = np.asarray(arr2)
 
     # Array dimensions along non-transformation axes should be equal.
     all_axes = set(range(fixed_image.ndim))
@@ -164,68 +303,112 @@ def cross_correlate_masked(arr1, arr2, m1, m2, mode='full', axes=(-2, -1),
                 "Array shapes along non-transformation axes should be "
                     "equal, but dimensions along axis {a} not".format(a=axis))
 
-    # Determine final size along transformation axes
-    # Note that it might be faster to compute Fourier transform in a slightly
-    # larger shape (`fast_shape`). Then, after all fourier transforms are done,
-    # we slice back to`final_shape` using `final_slice`.
-    final_shape = list(arr1.shape)
-    for axis in axes:
-        final_shape[axis] = fixed_image.shape[axis] + \
-            moving_image.shape[axis] - 1
-    final_shape = tuple(final_shape)
-    final_slice = tuple([slice(0, int(sz)) for sz in final_shape])
+    fast_shape = _fast_shape(fixed_image.shape, moving_image.shape, axes)
+    fixed_spectra = _masked_spectra(fixed_image, m1, fast_shape, axes,
+                                    dtype, workers)
+    # N-dimensional analog to rotation by 180deg is flip over all relevant axes.
+    # See [1] for discussion.
+    rotated_moving_spectra = _masked_spectra(
+        _flip(moving_image, axes=axes), _flip(np.asarray(m2), axes=axes),
+        fast_shape, axes, dtype, workers)
+
+    return _masked_correlation(fixed_spectra, rotated_moving_spectra,
+                               fixed_image.shape, moving_image.shape, mode,
+                               axes, fast_shape, overlap_ratio, workers)
+
+
+def _check_dtype(dtype):
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("`dtype` must be float32 or float64.")
+    return dtype
 
+
+def _fast_shape(fixed_shape, moving_shape, axes):
+    """Shape of the FFTs of the full correlation along `axes`."""
     # Extent transform axes to the next fast length (i.e. multiple of 3, 5, or
     # 7)
-    fast_shape = tuple([next_fast_len(final_shape[ax]) for ax in axes])
+    return tuple([next_fast_len(fixed_shape[ax] + moving_shape[ax] - 1)
+                  for ax in axes])
 
-    # We use numpy's fft because it allows to leave transform axes unchanged,
-    # which is not possible with SciPy's fftn/ifftn
-    # E.g. arr shape (2,3,7), transform along axes (0, 1) with shape (4,4)
-    # results in arr_fft shape (4,4, 7)
-    fft = partial(np.fft.fftn, s=fast_shape, axes=axes)
-    ifft = partial(np.fft.ifftn, s=fast_shape, axes=axes)
 
-    fixed_image[np.logical_not(fixed_mask)] = 0.0
-    moving_image[np.logical_not(moving_mask)] = 0.0
+def _masked_spectra(image, mask, fast_shape, axes, dtype, workers):
+    """Real spectra of a masked image, of its mask and of its square.
 
-    # N-dimensional analog to rotation by 180deg is flip over all relevant axes.
-    # See [1] for discussion.
-    rotated_moving_image = _flip(moving_image, axes=axes)
-    rotated_moving_mask = _flip(moving_mask, axes=axes)
+    The image is centered on the mean of its valid pixels along `axes`
+    beforehand, to which the normalized cross-correlation is invariant, to
+    avoid losing precision in the local variances.
+    """
+    image = np.array(image, dtype=dtype)
+    mask = np.array(mask, dtype=np.bool)
+    axes = tuple(axes)
+
+    image[np.logical_not(mask)] = 0.0
+    n_valid = np.maximum(np.sum(mask, axis=axes, keepdims=True), 1)
+    image -= (np.sum(image, axis=axes, keepdims=True, dtype=np.float64)
+              / n_valid).astype(dtype)
+    image[np.logical_not(mask)] = 0.0
+
+    fft = partial(rfftn, s=fast_shape, axes=axes, workers=workers)
+    image_fft = fft(image)
+    mask_fft = fft(mask.astype(dtype))
+    np.square(image, out=image)
+    return image_fft, mask_fft, fft(image)
+
+
+def _masked_correlation(fixed_spectra, rotated_moving_spectra, fixed_shape,
+                        moving_shape, mode, axes, fast_shape, overlap_ratio,
+                        workers):
+    """Masked normalized cross-correlation from the spectra of the fixed
+    image and of the rotated moving image, see `_masked_spectra`."""
+    fixed_fft, fixed_mask_fft, fixed_squared_fft = fixed_spectra
+    (rotated_moving_fft, rotated_moving_mask_fft,
+     rotated_moving_squared_fft) = rotated_moving_spectra
+
+    ifft = partial(irfftn, s=fast_shape, axes=axes, workers=workers)
+    eps = np.finfo(fixed_fft.real.dtype).eps
 
-    fixed_fft = fft(fixed_image)
-    rotated_moving_fft = fft(rotated_moving_image)
-    fixed_mask_fft = fft(fixed_mask)
-    rotated_moving_mask_fft = fft(rotated_moving_mask)
+    # Determine final size along transformation axes
+    # Note that it might be faster to compute Fourier transform in a slightly
+    # larger shape (`fast_shape`). Then, after all fourier transforms are done,
+    # we slice back to`final_shape` using `final_slice`.
+    final_shape = list(fixed_shape)
+    for axis in axes:
+        final_shape[axis] = fixed_shape[axis] + moving_shape[axis] - 1
+    final_slice = tuple([slice(0, int(sz)) for sz in final_shape])
 
     # Calculate overlap of masks at every point in the convolution.
     # Locations with high overlap should not be taken into account.
-    number_overlap_masked_px = np.real(
-        ifft(rotated_moving_mask_fft * fixed_mask_fft))
-    number_overlap_masked_px[:] = np.round(number_overlap_masked_px)
-    number_overlap_masked_px[:] = np.fmax(number_overlap_masked_px, eps)
-    masked_correlated_fixed_fft = ifft(rotated_moving_mask_fft * fixed_fft)
-    masked_correlated_rotated_moving_fft = ifft(
+    number_overlap_masked_px = ifft(rotated_moving_mask_fft * fixed_mask_fft)
+    np.round(number_overlap_masked_px, out=number_overlap_masked_px)
+    np.fmax(number_overlap_masked_px, eps, out=number_overlap_masked_px)
+    masked_correlated_fixed = ifft(rotated_moving_mask_fft * fixed_fft)
+    masked_correlated_rotated_moving = ifft(
         fixed_mask_fft * rotated_moving_fft)
 
     numerator = ifft(rotated_moving_fft * fixed_fft)
-    numerator -= masked_correlated_fixed_fft * \
-        masked_correlated_rotated_moving_fft / number_overlap_masked_px
+    numerator -= masked_correlated_fixed * \
+        masked_correlated_rotated_moving / number_overlap_masked_px
 
-    fixed_squared_fft = fft(np.square(fixed_image))
     fixed_denom = ifft(rotated_moving_mask_fft * fixed_squared_fft)
-    fixed_denom -= np.square(masked_correlated_fixed_fft) / \
-        number_overlap_masked_px
-    fixed_denom[:] = np.fmax(fixed_denom, 0.0)
+    np.square(masked_correlated_fixed, out=masked_correlated_fixed)
+    masked_correlated_fixed /= number_overlap_masked_px
+    fixed_denom -= masked_correlated_fixed
+    del masked_correlated_fixed
+    np.fmax(fixed_denom, 0.0, out=fixed_denom)
 
-    rotated_moving_squared_fft = fft(np.square(rotated_moving_image))
     moving_denom = ifft(fixed_mask_fft * rotated_moving_squared_fft)
-    moving_denom -= np.square(masked_correlated_rotated_moving_fft) / \
-        number_overlap_masked_px
-    moving_denom[:] = np.fmax(moving_denom, 0.0)
-
-    denom = np.sqrt(fixed_denom * moving_denom)
+    np.square(masked_correlated_rotated_moving,
+              out=masked_correlated_rotated_moving)
+    masked_correlated_rotated_moving /= number_overlap_masked_px
+    moving_denom -= masked_correlated_rotated_moving
+    del masked_correlated_rotated_moving
+    np.fmax(moving_denom, 0.0, out=moving_denom)
+
+    denom = fixed_denom
+    denom *= moving_denom
+    del moving_denom
+    np.sqrt(denom, out=denom)
 
     # Slice back to expected convolution shape.
     numerator = numerator[final_slice]
@@ -234,7 +417,7 @@ def cross_correlate_masked(arr1, arr2, m1, m2, mode='full', axes=(-2, -1),
 
     if mode == 'same':
         _centering = partial(_centered,
-                             newshape=fixed_image.shape, axes=axes)
+                             newshape=fixed_shape, axes=axes)
         denom = _centering(denom)
         numerator = _centering(numerator)
         number_overlap_masked_px = _centering(number_overlap_masked_px)
@@ -245,8 +428,9 @@ def cross_correlate_masked(arr1, arr2, m1, m2, mode='full', axes=(-2, -1),
     tol = 1e3 * eps * np.max(np.abs(denom), axis=axes, keepdims=True)
     nonzero_indices = denom > tol
 
-    out = np.zeros_like(denom)
-    out[nonzero_indices] = numerator[nonzero_indices] / denom[nonzero_indices]
+    out = numerator
+    np.divide(numerator, denom, out=out, where=nonzero_indices)
+    out[np.logical_not(nonzero_indices)] = 0.0
     np.clip(out, a_min=-1, a_max=1, out=out)
 
     # Apply overlap ratio threshold
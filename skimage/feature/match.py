@@ -1,10 +1,168 @@
 import numpy as np
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
 
+from .match_cy import _hamming_distances, _hamming_pairs
+from .._shared.utils import check_random_state
+
+
+# number of distances computed at a time by the brute-force matcher
+_BLOCK_DISTANCES = 1 << 22
+
+# p-norms of the metrics supported by the KD-tree matcher
+_KDTREE_NORMS = {'euclidean': 2, 'cityblock': 1, 'chebyshev': np.inf,
+                 'minkowski': None}
+
+
+def _pack_binary(descriptors):
+    """Pack binary descriptors into rows of 64 bit words.
+
+    Parameters
+    ----------
+    descriptors : (N, P) array of bool
+        Binary descriptors.
+
+    Returns
+    -------
+    packed : (N, W) array of uint64
+        Packed descriptors, padded with zero bits to ``W = ceil(P / 64)``
+        words.
+
+    """
+    packed_bytes = np.packbits(descriptors, axis=1)
+    n_words = -(-packed_bytes.shape[1] // 8)
+    packed = np.zeros((descriptors.shape[0], 8 * n_words), dtype=np.uint8)
+    packed[:, :packed_bytes.shape[1]] = packed_bytes
+    return packed.view(np.uint64)
+
+
+def _blocked_neighbors(block_distances, n1, n2, block_size, second_best,
+                       cross_check):
+    """Closest neighbors between two sets computed by blocks of distances.
+
+    Parameters
+    ----------
+    block_distances : callable
+        ``block_distances(start, stop)`` returns the ``(stop - start, n2)``
+        distances between the elements ``start:stop`` of the first set and
+        all the elements of the second set.
+    n1, n2 : int
+        Number of elements in the first and second set.
+    block_size : int
+        Number of elements of the first set per block.
+    second_best : bool
+        Whether to compute the distance to the second closest element.
+    cross_check : bool
+        Whether to compute the closest element of the first set to each
+        element of the second set.
+
+    Returns
+    -------
+    indices2 : (n1, ) array
+        Closest element of the second set to each element of the first set.
+    distances : (n1, ) array
+        Corresponding distances.
+    second_distances : (n1, ) array or None
+        Distances to the second closest element of the second set.
+    indices1 : (n2, ) array or None
+        Closest element of the first set to each element of the second set.
+
+    """
+    indices2 = np.empty(n1, dtype=np.intp)
+    distances = np.empty(n1, dtype=np.double)
+    second_distances = np.empty(n1, dtype=np.double) if second_best else None
+    if cross_check:
+        indices1 = np.zeros(n2, dtype=np.intp)
+        reverse_distances = np.full(n2, np.inf)
+        columns = np.arange(n2)
+    else:
+        indices1 = None
+
+    for start in range(0, n1, block_size):
+        stop = min(start + block_size, n1)
+        block = block_distances(start, stop)
+        rows = np.arange(stop - start)
+
+        best = np.argmin(block, axis=1)
+        indices2[start:stop] = best
+        distances[start:stop] = block[rows, best]
+
+        if cross_check:
+            # keep the first minimum over the blocks, as np.argmin does
+            block_best = np.argmin(block, axis=0)
+            block_distances_min = block[block_best, columns]
+            better = block_distances_min < reverse_distances
+            reverse_distances[better] = block_distances_min[better]
+            indices1[better] = block_best[better] + start
+
+        if second_best:
+            block[rows, best] = np.inf
+            second_distances[start:stop] = np.min(block, axis=1)
+
+    return indices2, distances, second_distances, indices1
+
+
+def _block_distances(descriptors1, descriptors2, metric, p):
+    """Function computing blocks of distances with ``cdist``."""
+    kwargs = {}
+    # Scipy raises an error if p is passed as an extra argument when it isn't
+    # necessary for the chosen metric.
+    if metric == 'minkowski':
+        kwargs['p'] = p
+
+    def block_distances(start, stop):
+        return cdist(descriptors1[start:stop], descriptors2, metric=metric,
+                     **kwargs)
+
+    return block_distances
+
+
+def _packed_block_distances(packed1, packed2, n_bits):
+    """Function computing blocks of hamming distances of packed descriptors.
+
+    The distances are normalized by the number of bits, as the hamming metric
+    of ``cdist``.
+    """
+
+    def block_distances(start, stop):
+        block = np.empty((stop - start, packed2.shape[0]), dtype=np.double)
+        _hamming_distances(packed1[start:stop], packed2, block)
+        block /= n_bits
+        return block
+
+    return block_distances
+
+
+def _filter_matches(indices1, indices2, distances, second_distances,
+                    max_distance, max_ratio):
+    """Discard matches that are too far or too ambiguous.
+
+    `second_distances` are the distances to the second closest descriptors,
+    only used if ``max_ratio < 1``.
+    """
+    if max_distance < np.inf:
+        mask = distances < max_distance
+        indices1 = indices1[mask]
+        indices2 = indices2[mask]
+        distances = distances[mask]
+        if max_ratio < 1.0:
+            second_distances = second_distances[mask]
+
+    if max_ratio < 1.0:
+        second_distances = second_distances.copy()
+        second_distances[second_distances == 0] = np.finfo(np.double).eps
+        ratio = distances / second_distances
+        mask = ratio < max_ratio
+        indices1 = indices1[mask]
+        indices2 = indices2[mask]
+
+    return indices1, indices2
+
 
 def match_descriptors(descriptors1, descriptors2, metric=None, p=2,
-                      max_distance=np.inf, cross_check=True, max_ratio=1.0):
-    """Brute-force matching of descriptors.
+                      max_distance=np.inf, cross_check=True, max_ratio=1.0,
+                      method='brute', block_size=None, eps=0):
+    """Brute-force or KD-tree matching of descriptors.
 
     For each descriptor in the first set this matcher finds the closest
     descriptor in the second set (and vice-versa in the case of enabled
@@ -40,6 +198,21 @@ def match_descriptors(descriptors1, descriptors2, metric=None, p=2,
         for SIFT descriptors a value of 0.8 is usually chosen, see
         D.G. Lowe, "Distinctive Image Features from Scale-Invariant Keypoints",
         International Journal of Computer Vision, 2004.
+    method : {'brute', 'kdtree'}, optional
+        The brute-force matcher computes the distances between the
+        descriptors of the first set and all the descriptors of the second
+        set by blocks of `block_size` descriptors. The KD-tree matcher builds
+        a ``scipy.spatial.cKDTree`` of the descriptors instead, and only
+        supports the 'euclidean', 'cityblock', 'chebyshev' and 'minkowski'
+        metrics. It is much faster on descriptors of low dimension.
+    block_size : int, optional
+        Number of descriptors of the first set matched at a time by the
+        brute-force matcher, which bounds its memory use to
+        ``block_size * N`` distances. By default, about 4 million distances
+        are computed at a time.
+    eps : float, optional
+        Approximation of the KD-tree matcher: the closest descriptors found
+        are at most ``1 + eps`` times farther than the true ones.
 
     Returns
     -------
@@ -48,6 +221,11 @@ def match_descriptors(descriptors1, descriptors2, metric=None, p=2,
         descriptors, where ``matches[:, 0]`` denote the indices in the first
         and ``matches[:, 1]`` the indices in the second set of descriptors.
 
+    Notes
+    -----
+    Binary descriptors matched with the hamming metric are packed into 64 bit
+    words, whose differing bits are counted directly.
+
     """
 
     if descriptors1.shape[1] != descriptors2.shape[1]:
@@ -59,39 +237,458 @@ def match_descriptors(descriptors1, descriptors2, metric=None, p=2,
         else:
             metric = 'euclidean'
 
-    kwargs = {}
-    # Scipy raises an error if p is passed as an extra argument when it isn't
-    # necessary for the chosen metric.
-    if metric == 'minkowski':
-        kwargs['p'] = p
-    distances = cdist(descriptors1, descriptors2, metric=metric, **kwargs)
+    n1 = descriptors1.shape[0]
+    n2 = descriptors2.shape[0]
+    second_best = max_ratio < 1.0
+
+    if method == 'kdtree':
+        if metric not in _KDTREE_NORMS:
+            raise ValueError("Metric %r is not supported by the KD-tree "
+                             "matcher." % metric)
+        p_norm = _KDTREE_NORMS[metric]
+        if p_norm is None:
+            p_norm = p
+        tree2 = cKDTree(descriptors2)
+        distances, indices2 = tree2.query(descriptors1,
+                                          k=2 if second_best else 1,
+                                          eps=eps, p=p_norm)
+        second_distances = None
+        if second_best:
+            second_distances = distances[:, 1]
+            distances = distances[:, 0]
+            indices2 = indices2[:, 0]
+        if cross_check:
+            tree1 = cKDTree(descriptors1)
+            _, matches1 = tree1.query(descriptors2, k=1, eps=eps, p=p_norm)
+    elif method == 'brute':
+        if block_size is None:
+            block_size = max(1, _BLOCK_DISTANCES // max(n2, 1))
+
+        if (metric == 'hamming'
+                and np.issubdtype(descriptors1.dtype, np.bool_)
+                and np.issubdtype(descriptors2.dtype, np.bool_)):
+            block_distances = _packed_block_distances(
+                _pack_binary(descriptors1), _pack_binary(descriptors2),
+                descriptors1.shape[1])
+        else:
+            block_distances = _block_distances(descriptors1, descriptors2,
+                                               metric, p)
+
+        indices2, distances, second_distances, matches1 = _blocked_neighbors(
+            block_distances, n1, n2, block_size, second_best, cross_check)
+    else:
+        raise ValueError("Unknown method %r." % method)
 
-    indices1 = np.arange(descriptors1.shape[0])
-    indices2 = np.argmin(distances, axis=1)
+    indices1 = np.arange(n1)
 
     if cross_check:
-        matches1 = np.argmin(distances, axis=0)
         mask = indices1 == matches1[indices2]
         indices1 = indices1[mask]
         indices2 = indices2[mask]
+        distances = distances[mask]
+        if second_best:
+            second_distances = second_distances[mask]
 
-    if max_distance < np.inf:
-        mask = distances[indices1, indices2] < max_distance
-        indices1 = indices1[mask]
-        indices2 = indices2[mask]
+    indices1, indices2 = _filter_matches(indices1, indices2, distances,
+                                         second_distances, max_distance,
+                                         max_ratio)
 
-    if max_ratio < 1.0:
-        best_distances = distances[indices1, indices2]
-        distances[indices1, indices2] = np.inf
-        second_best_indices2 = np.argmin(distances[indices1], axis=1)
-        second_best_distances = distances[indices1, second_best_indices2]
-        second_best_distances[second_best_distances == 0] \
-            = np.finfo(np.double).eps
-        ratio = best_distances / second_best_distances
-        mask = ratio < max_ratio
+    matches = np.column_stack((indices1, indices2))
+
+    return matches
+
+
+class DescriptorIndex(object):
+    """Index of reference descriptors for repeated matching.
+
+    The reference descriptors are stored once, binary descriptors packed in
+    64 bit words, together with a search structure that is reused by every
+    query: hash tables on random subsets of the bits for binary descriptors
+    (locality sensitive hashing) or a KD-tree for float descriptors.
+
+    Parameters
+    ----------
+    metric : {'hamming', 'euclidean', 'cityblock', 'chebyshev', 'minkowski'}, optional
+        The metric to compute the distance between two descriptors. By
+        default, the Hamming distance is used for binary descriptors and the
+        L2-norm for descriptors of dtype float, as in `match_descriptors`.
+    p : int, optional
+        The p-norm to apply for ``metric='minkowski'``.
+    method : {'lsh', 'kdtree', 'brute'}, optional
+        Search structure. 'lsh' looks for the closest descriptors among those
+        falling in the same bucket as the query in at least one hash table,
+        and only supports binary descriptors with the Hamming distance.
+        'kdtree' only supports float descriptors, and 'brute' compares the
+        queries with all the descriptors. By default, 'lsh' is used for
+        binary descriptors and 'kdtree' for float descriptors.
+    n_tables : int, optional
+        Number of hash tables of the 'lsh' method. More tables find more of
+        the true closest descriptors, at the cost of memory and time.
+    key_size : int, optional
+        Number of bits hashed by each table of the 'lsh' method, at most 64.
+        Larger keys yield smaller buckets, hence faster but less accurate
+        queries.
+    eps : float, optional
+        Approximation of the 'kdtree' method: the closest descriptors found
+        are at most ``1 + eps`` times farther than the true ones.
+    random_state : int, RandomState instance or None, optional
+        Random state used to draw the bits hashed by the tables of the 'lsh'
+        method.
+
+    Attributes
+    ----------
+    descriptors : (N, W) array of uint64 or (N, P) array
+        Reference descriptors, packed in `W` words for binary descriptors.
+
+    Notes
+    -----
+    The 'lsh' method is approximate: a query whose closest reference
+    descriptor shares no bucket with it is matched to the closest descriptor
+    of its buckets, or not matched at all if its buckets are all empty. Cross
+    checking is exact, the query descriptors being compared with each other
+    by brute force.
+
+    Examples
+    --------
+    >>> rng = np.random.RandomState(0)
+    >>> reference = rng.rand(1000, 256) > 0.5
+    >>> index = DescriptorIndex(random_state=0)
+    >>> index.add(reference)
+    >>> len(index)
+    1000
+    >>> queries = reference[[10, 20, 30]].copy()
+    >>> queries[:, :8] = ~queries[:, :8]
+    >>> index.query(queries)
+    array([[ 0, 10],
+           [ 1, 20],
+           [ 2, 30]])
+
+    """
+
+    def __init__(self, metric=None, p=2, method=None, n_tables=12,
+                 key_size=12, eps=0, random_state=None):
+        self.metric = metric
+        self.p = p
+        self.method = method
+        self.n_tables = n_tables
+        self.key_size = key_size
+        self.eps = eps
+        self.random_state = random_state
+
+        self.descriptors = None
+        self._n_bits = None
+        # bits hashed by each table, and sorted keys and descriptor indices
+        # of each table
+        self._bits = None
+        self._keys = None
+        self._ids = None
+        self._tree = None
+
+    def __len__(self):
+        if self.descriptors is None:
+            return 0
+        return self.descriptors.shape[0]
+
+    @property
+    def nbytes(self):
+        """Memory used by the descriptors and the hash tables, in bytes."""
+        return sum(array.nbytes for array in (self.descriptors, self._keys,
+                                              self._ids)
+                   if array is not None)
+
+    def _binary(self):
+        return self._n_bits is not None
+
+    def _setup(self, descriptors):
+        """Choose the metric and the method from the first descriptors."""
+        binary = np.issubdtype(descriptors.dtype, np.bool_)
+        if self.metric is None:
+            self.metric = 'hamming' if binary else 'euclidean'
+        if self.method is None:
+            self.method = 'lsh' if binary else 'kdtree'
+
+        if self.method not in ('lsh', 'kdtree', 'brute'):
+            raise ValueError("Unknown method %r." % self.method)
+        if binary and self.metric != 'hamming':
+            raise ValueError("Binary descriptors are indexed with the "
+                             "hamming metric.")
+        if self.method == 'lsh' and not binary:
+            raise ValueError("The 'lsh' method only supports binary "
+                             "descriptors.")
+        if self.method == 'kdtree' and (binary or
+                                        self.metric not in _KDTREE_NORMS):
+            raise ValueError("The 'kdtree' method only supports float "
+                             "descriptors and the %s metrics."
+                             % ', '.join(sorted(_KDTREE_NORMS)))
+
+        if binary:
+            self._n_bits = descriptors.shape[1]
+            self.descriptors = np.empty((0, -(-self._n_bits // 64)),
+                                        dtype=np.uint64)
+        else:
+            self.descriptors = np.empty((0, descriptors.shape[1]),
+                                        dtype=descriptors.dtype)
+
+        if self.method == 'lsh':
+            random_state = check_random_state(self.random_state)
+            key_size = min(self.key_size, self._n_bits, 64)
+            self._bits = np.stack([
+                random_state.choice(self._n_bits, key_size, replace=False)
+                for _ in range(self.n_tables)])
+            self._keys = np.empty((self.n_tables, 0), dtype=np.uint64)
+            self._ids = np.empty((self.n_tables, 0), dtype=np.intp)
+
+    def _check_descriptors(self, descriptors):
+        descriptors = np.asarray(descriptors)
+        if descriptors.ndim != 2:
+            raise ValueError("Descriptors must be a 2-D array.")
+        if self.descriptors is None:
+            self._setup(descriptors)
+        binary = np.issubdtype(descriptors.dtype, np.bool_)
+        n_features = (self._n_bits if self._binary()
+                      else self.descriptors.shape[1])
+        if binary != self._binary() or descriptors.shape[1] != n_features:
+            raise ValueError("Descriptors must be of the same type and "
+                             "length as the indexed descriptors.")
+        return descriptors
+
+    def _block_distances(self, descriptors1, descriptors2):
+        """Function computing blocks of distances, see `_blocked_neighbors`.
+
+        Binary descriptors must be packed.
+        """
+        if self._binary():
+            return _packed_block_distances(descriptors1, descriptors2,
+                                           self._n_bits)
+        return _block_distances(descriptors1, descriptors2, self.metric,
+                                self.p)
+
+    def _hash(self, descriptors):
+        """Keys of the descriptors in each hash table."""
+        return np.stack([_pack_binary(descriptors[:, bits])[:, 0]
+                         for bits in self._bits])
+
+    def add(self, descriptors):
+        """Add reference descriptors to the index.
+
+        The added descriptors are numbered after the descriptors already in
+        the index.
+
+        Parameters
+        ----------
+        descriptors : (N, P) array
+            Descriptors to add, binary or float.
+
+        """
+        descriptors = self._check_descriptors(descriptors)
+        start = len(self)
+
+        if self._binary():
+            self.descriptors = np.concatenate(
+                (self.descriptors, _pack_binary(descriptors)))
+        else:
+            self.descriptors = np.concatenate((self.descriptors,
+                                               descriptors))
+        self._tree = None
+
+        if self.method == 'lsh':
+            keys = np.concatenate((self._keys, self._hash(descriptors)),
+                                  axis=1)
+            ids = np.concatenate(
+                (self._ids, np.broadcast_to(
+                    np.arange(start, len(self)),
+                    (self.n_tables, descriptors.shape[0]))), axis=1)
+            order = np.argsort(keys, axis=1, kind='mergesort')
+            tables = np.arange(self.n_tables)[:, None]
+            self._keys = keys[tables, order]
+            self._ids = ids[tables, order]
+
+    def _lsh_neighbors(self, descriptors, packed, second_best):
+        """Closest indexed descriptors among those of the same buckets."""
+        n_queries = descriptors.shape[0]
+        n_refs = len(self)
+
+        pairs = []
+        for keys, ids, query_keys in zip(self._keys, self._ids,
+                                         self._hash(descriptors)):
+            start = np.searchsorted(keys, query_keys, side='left')
+            counts = np.searchsorted(keys, query_keys, side='right') - start
+            offsets = np.cumsum(counts) - counts
+            positions = (np.arange(counts.sum())
+                         + np.repeat(start - offsets, counts))
+            pairs.append(np.repeat(np.arange(n_queries), counts) * n_refs
+                         + ids[positions])
+        pairs = np.unique(np.concatenate(pairs))
+        queries = pairs // n_refs
+        refs = pairs % n_refs
+
+        distances = np.empty(pairs.shape[0], dtype=np.double)
+        _hamming_pairs(packed, self.descriptors, queries, refs, distances)
+        distances /= self._n_bits
+
+        # sort the candidates of each query by distance, the lowest index
+        # first in case of ties
+        order = np.lexsort((distances, queries))
+        queries = queries[order]
+        refs = refs[order]
+        distances = distances[order]
+        first = np.flatnonzero(np.r_[True, queries[1:] != queries[:-1]])
+
+        indices = np.full(n_queries, -1, dtype=np.intp)
+        best_distances = np.full(n_queries, np.inf)
+        indices[queries[first]] = refs[first]
+        best_distances[queries[first]] = distances[first]
+
+        second_distances = None
+        if second_best:
+            second_distances = np.full(n_queries, np.inf)
+            second = first + 1
+            has_second = second < queries.shape[0]
+            has_second[has_second] = (queries[second[has_second]]
+                                      == queries[first[has_second]])
+            second_distances[queries[first[has_second]]] = \
+                distances[second[has_second]]
+
+        return indices, best_distances, second_distances
+
+    def query(self, descriptors, max_distance=np.inf, cross_check=True,
+              max_ratio=1.0, block_size=None):
+        """Match descriptors against the indexed descriptors.
+
+        Parameters
+        ----------
+        descriptors : (M, P) array
+            Query descriptors, of the same type and length as the indexed
+            descriptors.
+        max_distance : float, optional
+            Maximum allowed distance between a query descriptor and an
+            indexed descriptor to be regarded as a match.
+        cross_check : bool, optional
+            If True, a matched pair (query, reference) is returned only if
+            the query is also the closest query descriptor to the reference.
+        max_ratio : float, optional
+            Maximum ratio of distances between the first and second closest
+            indexed descriptors, see `match_descriptors`.
+        block_size : int, optional
+            Number of query descriptors compared at a time by brute force.
+
+        Returns
+        -------
+        matches : (Q, 2) array
+            Indices of corresponding matches, ``matches[:, 0]`` in the query
+            descriptors and ``matches[:, 1]`` in the indexed descriptors.
+
+        """
+        descriptors = self._check_descriptors(descriptors)
+        n_queries = descriptors.shape[0]
+        n_refs = len(self)
+        if n_queries == 0 or n_refs == 0:
+            return np.empty((0, 2), dtype=np.intp)
+
+        second_best = max_ratio < 1.0
+        queries = descriptors
+        if self._binary():
+            queries = _pack_binary(descriptors)
+
+        if self.method == 'lsh':
+            indices2, distances, second_distances = self._lsh_neighbors(
+                descriptors, queries, second_best)
+        elif self.method == 'kdtree':
+            if self._tree is None:
+                self._tree = cKDTree(self.descriptors)
+            p_norm = _KDTREE_NORMS[self.metric]
+            if p_norm is None:
+                p_norm = self.p
+            distances, indices2 = self._tree.query(
+                descriptors, k=2 if second_best else 1, eps=self.eps,
+                p=p_norm)
+            second_distances = None
+            if second_best:
+                second_distances = distances[:, 1]
+                distances = distances[:, 0]
+                indices2 = indices2[:, 0]
+        else:
+            indices2, distances, second_distances, _ = _blocked_neighbors(
+                self._block_distances(queries, self.descriptors), n_queries,
+                n_refs, block_size or max(1, _BLOCK_DISTANCES // n_refs),
+                second_best, False)
+
+        indices1 = np.arange(n_queries)
+        mask = indices2 >= 0
         indices1 = indices1[mask]
         indices2 = indices2[mask]
+        distances = distances[mask]
+        if second_best:
+            second_distances = second_distances[mask]
 
-    matches = np.column_stack((indices1, indices2))
+        if cross_check and indices1.size:
+            # closest query to each matched reference, by brute force over
+            # the queries
+            refs, inverse = np.unique(indices2, return_inverse=True)
+            closest, _, _, _ = _blocked_neighbors(
+                self._block_distances(self.descriptors[refs], queries),
+                refs.shape[0], n_queries,
+                block_size or max(1, _BLOCK_DISTANCES // n_queries),
+                False, False)
+            mask = closest[inverse] == indices1
+            indices1 = indices1[mask]
+            indices2 = indices2[mask]
+            distances = distances[mask]
+            if second_best:
+                second_distances = second_distances[mask]
 
-    return matches
+        indices1, indices2 = _filter_matches(indices1, indices2, distances,
+                                             second_distances, max_distance,
+                                             max_ratio)
+
+        return np.column_stack((indices1, indices2))
+
+    def save(self, fname):
+        """Save the index to a ``.npz`` file.
+
+        Parameters
+        ----------
+        fname : str or file
+            File name or file object, see ``numpy.savez``.
+
+        """
+        if self.descriptors is None:
+            raise ValueError("Cannot save an empty index.")
+        arrays = dict(metric=self.metric, p=self.p, method=self.method,
+                      n_tables=self.n_tables, key_size=self.key_size,
+                      eps=self.eps, descriptors=self.descriptors)
+        if self._binary():
+            arrays['n_bits'] = self._n_bits
+        if self.method == 'lsh':
+            arrays.update(bits=self._bits, keys=self._keys, ids=self._ids)
+        np.savez(fname, **arrays)
+
+    @classmethod
+    def load(cls, fname):
+        """Load an index saved with `save`.
+
+        Parameters
+        ----------
+        fname : str or file
+            File name or file object, see ``numpy.load``.
+
+        Returns
+        -------
+        index : DescriptorIndex
+            The loaded index.
+
+        """
+        with np.load(fname) as data:
+            index = cls(metric=str(data['metric']), p=data['p'].item(),
+                        method=str(data['method']),
+                        n_tables=int(data['n_tables']),
+                        key_size=int(data['key_size']),
+                        eps=float(data['eps']))
+            index.descriptors = data['descriptors']
+            if 'n_bits' in data:
+                index._n_bits = int(data['n_bits'])
+            if index.method == 'lsh':
+                index._bits = data['bits']
+                index._keys = data['keys']
+                index._ids = data['ids']
+        return index
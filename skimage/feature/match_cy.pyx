@@ -0,0 +1,72 @@
+#cython: cdivision=True
+#cython: boundscheck=False
+#cython: nonecheck=False
+#cython: wraparound=False
+
+from libc.stdint cimport uint64_t
+
+
+cdef inline Py_ssize_t _popcount(uint64_t x) nogil:
+    """Number of bits set in `x`."""
+    x = x - ((x >> 1) & <uint64_t>0x5555555555555555)
+    x = ((x & <uint64_t>0x3333333333333333)
+         + ((x >> 2) & <uint64_t>0x3333333333333333))
+    x = (x + (x >> 4)) & <uint64_t>0x0f0f0f0f0f0f0f0f
+    return <Py_ssize_t>((x * <uint64_t>0x0101010101010101) >> 56)
+
+
+def _hamming_distances(uint64_t[:, ::1] packed1, uint64_t[:, ::1] packed2,
+                       double[:, ::1] out):
+    """Number of differing bits between all pairs of packed descriptors.
+
+    Parameters
+    ----------
+    packed1 : (M, W) array of uint64
+        First set of descriptors, packed in `W` words.
+    packed2 : (N, W) array of uint64
+        Second set of descriptors, packed in `W` words.
+    out : (M, N) array of double
+        Output array.
+
+    """
+
+    cdef Py_ssize_t i, j, k, count
+    cdef Py_ssize_t n_words = packed1.shape[1]
+
+    with nogil:
+        for i in range(packed1.shape[0]):
+            for j in range(packed2.shape[0]):
+                count = 0
+                for k in range(n_words):
+                    count = count + _popcount(packed1[i, k] ^ packed2[j, k])
+                out[i, j] = count
+
+
+def _hamming_pairs(uint64_t[:, ::1] packed1, uint64_t[:, ::1] packed2,
+                   Py_ssize_t[::1] indices1, Py_ssize_t[::1] indices2,
+                   double[::1] out):
+    """Number of differing bits between selected pairs of descriptors.
+
+    Parameters
+    ----------
+    packed1 : (M, W) array of uint64
+        First set of descriptors, packed in `W` words.
+    packed2 : (N, W) array of uint64
+        Second set of descriptors, packed in `W` words.
+    indices1, indices2 : (K, ) array of intp
+        Indices of the descriptors of each pair in the first and second set.
+    out : (K, ) array of double
+        Output array.
+
+    """
+
+    cdef Py_ssize_t i, k, count
+    cdef Py_ssize_t n_words = packed1.shape[1]
+
+    with nogil:
+        for i in range(indices1.shape[0]):
+            count = 0
+            for k in range(n_words):
+                count = count + _popcount(packed1[indices1[i], k]
+                                          ^ packed2[indices2[i], k])
+            out[i] = count
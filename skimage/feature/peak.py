@@ -1,8 +1,6 @@
 import numpy as np
 import scipy.ndimage as ndi
-from ..segmentation import relabel_sequential
 from .. import measure
-from ..filters import rank_order
 
 
 def _get_high_intensity_peaks(image, mask, num_peaks):
@@ -123,29 +121,14 @@ def peak_local_max(image, min_distance=1, threshold_abs=None,
 
     out = np.zeros_like(image, dtype=np.bool)
 
-    # In the case of labels, recursively build and return an output
-    # operating on each label separately
     if labels is not None:
-        label_values = np.unique(labels)
-        # Reorder label values to have consecutive integers (no gaps)
-        if np.any(np.diff(label_values) != 1):
-            mask = labels >= 1
-            labels[mask] = 1 + rank_order(labels[mask])[0].astype(labels.dtype)
-        labels = labels.astype(np.int32)
-
-        # New values for new ordering
-        label_values = np.unique(labels)
-        for label in label_values[label_values != 0]:
-            maskim = (labels == label)
-            out += peak_local_max(image * maskim, min_distance=min_distance,
-                                  threshold_abs=threshold_abs,
-                                  threshold_rel=threshold_rel,
-                                  exclude_border=exclude_border,
-                                  indices=False, num_peaks=num_peaks_per_label,
-                                  footprint=footprint, labels=None)
+        mask = _get_label_peak_mask(image, labels, min_distance,
+                                    threshold_abs, threshold_rel,
+                                    exclude_border, footprint,
+                                    num_peaks_per_label)
 
         # Select highest intensities (num_peaks)
-        coordinates = _get_high_intensity_peaks(image, out, num_peaks)
+        coordinates = _get_high_intensity_peaks(image, mask, num_peaks)
 
         if indices is True:
             return coordinates
@@ -170,13 +153,7 @@ def peak_local_max(image, min_distance=1, threshold_abs=None,
     mask = image == image_max
 
     if exclude_border:
-        # zero out the image borders
-        for i in range(mask.ndim):
-            mask = mask.swapaxes(0, i)
-            remove = (footprint.shape[i] if footprint is not None
-                      else 2 * exclude_border)
-            mask[:remove // 2] = mask[-remove // 2:] = False
-            mask = mask.swapaxes(0, i)
+        _exclude_border(mask, footprint, exclude_border)
 
     # find top peak candidates above a threshold
     thresholds = []
@@ -199,6 +176,122 @@ def peak_local_max(image, min_distance=1, threshold_abs=None,
         return out
 
 
+def _exclude_border(mask, footprint, exclude_border):
+    """Zero out the borders of `mask` in place."""
+    for i in range(mask.ndim):
+        mask = mask.swapaxes(0, i)
+        remove = (footprint.shape[i] if footprint is not None
+                  else 2 * exclude_border)
+        mask[:remove // 2] = mask[-remove // 2:] = False
+        mask = mask.swapaxes(0, i)
+
+
+def _get_label_peak_mask(image, labels, min_distance, threshold_abs,
+                         threshold_rel, exclude_border, footprint,
+                         num_peaks_per_label):
+    """Peaks of each labeled region, as a boolean mask.
+
+    The peaks of each region are those of the image set to zero outside of
+    the region. They are found for all the regions at once: a single maximum
+    filter of the image set to zero on the background gives the local maxima
+    of the pixels whose neighborhood does not reach another region, and the
+    local maxima of the remaining pixels are computed from their neighbors in
+    the same region only. The thresholds are computed for each region and the
+    `num_peaks_per_label` highest peaks of each region are kept by sorting the
+    peaks by label and decreasing intensity.
+    """
+    if footprint is None:
+        size = 2 * min_distance + 1
+        footprint = np.ones((size, ) * image.ndim, dtype=bool)
+        filter_footprint = None
+    else:
+        footprint = np.asarray(footprint, dtype=bool)
+        size = None
+        filter_footprint = footprint
+
+    # consecutive labels, zero for the background
+    label_values, labels = np.unique(labels, return_inverse=True)
+    labels = labels.reshape(image.shape)
+    if label_values[0] == 0:
+        label_values = label_values[1:]
+    else:
+        labels += 1
+    n_labels = label_values.size
+    labeled = labels > 0
+    mask = np.zeros(image.shape, dtype=bool)
+    if n_labels == 0:
+        return mask
+
+    # local maxima of the image set to zero outside of the regions, which is
+    # correct as long as the neighborhood only reaches a single region
+    masked = image * labeled
+    image_max = ndi.maximum_filter(masked, size=size,
+                                   footprint=filter_footprint,
+                                   mode='constant')
+    labels_max = ndi.maximum_filter(labels, size=size,
+                                    footprint=filter_footprint,
+                                    mode='constant')
+    labels_min = ndi.minimum_filter(np.where(labeled, labels, n_labels + 1),
+                                    size=size, footprint=filter_footprint,
+                                    mode='constant', cval=n_labels + 1)
+    shared = labeled & ((labels_max != labels) | (labels_min != labels))
+
+    # local maxima over the neighbors of the same region where the
+    # neighborhood reaches several regions
+    coords = np.nonzero(shared)
+    shared_labels = labels[coords]
+    shared_max = np.full(shared_labels.shape, -np.inf)
+    center = np.array(footprint.shape) // 2
+    shape = np.array(image.shape)[:, None]
+    for offset in np.argwhere(footprint) - center:
+        neighbors = np.array(coords) + offset[:, None]
+        inside = np.all((neighbors >= 0) & (neighbors < shape), axis=0)
+        values = np.zeros(shared_labels.shape, dtype=masked.dtype)
+        neighbors = tuple(neighbors[:, inside])
+        values[inside] = np.where(labels[neighbors] == shared_labels[inside],
+                                  image[neighbors], 0)
+        shared_max = np.maximum(shared_max, values)
+    image_max[coords] = shared_max
+
+    mask = labeled & (image == image_max)
+
+    if exclude_border:
+        _exclude_border(mask, None if size else footprint, exclude_border)
+
+    # thresholds of each region, computed on the image set to zero outside of
+    # the region
+    index = np.arange(1, n_labels + 1)
+    region_min = np.asarray(ndi.minimum(image, labels, index))
+    region_max = np.asarray(ndi.maximum(image, labels, index))
+    if not (n_labels == 1 and labeled.all()):
+        region_min = np.minimum(region_min, 0)
+        region_max = np.maximum(region_max, 0)
+    if threshold_abs is None:
+        thresholds = region_min
+    else:
+        thresholds = np.full(n_labels, threshold_abs, dtype=np.double)
+    if threshold_rel is not None:
+        thresholds = np.maximum(thresholds, threshold_rel * region_max)
+    # regions of constant value have no peaks
+    thresholds = np.where(region_min == region_max, np.inf, thresholds)
+    thresholds = np.concatenate(([np.inf], thresholds))
+    mask &= image > thresholds[labels]
+
+    if num_peaks_per_label < np.inf:
+        coords = np.nonzero(mask)
+        peak_labels = labels[coords]
+        intensities = image[coords]
+        order = np.lexsort((intensities, peak_labels))
+        peak_labels = peak_labels[order]
+        # rank of each peak by decreasing intensity in its region
+        rank = (np.searchsorted(peak_labels, peak_labels, side='right') - 1
+                - np.arange(peak_labels.size))
+        removed = order[rank >= num_peaks_per_label]
+        mask[tuple(coord[removed] for coord in coords)] = False
+
+    return mask
+
+
 def _prominent_peaks(image, min_xdistance=1, min_ydistance=1,
                      threshold=None, num_peaks=np.inf):
     """Return peaks with non-maximum suppression.
@@ -3,8 +3,12 @@ Port of Manuel Guizar's code from:
 http://www.mathworks.com/matlabcentral/fileexchange/18401-efficient-subpixel-image-registration-by-cross-correlation
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 
+from .._shared.fft import fftn, ifftn, rfftn, irfftn
+
 
 def _upsampled_dft(data, upsampled_region_size,
                    upsample_factor=1, axis_offsets=None):
@@ -176,6 +180,52 @@ def register_translation(src_image, target_image, upsample_factor=1,
     image_product = src_freq * target_freq.conj()
     cross_correlation = np.fft.ifftn(image_product)
 
+    shifts, CCmax = _cross_correlation_shifts(image_product,
+                                              cross_correlation,
+                                              upsample_factor)
+
+    if return_error:
+        if upsample_factor == 1:
+            src_amp = np.sum(np.abs(src_freq) ** 2) / src_freq.size
+            target_amp = np.sum(np.abs(target_freq) ** 2) / target_freq.size
+        else:
+            normalization = src_freq.size * float(upsample_factor) ** 2
+            src_amp = _upsampled_dft(src_freq * src_freq.conj(),
+                                     1, upsample_factor)[0, 0]
+            src_amp /= normalization
+            target_amp = _upsampled_dft(target_freq * target_freq.conj(),
+                                        1, upsample_factor)[0, 0]
+            target_amp /= normalization
+
+        return shifts, _compute_error(CCmax, src_amp, target_amp),\
+            _compute_phasediff(CCmax)
+    else:
+        return shifts
+
+
+def _cross_correlation_shifts(image_product, cross_correlation,
+                              upsample_factor):
+    """Shift maximizing a cross-correlation.
+
+    Parameters
+    ----------
+    image_product : array
+        Cross-power spectrum of the images. Only used if `upsample_factor`
+        is greater than 1.
+    cross_correlation : array
+        Inverse DFT of ``image_product``.
+    upsample_factor : int
+        Upsampling factor of the cross-correlation around its maximum.
+
+    Returns
+    -------
+    shifts : ndarray
+        Shift vector (in pixels) maximizing the cross-correlation.
+    CCmax : complex
+        The value of the (upsampled) cross-correlation at its maximum point.
+    """
+    shape = cross_correlation.shape
+
     # Locate maximum
     maxima = np.unravel_index(np.argmax(np.abs(cross_correlation)),
                               cross_correlation.shape)
@@ -185,10 +235,7 @@ def register_translation(src_image, target_image, upsample_factor=1,
     shifts[shifts > midpoints] -= np.array(shape)[shifts > midpoints]
 
     if upsample_factor == 1:
-        if return_error:
-            src_amp = np.sum(np.abs(src_freq) ** 2) / src_freq.size
-            target_amp = np.sum(np.abs(target_freq) ** 2) / target_freq.size
-            CCmax = cross_correlation[maxima]
+        CCmax = cross_correlation[maxima]
     # If upsampling > 1, then refine estimate with matrix multiply DFT
     else:
         # Initial shift estimate in upsampled grid
@@ -197,7 +244,7 @@ def register_translation(src_image, target_image, upsample_factor=1,
         # Center of output array at dftshift + 1
         dftshift = np.fix(upsampled_region_size / 2.0)
         upsample_factor = np.array(upsample_factor, dtype=np.float64)
-        normalization = (src_freq.size * upsample_factor ** 2)
+        normalization = (cross_correlation.size * upsample_factor ** 2)
         # Matrix multiply DFT around the current shift estimate
         sample_region_offset = dftshift - shifts*upsample_factor
         cross_correlation = _upsampled_dft(image_product.conj(),
@@ -214,22 +261,213 @@ def register_translation(src_image, target_image, upsample_factor=1,
 
         shifts = shifts + maxima / upsample_factor
 
-        if return_error:
-            src_amp = _upsampled_dft(src_freq * src_freq.conj(),
-                                     1, upsample_factor)[0, 0]
-            src_amp /= normalization
-            target_amp = _upsampled_dft(target_freq * target_freq.conj(),
-                                        1, upsample_factor)[0, 0]
-            target_amp /= normalization
-
     # If its only one row or column the shift along that dimension has no
     # effect. We set to zero.
-    for dim in range(src_freq.ndim):
+    for dim in range(cross_correlation.ndim):
         if shape[dim] == 1:
             shifts[dim] = 0
 
-    if return_error:
-        return shifts, _compute_error(CCmax, src_amp, target_amp),\
-            _compute_phasediff(CCmax)
-    else:
-        return shifts
+    return shifts, CCmax
+
+
+def _full_spectrum(half_spectrum, last_axis_size):
+    """Full DFT of a real signal from the half spectrum given by `rfftn`."""
+    n_half = half_spectrum.shape[-1]
+    mirrored = half_spectrum[..., 1:last_axis_size - n_half + 1]
+    mirrored = mirrored[..., ::-1].conj()
+    # X[-k] = conj(X[k]) for the other axes too
+    for axis in range(half_spectrum.ndim - 1):
+        mirrored = np.roll(np.flip(mirrored, axis), 1, axis)
+    return np.concatenate([half_spectrum, mirrored], axis=-1)
+
+
+# number of pixels of the moving images transformed at a time by
+# TranslationRegistrar
+_REGISTRATION_BATCH_PIXELS = 1 << 24
+
+
+class TranslationRegistrar(object):
+    """Register many images to a fixed reference image by cross-correlation.
+
+    Computes the shifts of `register_translation` between a reference image
+    and each image of a stack. The spectrum of the reference is computed
+    once, the spectra and cross-correlations of the images of the stack are
+    computed with batched FFTs, using real FFTs for real images, and the
+    subpixel refinement of the shifts of several images is done in parallel.
+
+    Parameters
+    ----------
+    reference : array
+        Reference image.
+    upsample_factor : int, optional
+        Upsampling factor. Images will be registered to within
+        ``1 / upsample_factor`` of a pixel. Default is 1 (no upsampling).
+    space : string, one of "real" or "fourier", optional
+        Defines how the algorithm interprets input data.  "real" means data
+        will be FFT'd to compute the correlation, while "fourier" data will
+        bypass FFT of input data.  Case insensitive.
+    num_workers : int, optional
+        Number of threads refining the shifts of the images.
+    workers : int, optional
+        Number of workers computing the FFTs, when supported by the FFT
+        backend (scipy >= 1.4).
+
+    See Also
+    --------
+    register_translation
+
+    Examples
+    --------
+    >>> from skimage import data
+    >>> reference = data.camera()
+    >>> images = np.stack([np.roll(reference, shift, axis=(0, 1))
+    ...                    for shift in [(2, -3), (-1, 4), (5, 0)]])
+    >>> registrar = TranslationRegistrar(reference)
+    >>> shifts, errors, phasediffs = registrar.register(images)
+    >>> shifts.tolist()
+    [[-2.0, 3.0], [1.0, -4.0], [-5.0, 0.0]]
+
+    """
+
+    def __init__(self, reference, upsample_factor=1, space="real",
+                 num_workers=1, workers=None):
+        reference = np.asarray(reference)
+        self.shape = reference.shape
+        self.upsample_factor = upsample_factor
+        self.num_workers = num_workers
+        self.workers = workers
+        self._axes = tuple(range(1, reference.ndim + 1))
+
+        # assume complex data is already in Fourier space
+        if space.lower() == 'fourier':
+            self._space = 'fourier'
+            self._reference_freq = reference
+        # real data needs to be fft'd.
+        elif space.lower() == 'real':
+            self._space = 'real'
+            if np.iscomplexobj(reference):
+                self._reference_freq = fftn(reference, workers=workers)
+            else:
+                self._reference_freq = rfftn(reference, workers=workers)
+        else:
+            raise ValueError("Error: TranslationRegistrar only knows the "
+                             "\"real\" and \"fourier\" values for the "
+                             "``space`` argument.")
+
+        self._half = self._reference_freq.shape != self.shape
+        self._reference_amp = self._amplitude(self._reference_freq)
+
+    def _amplitude(self, freq):
+        """Sum of the squared spectrum over the last `ndim` axes."""
+        power = np.abs(freq) ** 2
+        if self._half:
+            # the half spectrum of a real image holds each frequency but the
+            # zero and Nyquist ones and its conjugate
+            weights = np.full(freq.shape[-1], 2.)
+            weights[0] = 1
+            if self.shape[-1] % 2 == 0:
+                weights[-1] = 1
+            power *= weights
+        return power.reshape(power.shape[:freq.ndim - len(self.shape)]
+                             + (-1,)).sum(axis=-1)
+
+    def _spectra(self, images):
+        """Spectra of a stack of images."""
+        if self._space == 'fourier':
+            return images
+        if self._half:
+            if np.iscomplexobj(images):
+                raise ValueError("Images must be real if the reference "
+                                 "image is real.")
+            return rfftn(images, axes=self._axes, workers=self.workers)
+        return fftn(images, axes=self._axes, workers=self.workers)
+
+    def register(self, images, return_error=True):
+        """Register an image or a stack of images to the reference.
+
+        Parameters
+        ----------
+        images : array
+            Image to register, of the same shape as the reference, or
+            ``(N, ...)`` stack of such images.
+        return_error : bool, optional
+            Returns error and phase difference if on,
+            otherwise only shifts are returned
+
+        Returns
+        -------
+        shifts : ndarray
+            Shift vector (in pixels) required to register each image with
+            the reference, of shape ``(N, ndim)`` for a stack.
+        error : float or ndarray
+            Translation invariant normalized RMS error between the reference
+            and each image.
+        phasediff : float or ndarray
+            Global phase difference between the reference and each image.
+        """
+        images = np.asarray(images)
+        single = images.shape == self.shape
+        if single:
+            images = images[np.newaxis]
+        if images.shape[1:] != self.shape:
+            raise ValueError("Error: images must be same size as the "
+                             "reference image, {}.".format(self.shape))
+
+        n_images = images.shape[0]
+        ndim = len(self.shape)
+        shifts = np.empty((n_images, ndim))
+        errors = np.empty(n_images)
+        phasediffs = np.empty(n_images)
+        normalization = float(np.prod(self.shape)) * self.upsample_factor ** 2
+
+        if self.num_workers > 1:
+            executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            map_func = executor.map
+        else:
+            executor = None
+            map_func = map
+
+        chunk_size = max(1, _REGISTRATION_BATCH_PIXELS
+                         // max(1, np.prod(self.shape)))
+        try:
+            for start in range(0, n_images, chunk_size):
+                stop = min(start + chunk_size, n_images)
+                target_freq = self._spectra(images[start:stop])
+                target_amp = self._amplitude(target_freq)
+
+                # Whole-pixel shift - Compute cross-correlation by an IFFT
+                image_product = target_freq.conj()
+                image_product *= self._reference_freq
+                if self._half:
+                    cross_correlation = irfftn(image_product, s=self.shape,
+                                               axes=self._axes,
+                                               workers=self.workers)
+                else:
+                    cross_correlation = ifftn(image_product, axes=self._axes,
+                                              workers=self.workers)
+
+                def refine(i):
+                    product = image_product[i]
+                    if self._half and self.upsample_factor != 1:
+                        product = _full_spectrum(product, self.shape[-1])
+                    return _cross_correlation_shifts(product,
+                                                     cross_correlation[i],
+                                                     self.upsample_factor)
+
+                for i, (image_shifts, CCmax) in enumerate(
+                        map_func(refine, range(stop - start))):
+                    shifts[start + i] = image_shifts
+                    errors[start + i] = _compute_error(
+                        CCmax, self._reference_amp / normalization,
+                        target_amp[i] / normalization)
+                    phasediffs[start + i] = _compute_phasediff(CCmax)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        if single:
+            shifts, errors, phasediffs = shifts[0], errors[0], phasediffs[0]
+        if return_error:
+            return shifts, errors, phasediffs
+        else:
+            return shifts
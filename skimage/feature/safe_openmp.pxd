@@ -6,4 +6,5 @@ cdef extern from "conditional_omp.h":
     extern void omp_set_lock(omp_lock_t *) nogil
     extern void omp_unset_lock(omp_lock_t *) nogil
     extern int omp_test_lock(omp_lock_t *) nogil
+    extern int omp_get_max_threads() nogil
     cdef int have_openmp
\ No newline at end of file
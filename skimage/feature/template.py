@@ -1,7 +1,10 @@
 import numpy as np
+from scipy import ndimage as ndi
 from scipy.signal import fftconvolve
 
 from .._shared.utils import assert_nD
+from .._shared.fft import rfftn, irfftn, next_fast_len
+from .peak import peak_local_max
 
 
 def _window_sum_2d(image, window_shape):
@@ -177,3 +180,347 @@ def match_template(image, template, pad_input=False, mode='constant',
         slices.append(slice(d0, d1))
 
     return response[tuple(slices)]
+
+
+def _pad(image, pad_width, mode, constant_values):
+    if mode == 'constant':
+        return np.pad(image, pad_width=pad_width, mode=mode,
+                      constant_values=constant_values)
+    return np.pad(image, pad_width=pad_width, mode=mode)
+
+
+def _output_slices(image_shape, template_shape, pad_input):
+    """Slices of the padded image of the origin of the output windows."""
+    slices = []
+    for i in range(len(template_shape)):
+        if pad_input:
+            d0 = (template_shape[i] - 1) // 2
+            d1 = d0 + image_shape[i]
+        else:
+            d0 = template_shape[i] - 1
+            d1 = d0 + image_shape[i] - template_shape[i] + 1
+        # the window of output ``d`` starts at ``d + 1`` in the padded image
+        slices.append(slice(d0 + 1, d1 + 1))
+    return tuple(slices)
+
+
+def _fft_shape(image_shape, template_shape):
+    """Shape of the FFTs correlating a padded image with a template."""
+    # circular correlation does not wrap around on the output windows as
+    # long as the FFT is at least as large as the padded image
+    return tuple(next_fast_len(2 * t + s) for t, s in zip(template_shape,
+                                                          image_shape))
+
+
+def _template_spectrum(template, fft_shape, dtype, workers):
+    """Spectrum of the zero-mean flipped template, and its sum of squared
+    deviations.
+
+    Correlating with the zero-mean template directly gives the numerator
+    ``xcorr - image_window_sum * template_mean`` of the normalized
+    correlation. The template is flipped and placed so that the correlation of
+    the window starting at ``p`` lands at ``p``.
+    """
+    template = np.asarray(template, dtype=np.float64)
+    template = template - template.mean()
+    kernel = np.zeros(fft_shape, dtype=dtype)
+    kernel[tuple(slice(0, t) for t in template.shape)] = \
+        template[(slice(None, None, -1),) * template.ndim]
+    kernel = np.roll(kernel, tuple(1 - t for t in template.shape),
+                     axis=tuple(range(template.ndim)))
+    return rfftn(kernel, workers=workers), np.sum(template ** 2)
+
+
+def _window_deviations(image, template_shape, slices):
+    """Root sum of squared deviations of the image over the output windows.
+
+    Parameters
+    ----------
+    image : array
+        Padded image, overwritten.
+    template_shape : tuple of int
+        Shape of the windows.
+    slices : tuple of slice
+        Output windows, see `_output_slices`.
+
+    Returns
+    -------
+    deviations : array
+        Root sum of squared deviations of each window, a view of `image`.
+    valid : array of bool
+        Windows whose variance is not within rounding noise.
+    """
+    # local means of the image and of its square over the windows,
+    # the windows of the output being centered at ``start + m // 2``
+    centers = tuple(slice(sl.start + t // 2, sl.stop + t // 2)
+                    for sl, t in zip(slices, template_shape))
+    mean = ndi.uniform_filter(image, template_shape)[centers]
+    np.square(image, out=image)
+    deviations = ndi.uniform_filter(image, template_shape,
+                                    output=image)[centers]
+
+    np.square(mean, out=mean)
+    deviations -= mean
+    # the variance of flat windows is rounding noise
+    mean *= 4 * np.finfo(image.dtype).eps
+    valid = deviations > mean
+    deviations *= np.prod(template_shape)
+    np.maximum(deviations, 0, out=deviations)
+    np.sqrt(deviations, out=deviations)
+    return deviations, valid
+
+
+def _normalize_response(numerator, deviations, valid, template_ssd):
+    """Divide the correlation by the deviations of the image and template
+    in place."""
+    template_deviation = np.sqrt(template_ssd)
+    # avoid zero-division
+    if template_deviation > 0:
+        mask = valid & (deviations > np.finfo(numerator.dtype).eps
+                        / template_deviation)
+        np.divide(numerator, deviations, out=numerator, where=mask)
+        numerator /= template_deviation
+        numerator[~mask] = 0
+    else:
+        numerator[...] = 0
+    return numerator
+
+
+class TemplateMatcher(object):
+    """Match a fixed template to images of a given shape.
+
+    Computes the same response as `match_template`, the mean, sum of squared
+    deviations and spectrum of the template being computed once, when the
+    matcher is created, rather than on each call. The correlation with the
+    template is computed with real FFTs of an efficient size, in single
+    precision if requested, and the response is computed in place.
+
+    Parameters
+    ----------
+    template : (m, n[, d]) array
+        Template to locate.
+    image_shape : tuple of int
+        Shape of the images to which the template is matched. It must be
+        `(M >= m, N >= n[, D >= d])`.
+    pad_input : bool, optional
+        If True, pad the images so that the output is the same size as the
+        images, and output values correspond to the template center.
+        Otherwise, the output is an array with shape `(M - m + 1, N - n + 1)`
+        and matches correspond to origin (top-left corner) of the template.
+    mode : see `numpy.pad`, optional
+        Padding mode.
+    constant_values : see `numpy.pad`, optional
+        Constant values used in conjunction with ``mode='constant'``.
+    dtype : {np.float64, np.float32}, optional
+        Precision of the computations and of the response.
+    workers : int, optional
+        Number of workers computing the FFTs, when supported by the FFT
+        backend (scipy >= 1.4).
+
+    Attributes
+    ----------
+    output_shape : tuple of int
+        Shape of the response.
+
+    See Also
+    --------
+    match_template
+
+    Examples
+    --------
+    >>> template = np.zeros((3, 3))
+    >>> template[1, 1] = 1
+    >>> matcher = TemplateMatcher(template, (6, 6))
+    >>> image = np.zeros((6, 6))
+    >>> image[1, 1] = 1
+    >>> image[4, 4] = -1
+    >>> np.round(matcher.match(image), 3)
+    array([[ 1.   , -0.125,  0.   ,  0.   ],
+           [-0.125, -0.125,  0.   ,  0.   ],
+           [ 0.   ,  0.   ,  0.125,  0.125],
+           [ 0.   ,  0.   ,  0.125, -1.   ]])
+
+    """
+
+    def __init__(self, template, image_shape, pad_input=False,
+                 mode='constant', constant_values=0, dtype=np.float64,
+                 workers=None):
+        template = np.asarray(template)
+        image_shape = tuple(image_shape)
+        if len(image_shape) not in (2, 3):
+            raise ValueError("Only 2-D and 3-D images are supported.")
+        if template.ndim != len(image_shape):
+            raise ValueError("Dimensionality of template must be equal to "
+                             "the dimensionality of image.")
+        if np.any(np.less(image_shape, template.shape)):
+            raise ValueError("Image must be larger than template.")
+
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("`dtype` must be float32 or float64.")
+
+        self.image_shape = image_shape
+        self.template_shape = template.shape
+        self.mode = mode
+        self.constant_values = constant_values
+        self.workers = workers
+        self._pad_width = tuple((width, width) for width in template.shape)
+        self._slices = _output_slices(image_shape, template.shape, pad_input)
+        self.output_shape = tuple(sl.stop - sl.start for sl in self._slices)
+
+        self._fft_shape = _fft_shape(image_shape, template.shape)
+        self._spectrum, self._template_ssd = _template_spectrum(
+            template, self._fft_shape, self.dtype, workers)
+
+    def match(self, image):
+        """Match the template to an image.
+
+        Parameters
+        ----------
+        image : array
+            Input image, of shape `image_shape`.
+
+        Returns
+        -------
+        output : array
+            Response image with correlation coefficients, of dtype `dtype`.
+        """
+        image = np.asarray(image)
+        if image.shape != self.image_shape:
+            raise ValueError("Image must have the shape given to the "
+                             "matcher, {}.".format(self.image_shape))
+
+        image = _pad(image.astype(self.dtype, copy=False), self._pad_width,
+                     self.mode, self.constant_values)
+
+        spectrum = rfftn(image, s=self._fft_shape, workers=self.workers)
+        spectrum *= self._spectrum
+        numerator = irfftn(spectrum, s=self._fft_shape, workers=self.workers)
+        del spectrum
+        numerator = numerator[self._slices]
+
+        deviations, valid = _window_deviations(image, self.template_shape,
+                                               self._slices)
+        return _normalize_response(numerator, deviations, valid,
+                                   self._template_ssd)
+
+
+def match_templates(image, templates, pad_input=False, mode='constant',
+                    constant_values=0, num_peaks=None, min_distance=1,
+                    dtype=np.float64, workers=None):
+    """Match several templates to an image using normalized correlation.
+
+    Computes the response of `match_template` for each template. The
+    spectrum of the padded image and its local statistics are computed once
+    for all the templates of the same shape, so that each template only
+    costs the FFT of the template and one inverse FFT.
+
+    Parameters
+    ----------
+    image : (M, N[, D]) array
+        2-D or 3-D input image.
+    templates : sequence of (m, n[, d]) arrays
+        Templates to locate. They must be `(m <= M, n <= N[, d <= D])` and
+        may have different shapes.
+    pad_input : bool, optional
+        If True, pad `image` so that the responses are the same size as the
+        image, and output values correspond to the template center. See
+        `match_template`.
+    mode : see `numpy.pad`, optional
+        Padding mode.
+    constant_values : see `numpy.pad`, optional
+        Constant values used in conjunction with ``mode='constant'``.
+    num_peaks : int, optional
+        If given, only the `num_peaks` highest peaks of each response,
+        separated by at least `min_distance`, are returned instead of the
+        responses, see `peak_local_max`.
+    min_distance : int, optional
+        Minimum number of pixels separating the peaks.
+    dtype : {np.float64, np.float32}, optional
+        Precision of the computations and of the responses.
+    workers : int, optional
+        Number of workers computing the FFTs, when supported by the FFT
+        backend (scipy >= 1.4).
+
+    Returns
+    -------
+    responses : list of arrays
+        Response image of each template. Only returned if `num_peaks` is
+        None.
+    peaks : list of (P, ndim) arrays
+        Coordinates of the peaks of the response of each template, by
+        decreasing correlation. Only returned if `num_peaks` is given.
+    scores : list of (P, ) arrays
+        Correlation coefficients of the peaks. Only returned if `num_peaks`
+        is given.
+
+    See Also
+    --------
+    match_template, TemplateMatcher
+
+    Examples
+    --------
+    >>> image = np.zeros((6, 6))
+    >>> image[1, 1] = 1
+    >>> image[4, 3:5] = 1
+    >>> dot = np.zeros((3, 3))
+    >>> dot[1, 1] = 1
+    >>> line = np.zeros((3, 4))
+    >>> line[1, 1:3] = 1
+    >>> peaks, scores = match_templates(image, [dot, line], num_peaks=1)
+    >>> peaks
+    [array([[0, 0]]), array([[3, 2]])]
+    >>> [round(float(score), 3) for score, in scores]
+    [1.0, 1.0]
+
+    """
+    assert_nD(image, (2, 3))
+    image = np.asarray(image)
+    templates = [np.asarray(template) for template in templates]
+    for template in templates:
+        if template.ndim != image.ndim:
+            raise ValueError("Dimensionality of templates must be equal to "
+                             "the dimensionality of image.")
+        if np.any(np.less(image.shape, template.shape)):
+            raise ValueError("Image must be larger than templates.")
+
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError("`dtype` must be float32 or float64.")
+
+    image = image.astype(dtype, copy=False)
+    results = [None] * len(templates)
+
+    template_shapes = sorted(set(template.shape for template in templates))
+    for template_shape in template_shapes:
+        padded = _pad(image, tuple((width, width) for width in template_shape),
+                      mode, constant_values)
+        fft_shape = _fft_shape(image.shape, template_shape)
+        slices = _output_slices(image.shape, template_shape, pad_input)
+
+        image_spectrum = rfftn(padded, s=fft_shape, workers=workers)
+        deviations, valid = _window_deviations(padded, template_shape,
+                                               slices)
+
+        for i, template in enumerate(templates):
+            if template.shape != template_shape:
+                continue
+            spectrum, template_ssd = _template_spectrum(template, fft_shape,
+                                                        dtype, workers)
+            spectrum *= image_spectrum
+            numerator = irfftn(spectrum, s=fft_shape, workers=workers)
+            del spectrum
+            response = _normalize_response(numerator[slices], deviations,
+                                           valid, template_ssd)
+
+            if num_peaks is None:
+                results[i] = response.copy()
+            else:
+                peaks = peak_local_max(response, min_distance=min_distance,
+                                       exclude_border=False,
+                                       num_peaks=num_peaks)
+                results[i] = (peaks, response[tuple(peaks.T)])
+
+    if num_peaks is None:
+        return results
+    return [peaks for peaks, _ in results], [scores for _, scores in results]
@@ -2,10 +2,12 @@ import numpy as np
 from skimage.draw import circle
 from skimage.draw.draw3d import ellipsoid
 from skimage.feature import blob_dog, blob_log, blob_doh
-from skimage.feature.blob import _blob_overlap
+from skimage.feature.blob import (_blob_overlap, _blob_overlap_pairs,
+                                 _prune_blobs)
 from skimage import util
+from scipy import ndimage as ndi
 import math
-from numpy.testing import assert_almost_equal
+from numpy.testing import assert_almost_equal, assert_equal
 
 
 def test_blob_dog():
@@ -369,3 +371,51 @@ def test_no_blob():
     im = np.zeros((10, 10))
     blobs = blob_log(im,  min_sigma=2, max_sigma=5, num_sigma=4)
     assert len(blobs) == 0
+
+
+def test_blob_overlap_pairs():
+    rng = np.random.RandomState(0)
+    for n_dim in (2, 3):
+        blobs = np.column_stack([rng.rand(30, n_dim) * 20,
+                                 rng.uniform(1, 5, 30)])
+        pairs = np.array([(i, j) for i in range(30) for j in range(i)])
+        overlaps = _blob_overlap_pairs(blobs, pairs)
+        expected = [_blob_overlap(blobs[i], blobs[j]) for i, j in pairs]
+        assert_almost_equal(overlaps, expected)
+
+
+def test_prune_blobs():
+    rng = np.random.RandomState(0)
+    for n_dim in (2, 3):
+        blobs = np.column_stack([rng.rand(200, n_dim) * 50,
+                                 rng.choice([1., 2., 3.], 200)])
+        pruned = _prune_blobs(blobs.copy(), 0.3)
+        assert 0 < len(pruned) < len(blobs)
+        # no pair of remaining blobs overlaps too much
+        pairs = np.array([(i, j) for i in range(len(pruned))
+                          for j in range(i)])
+        assert np.all(_blob_overlap_pairs(pruned, pairs) <= 0.3)
+        # the input is not modified
+        assert_equal(_prune_blobs(blobs, 0.3), pruned)
+
+
+def test_blob_streaming():
+    rng = np.random.RandomState(0)
+    image2d = ndi.gaussian_filter(rng.rand(100, 120), 2)
+    image3d = ndi.gaussian_filter(rng.rand(30, 30, 30), 2)
+    for image in (image2d, image3d):
+        image = (image - image.min()) / np.ptp(image)
+        for exclude_border in (False, True):
+            for detector, threshold in ((blob_log, .05), (blob_dog, .1)):
+                kwargs = dict(max_sigma=8, threshold=threshold,
+                              exclude_border=exclude_border)
+                expected = detector(image, **kwargs)
+                assert len(expected) > 0
+                assert_equal(detector(image, streaming=True, **kwargs),
+                             expected)
+                assert_equal(detector(image, streaming=True, num_workers=2,
+                                      **kwargs), expected)
+                blobs = detector(image, streaming=True, dtype=np.float32,
+                                 **kwargs)
+                assert abs(len(blobs) - len(expected)) <= 1
+    assert blob_log(np.zeros((10, 10)), streaming=True).size == 0
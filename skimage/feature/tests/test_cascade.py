@@ -21,3 +21,29 @@ def test_detector_astronaut():
                                            max_size=(123, 123))
 
     assert len(detected) == 1, 'One face should be detected.'
+
+
+def test_detector_num_threads_and_video():
+
+    trained_file = data.lbp_frontal_face_cascade_filename()
+    detector = Cascade(trained_file)
+
+    frames = [data.astronaut(), data.astronaut()[:300, 50:450],
+              data.astronaut()[:300, 50:450]]
+    params = dict(scale_factor=1.2, step_ratio=1, min_size=(60, 60),
+                  max_size=(123, 123), min_neighbour_number=1)
+
+    expected = [detector.detect_multi_scale(img=frame, **params)
+                for frame in frames]
+    assert len(expected[0]) > 1
+
+    for num_threads in (1, 2):
+        detected = [detector.detect_multi_scale(img=frame,
+                                                num_threads=num_threads,
+                                                **params)
+                    for frame in frames]
+        assert detected == expected
+
+        detected = list(detector.detect_multi_scale_video(
+            iter(frames), num_threads=num_threads, **params))
+        assert detected == expected
@@ -256,3 +256,70 @@ def test_hog_output_equivariance_multichannel():
         hog_fact = feature.hog(np.roll(img, n, axis=2), multichannel=True,
                                block_norm='L1')
         assert_almost_equal(hog_ref, hog_fact)
+
+
+@testing.parametrize('block_norm', ['L1', 'L1-sqrt', 'L2', 'L2-Hys'])
+def test_hog_batch(block_norm):
+    image = data.astronaut()[:160, :200]
+    windows = np.stack([image[r:r + 64, c:c + 48]
+                        for r in range(0, 96, 24) for c in range(0, 152, 38)])
+    for images, kwargs in (
+            (windows, dict(multichannel=True)),
+            (windows[..., 0], dict(pixels_per_cell=(7, 5),
+                                   cells_per_block=(2, 3), orientations=7)),
+            (img_as_float(windows[..., 1]), dict(transform_sqrt=True))):
+        expected = np.array([feature.hog(im, block_norm=block_norm, **kwargs)
+                             for im in images])
+        for num_threads in (1, 2):
+            descriptors = feature.hog_batch(images, block_norm=block_norm,
+                                            num_threads=num_threads,
+                                            **kwargs)
+            assert descriptors.dtype == np.float32
+            assert_almost_equal(descriptors, expected, decimal=6)
+
+
+def test_hog_batch_incorrect_dimensions():
+    with testing.raises(ValueError):
+        feature.hog_batch(np.zeros((2, 10, 10, 3)), multichannel=False)
+    with testing.raises(ValueError):
+        feature.hog_batch(np.zeros((10, 10)))
+    with testing.raises(ValueError):
+        feature.hog_batch(np.zeros((2, 10, 10)), block_norm='L3')
+
+
+@testing.parametrize('block_norm', ['L1', 'L2-Hys'])
+def test_hog_windows(block_norm):
+    image = data.astronaut()[:150, :130]
+    kwargs = dict(pixels_per_cell=(6, 5), cells_per_block=(2, 2),
+                  block_norm=block_norm, multichannel=True)
+    windows = feature.hog_windows(image, (64, 48), step=(3, 2), **kwargs)
+    assert windows.shape == (6, 9, 9, 8, 2, 2, 9)
+    assert not windows.flags.writeable
+    for i in range(windows.shape[0]):
+        for j in range(windows.shape[1]):
+            r, c = i * 3 * 6, j * 2 * 5
+            expected = feature.hog(image[r:r + 64, c:c + 48],
+                                   feature_vector=False, **kwargs)
+            # the blocks away from the border of the window only use the
+            # gradients of pixels inside the window
+            assert_almost_equal(windows[i, j, 1:-1, 1:-1],
+                                expected[1:-1, 1:-1], decimal=6)
+
+    # a window covering the whole image has the descriptor of the image
+    windows = feature.hog_windows(image, image.shape[:2], **kwargs)
+    assert windows.shape[:2] == (1, 1)
+    assert_almost_equal(windows[0, 0].ravel(), feature.hog(image, **kwargs),
+                        decimal=6)
+
+
+def test_hog_windows_incorrect_parameters():
+    image = np.zeros((32, 32))
+    with testing.raises(ValueError):
+        feature.hog_windows(image, (8, 8), cells_per_block=(2, 2))
+    with testing.raises(ValueError):
+        feature.hog_windows(image, (40, 32), cells_per_block=(2, 2))
+    with testing.raises(ValueError):
+        feature.hog_windows(image, (16, 16), step=0, cells_per_block=(2, 2))
+    with testing.raises(ValueError):
+        feature.hog_windows(np.zeros((2, 32, 32)), (16, 16),
+                            multichannel=False)
@@ -6,7 +6,8 @@ from skimage._shared.testing import assert_equal
 from skimage.data import camera
 from skimage.feature.register_translation import register_translation
 from skimage.feature.masked_register_translation import (
-    masked_register_translation, cross_correlate_masked)
+    masked_register_translation, cross_correlate_masked,
+    MaskedTranslationRegistrar)
 from skimage.io import imread
 
 # Location of test images
@@ -245,3 +246,60 @@ def test_cross_correlate_masked_autocorrelation_trivial_masks():
     # Autocorrelation should have maximum in center of array
     testing.assert_almost_equal(xcorr.max(), 1)
     testing.assert_array_equal(max_index, np.array(arr1.shape) / 2)
+
+
+def test_cross_correlate_masked_float32():
+    """Masked normalized cross-correlation in single precision should be
+    close to the double precision one, even for images with an offset."""
+    np.random.seed(23)
+
+    arr1 = camera() + 1000.
+    arr2 = np.roll(arr1, (5, -7), axis=(0, 1))
+    m1 = np.random.choice([True, False], arr1.shape, p=[3 / 4, 1 / 4])
+    m2 = np.random.choice([True, False], arr2.shape, p=[3 / 4, 1 / 4])
+
+    expected = cross_correlate_masked(arr1, arr2, m1, m2, axes=(0, 1))
+    xcorr = cross_correlate_masked(arr1, arr2, m1, m2, axes=(0, 1),
+                                   dtype=np.float32)
+    assert xcorr.dtype == np.float32
+    testing.assert_allclose(xcorr, expected, atol=1e-4)
+
+    with testing.raises(ValueError):
+        cross_correlate_masked(arr1, arr2, m1, m2, dtype=np.int32)
+
+
+def test_masked_translation_registrar():
+    """MaskedTranslationRegistrar should give the same shifts as
+    masked_register_translation."""
+    np.random.seed(23)
+
+    reference_image = camera()
+    reference_mask = np.random.choice(
+        [True, False], reference_image.shape, p=[3 / 4, 1 / 4])
+    shifts = [(-7, 12), (3, 5), (0, -20)]
+    images = [np.real(np.fft.ifft2(fourier_shift(
+        np.fft.fft2(reference_image), shift)))[32:-32, 16:-16]
+        for shift in shifts]
+    masks = [np.random.choice([True, False], image.shape, p=[3 / 4, 1 / 4])
+             for image in images]
+
+    expected = [masked_register_translation(reference_image, image,
+                                            reference_mask, mask)
+                for image, mask in zip(images, masks)]
+    for dtype in (np.float64, np.float32):
+        registrar = MaskedTranslationRegistrar(reference_image,
+                                               reference_mask, dtype=dtype)
+        assert_equal(registrar.register(images, masks), expected)
+        assert_equal(registrar.register(np.stack(images), masks), expected)
+        assert_equal(registrar.register(images[0], masks[0]), expected[0])
+        assert_equal(registrar.register(images, masks[0]),
+                     [masked_register_translation(reference_image, image,
+                                                  reference_mask, masks[0])
+                      for image in images])
+
+    with testing.raises(ValueError):
+        MaskedTranslationRegistrar(reference_image, reference_mask[1:])
+    with testing.raises(ValueError):
+        registrar.register(images, masks[:2])
+    with testing.raises(ValueError):
+        registrar.register(images[0], masks[1][1:])
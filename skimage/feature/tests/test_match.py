@@ -1,9 +1,10 @@
 import numpy as np
+from scipy.spatial.distance import cdist
 from skimage._shared.testing import assert_equal
 from skimage import data
 from skimage import transform as tf
 from skimage.color import rgb2gray
-from skimage.feature import (BRIEF, match_descriptors,
+from skimage.feature import (BRIEF, match_descriptors, DescriptorIndex,
                              corner_peaks, corner_harris)
 from skimage._shared import testing
 
@@ -176,3 +177,177 @@ def test_max_ratio():
     matches = match_descriptors(descs1, descs2, metric='euclidean',
                                 max_ratio=0.5, cross_check=False)
     assert_equal(len(matches), 1)
+
+
+def _reference_matches(descs1, descs2, metric, cross_check, max_ratio):
+    distances = cdist(descs1, descs2, metric=metric)
+    indices1 = np.arange(descs1.shape[0])
+    indices2 = np.argmin(distances, axis=1)
+    if cross_check:
+        mask = indices1 == np.argmin(distances, axis=0)[indices2]
+        indices1 = indices1[mask]
+        indices2 = indices2[mask]
+    if max_ratio < 1:
+        best = distances[indices1, indices2]
+        distances[indices1, indices2] = np.inf
+        second = np.maximum(distances[indices1].min(axis=1),
+                            np.finfo(np.double).eps)
+        mask = best / second < max_ratio
+        indices1 = indices1[mask]
+        indices2 = indices2[mask]
+    return np.column_stack((indices1, indices2))
+
+
+def test_binary_descriptors_packed():
+    rng = np.random.RandomState(0)
+    for n_bits in (5, 64, 100, 256):
+        descs1 = rng.rand(40, n_bits) > 0.5
+        descs2 = rng.rand(50, n_bits) > 0.5
+        for cross_check in (True, False):
+            for max_ratio in (1.0, 0.9):
+                expected = _reference_matches(descs1, descs2, 'hamming',
+                                              cross_check, max_ratio)
+                for block_size in (None, 1, 7):
+                    matches = match_descriptors(descs1, descs2,
+                                                cross_check=cross_check,
+                                                max_ratio=max_ratio,
+                                                block_size=block_size)
+                    assert_equal(matches, expected)
+
+
+def test_float_descriptors_blocks():
+    rng = np.random.RandomState(0)
+    # integer values, so that there are ties between distances
+    descs1 = rng.randint(0, 4, (40, 6)).astype(np.float64)
+    descs2 = rng.randint(0, 4, (50, 6)).astype(np.float64)
+    for cross_check in (True, False):
+        for max_ratio in (1.0, 0.8):
+            expected = match_descriptors(descs1, descs2,
+                                         cross_check=cross_check,
+                                         max_ratio=max_ratio,
+                                         max_distance=3,
+                                         block_size=descs1.shape[0])
+            for block_size in (1, 7):
+                matches = match_descriptors(descs1, descs2,
+                                            cross_check=cross_check,
+                                            max_ratio=max_ratio,
+                                            max_distance=3,
+                                            block_size=block_size)
+                assert_equal(matches, expected)
+
+
+def test_kdtree():
+    rng = np.random.RandomState(0)
+    descs1 = rng.rand(200, 5)
+    descs2 = rng.rand(300, 5)
+    for metric in ('euclidean', 'cityblock', 'chebyshev'):
+        for cross_check in (True, False):
+            for max_ratio in (1.0, 0.8):
+                expected = _reference_matches(descs1, descs2, metric,
+                                              cross_check, max_ratio)
+                matches = match_descriptors(descs1, descs2, metric=metric,
+                                            cross_check=cross_check,
+                                            max_ratio=max_ratio,
+                                            method='kdtree')
+                assert_equal(matches, expected)
+    matches = match_descriptors(descs1, descs2, metric='minkowski', p=3,
+                                method='kdtree')
+    assert_equal(matches, match_descriptors(descs1, descs2,
+                                            metric='minkowski', p=3))
+    # approximate matches stay close to the exact ones
+    matches = match_descriptors(descs1, descs2, cross_check=False,
+                                method='kdtree', eps=0.5)
+    distances = cdist(descs1, descs2)
+    assert np.all(distances[matches[:, 0], matches[:, 1]]
+                  <= 1.5 * distances.min(axis=1))
+
+
+def test_invalid_method():
+    descs = np.zeros((3, 4), dtype=bool)
+    with testing.raises(ValueError):
+        match_descriptors(descs, descs, method='kdtree')
+    with testing.raises(ValueError):
+        match_descriptors(descs, descs, method='exhaustive')
+
+
+def _noisy_queries(reference, n_queries, rng):
+    queries = reference[rng.choice(reference.shape[0], n_queries,
+                                   replace=False)]
+    if queries.dtype == bool:
+        return queries ^ (rng.rand(*queries.shape) < 0.1)
+    return queries + 0.01 * rng.rand(*queries.shape)
+
+
+def test_descriptor_index_exact():
+    rng = np.random.RandomState(0)
+    binary = rng.rand(500, 100) > 0.5
+    floats = rng.rand(500, 6)
+    for reference, method in ((binary, 'brute'), (floats, 'brute'),
+                              (floats, 'kdtree')):
+        queries = _noisy_queries(reference, 100, rng)
+        index = DescriptorIndex(method=method)
+        index.add(reference[:200])
+        # the search structure is updated after a query
+        index.query(queries)
+        index.add(reference[200:])
+        assert_equal(len(index), 500)
+        for cross_check in (True, False):
+            for max_ratio in (1.0, 0.8):
+                expected = match_descriptors(queries, reference,
+                                             cross_check=cross_check,
+                                             max_ratio=max_ratio)
+                matches = index.query(queries, cross_check=cross_check,
+                                      max_ratio=max_ratio)
+                assert_equal(matches, expected)
+
+
+def test_descriptor_index_lsh():
+    rng = np.random.RandomState(0)
+    reference = rng.rand(2000, 256) > 0.5
+    queries = _noisy_queries(reference, 200, rng)
+    index = DescriptorIndex(random_state=0)
+    index.add(reference[:1000])
+    index.add(reference[1000:])
+    assert index.nbytes < reference.nbytes
+    for cross_check in (True, False):
+        expected = match_descriptors(queries, reference,
+                                     cross_check=cross_check)
+        matches = index.query(queries, cross_check=cross_check)
+        # most of the exact matches are found
+        found = set(map(tuple, matches)) & set(map(tuple, expected))
+        assert len(found) > 0.9 * len(expected)
+
+
+def test_descriptor_index_save_load(tmpdir):
+    rng = np.random.RandomState(0)
+    binary = rng.rand(300, 64) > 0.5
+    floats = rng.rand(300, 6).astype(np.float32)
+    for reference in (binary, floats):
+        queries = _noisy_queries(reference, 50, rng)
+        index = DescriptorIndex(random_state=0)
+        index.add(reference)
+        fname = str(tmpdir.join('index.npz'))
+        index.save(fname)
+        loaded = DescriptorIndex.load(fname)
+        assert_equal(loaded.query(queries, max_ratio=0.9),
+                     index.query(queries, max_ratio=0.9))
+        loaded.add(reference[:10])
+        assert_equal(len(loaded), 310)
+
+
+def test_descriptor_index_invalid():
+    binary = np.zeros((3, 8), dtype=bool)
+    floats = np.zeros((3, 8))
+    with testing.raises(ValueError):
+        DescriptorIndex(method='lsh').add(floats)
+    with testing.raises(ValueError):
+        DescriptorIndex(method='kdtree').add(binary)
+    with testing.raises(ValueError):
+        DescriptorIndex(metric='euclidean').add(binary)
+    index = DescriptorIndex()
+    index.add(binary)
+    with testing.raises(ValueError):
+        index.query(floats)
+    with testing.raises(ValueError):
+        index.query(binary[:, :4])
+    assert_equal(DescriptorIndex().query(binary).shape, (0, 2))
@@ -384,6 +384,36 @@ class TestPeakLocalMax():
         image[2, 2] = 0
         assert len(peak.peak_local_max(image, min_distance=0)) == image.size - 1
 
+    def test_touching_labels(self):
+        image = np.random.uniform(size=(40, 50))
+        labels = np.random.randint(0, 4, size=(8, 10))
+        labels[labels == 2] = 7
+        labels = labels.repeat(5, axis=0).repeat(5, axis=1)
+        for kwargs in (dict(min_distance=2),
+                       dict(min_distance=1, threshold_rel=0.5),
+                       dict(footprint=np.array([[1, 0, 1, 1, 1],
+                                                [0, 1, 0, 1, 1],
+                                                [1, 1, 0, 0, 1]], bool))):
+            # peaks of each region, found separately
+            expected = np.zeros(image.shape, bool)
+            for label in (1, 3, 7):
+                expected |= peak.peak_local_max(image * (labels == label),
+                                                indices=False, **kwargs)
+            result = peak.peak_local_max(image, labels=labels,
+                                         indices=False, **kwargs)
+            assert_equal(result, expected)
+
+    def test_num_peaks_per_label(self):
+        image = np.zeros((20, 30), np.uint8)
+        labels = np.ones((20, 30), int)
+        labels[:, 15:] = 2
+        image[5, 1:14:2] = [10, 30, 20, 60, 50, 40, 70]
+        image[12, 17:28:2] = [5, 6, 7, 8, 9, 4]
+        result = peak.peak_local_max(image, labels=labels, min_distance=1,
+                                     num_peaks_per_label=3)
+        assert_equal(sorted(map(tuple, result)),
+                     [(5, 7), (5, 9), (5, 13), (12, 21), (12, 23), (12, 25)])
+
 class TestProminentPeaks(unittest.TestCase):
     def test_isolated_peaks(self):
         image = np.zeros((15, 15))
@@ -2,6 +2,7 @@ import numpy as np
 from skimage._shared.testing import assert_allclose
 
 from skimage.feature.register_translation import (register_translation,
+                                                  TranslationRegistrar,
                                                   _upsampled_dft)
 from skimage.data import camera, binary_blobs
 from scipy.ndimage import fourier_shift
@@ -136,3 +137,57 @@ def test_mismatch_offsets_size():
     with testing.raises(ValueError):
         _upsampled_dft(np.ones((4, 4)), 3,
                        axis_offsets=[3, 2, 1, 4])
+
+
+@testing.parametrize('upsample_factor', [1, 20])
+def test_translation_registrar(upsample_factor):
+    reference_image = camera()[:200, :151]
+    shifts = [(-2.4, 1.32), (3, -7), (0.71, 5.5), (0, 0)]
+    images = np.stack([
+        np.fft.ifftn(fourier_shift(np.fft.fftn(reference_image), shift)).real
+        for shift in shifts])
+
+    expected = [register_translation(reference_image, image, upsample_factor)
+                for image in images]
+    for num_workers in (1, 2):
+        registrar = TranslationRegistrar(reference_image, upsample_factor,
+                                         num_workers=num_workers)
+        result, error, diffphase = registrar.register(images)
+        assert result.shape == (4, 2)
+        assert_allclose(result, [shift for shift, _, _ in expected])
+        assert_allclose(error, [err for _, err, _ in expected], atol=1e-6)
+        assert_allclose(diffphase, [phase for _, _, phase in expected],
+                        atol=1e-10)
+
+    # single image
+    result, error, diffphase = registrar.register(images[0])
+    assert_allclose(result, expected[0][0])
+    assert_allclose(registrar.register(images[1], return_error=False),
+                    expected[1][0])
+
+
+def test_translation_registrar_3d_fourier():
+    phantom = img_as_float(binary_blobs(length=32, n_dim=3))
+    reference_image = np.fft.fftn(phantom)
+    shifts = [(-2.3, 1.7, 5.4), (1, 0, -3)]
+    images = np.stack([fourier_shift(reference_image, shift)
+                       for shift in shifts])
+
+    registrar = TranslationRegistrar(reference_image, 100, space="fourier")
+    result, error, diffphase = registrar.register(images)
+    assert_allclose(result, -np.array(shifts), atol=0.05)
+
+    registrar = TranslationRegistrar(phantom, 100)
+    result, error, diffphase = registrar.register(
+        np.fft.ifftn(images, axes=(1, 2, 3)).real)
+    assert_allclose(result, -np.array(shifts), atol=0.05)
+
+
+def test_translation_registrar_wrong_input():
+    with testing.raises(ValueError):
+        TranslationRegistrar(np.ones((5, 5)), space="frank")
+    registrar = TranslationRegistrar(np.ones((5, 5)))
+    with testing.raises(ValueError):
+        registrar.register(np.ones((2, 5, 4)))
+    with testing.raises(ValueError):
+        registrar.register(np.ones((5, 5), dtype=complex))
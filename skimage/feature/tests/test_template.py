@@ -3,7 +3,8 @@ from skimage._shared.testing import assert_almost_equal, assert_equal
 
 from skimage import data, img_as_float
 from skimage.morphology import diamond
-from skimage.feature import match_template, peak_local_max
+from skimage.feature import (match_template, match_templates, peak_local_max,
+                             TemplateMatcher)
 from skimage._shared import testing
 
 
@@ -184,3 +185,96 @@ def test_bounding_values():
     print(result.max())
     assert result.max() < 1 + 1e-7
     assert result.min() > -1 - 1e-7
+
+
+@testing.parametrize('pad_input', [False, True])
+@testing.parametrize('mode', ['constant', 'reflect'])
+def test_template_matcher(pad_input, mode):
+    image = data.camera()[:120, :140]
+    template = image[40:61, 70:86]
+    expected = match_template(image, template, pad_input=pad_input,
+                              mode=mode)
+
+    matcher = TemplateMatcher(template, image.shape, pad_input=pad_input,
+                              mode=mode)
+    assert matcher.output_shape == expected.shape
+    for _ in range(2):
+        result = matcher.match(image)
+        assert result.dtype == np.float64
+        assert_almost_equal(result, expected)
+
+    matcher = TemplateMatcher(template, image.shape, pad_input=pad_input,
+                              mode=mode, dtype=np.float32)
+    result = matcher.match(image)
+    assert result.dtype == np.float32
+    assert_almost_equal(result, expected, decimal=3)
+    assert_equal(np.unravel_index(result.argmax(), result.shape),
+                 np.unravel_index(expected.argmax(), expected.shape))
+
+
+def test_template_matcher_3d():
+    np.random.seed(1)
+    image = np.random.rand(20, 21, 22)
+    template = image[3:8, 4:10, 5:7]
+    matcher = TemplateMatcher(template, image.shape)
+    assert_almost_equal(matcher.match(image), match_template(image, template))
+
+
+def test_template_matcher_flat_windows():
+    image = np.full((40, 40), 100.)
+    image[20:, 20:] = np.random.rand(20, 20)
+    template = np.random.rand(5, 5)
+    for dtype in (np.float64, np.float32):
+        result = TemplateMatcher(template, image.shape,
+                                 dtype=dtype).match(image)
+        assert np.all(result[:15, :] == 0)
+        assert np.all(np.abs(result) <= 1 + 1e-5)
+
+
+def test_template_matcher_wrong_input():
+    with testing.raises(ValueError):
+        TemplateMatcher(np.ones((3, 3)), (5, 5, 2))
+    with testing.raises(ValueError):
+        TemplateMatcher(np.ones((6, 3)), (5, 5))
+    with testing.raises(ValueError):
+        TemplateMatcher(np.ones((3, 3)), (5, 5), dtype=np.int32)
+    with testing.raises(ValueError):
+        TemplateMatcher(np.ones((3, 3)), (5, 5)).match(np.ones((5, 6)))
+
+
+@testing.parametrize('pad_input', [False, True])
+def test_match_templates(pad_input):
+    image = data.camera()[:120, :140]
+    templates = [image[40:61, 70:86], image[10:25, 20:30],
+                 image[80:101, 30:46], np.ones((5, 5))]
+    expected = [match_template(image, template, pad_input=pad_input)
+                for template in templates]
+
+    responses = match_templates(image, templates, pad_input=pad_input)
+    assert len(responses) == len(templates)
+    for response, ref in zip(responses, expected):
+        assert_almost_equal(response, ref)
+
+    responses = match_templates(image, templates, pad_input=pad_input,
+                                dtype=np.float32)
+    for response, ref in zip(responses, expected):
+        assert response.dtype == np.float32
+        assert_almost_equal(response, ref, decimal=3)
+
+    peaks, scores = match_templates(image, templates[:3], pad_input=pad_input,
+                                    num_peaks=3, min_distance=5)
+    for template_peaks, template_scores, ref in zip(peaks, scores, expected):
+        assert template_peaks.shape == (3, 2)
+        assert_almost_equal(template_scores, ref[tuple(template_peaks.T)])
+        assert_almost_equal(template_scores[0], ref.max())
+        assert np.all(np.diff(template_scores) <= 0)
+
+
+def test_match_templates_wrong_input():
+    image = np.ones((5, 5))
+    with testing.raises(ValueError):
+        match_templates(image, [np.ones((3, 3)), np.ones((3, 3, 2))])
+    with testing.raises(ValueError):
+        match_templates(image, [np.ones((6, 3))])
+    with testing.raises(ValueError):
+        match_templates(image, [np.ones((3, 3))], dtype=np.int32)
@@ -17,7 +17,8 @@ def median(image, selem=None, out=None, mask=None, shift_x=False,
     image : array-like
         Input image.
     selem : ndarray, optional
-        If ``behavior=='rank'``, ``selem`` is a 2-D array of 1's and 0's.
+        If ``behavior=='rank'``, ``selem`` is a 2-D or 3-D array of 1's and
+        0's.
         If ``behavior=='ndimage'``, ``selem`` is a N-D array of 1's and 0's
         with the same number of dimension than ``image``.
         If None, ``selem`` will be a N-D array with 3 elements for each
@@ -25,7 +25,7 @@ References
 from ..._shared.utils import assert_nD
 
 from . import percentile_cy
-from .generic import _handle_input
+from .generic import _handle_input, _apply_constant_time
 
 
 __all__ = ['autolevel_percentile', 'gradient_percentile',
@@ -35,20 +35,21 @@ __all__ = ['autolevel_percentile', 'gradient_percentile',
 
 
 def _apply(func, image, selem, out, mask, shift_x, shift_y, p0, p1,
-           out_dtype=None):
+           out_dtype=None, num_threads=1):
 
     assert_nD(image, 2)
     image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask,
                                                     out_dtype)
 
     func(image, selem, shift_x=shift_x, shift_y=shift_y, mask=mask,
-         out=out, n_bins=n_bins, p0=p0, p1=p1)
+         out=out, n_bins=n_bins, p0=p0, p1=p1,
+         num_threads=num_threads)
 
     return out.reshape(out.shape[:2])
 
 
 def autolevel_percentile(image, selem, out=None, mask=None, shift_x=False,
-                         shift_y=False, p0=0, p1=1):
+                         shift_y=False, p0=0, p1=1, num_threads=1):
     """Return greyscale local autolevel of an image.
 
     This filter locally stretches the histogram of greyvalues to cover the
@@ -74,6 +75,10 @@ def autolevel_percentile(image, selem, out=None, mask=None, shift_x=False,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -84,11 +89,11 @@ def autolevel_percentile(image, selem, out=None, mask=None, shift_x=False,
 
     return _apply(percentile_cy._autolevel,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
 def gradient_percentile(image, selem, out=None, mask=None, shift_x=False,
-                        shift_y=False, p0=0, p1=1):
+                        shift_y=False, p0=0, p1=1, num_threads=1):
     """Return local gradient of an image (i.e. local maximum - local minimum).
 
     Only greyvalues between percentiles [p0, p1] are considered in the filter.
@@ -111,6 +116,10 @@ def gradient_percentile(image, selem, out=None, mask=None, shift_x=False,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -121,11 +130,11 @@ def gradient_percentile(image, selem, out=None, mask=None, shift_x=False,
 
     return _apply(percentile_cy._gradient,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
 def mean_percentile(image, selem, out=None, mask=None, shift_x=False,
-                    shift_y=False, p0=0, p1=1):
+                    shift_y=False, p0=0, p1=1, num_threads=1):
     """Return local mean of an image.
 
     Only greyvalues between percentiles [p0, p1] are considered in the filter.
@@ -148,6 +157,10 @@ def mean_percentile(image, selem, out=None, mask=None, shift_x=False,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -158,11 +171,11 @@ def mean_percentile(image, selem, out=None, mask=None, shift_x=False,
 
     return _apply(percentile_cy._mean,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
-def subtract_mean_percentile(image, selem, out=None, mask=None,
-                             shift_x=False, shift_y=False, p0=0, p1=1):
+def subtract_mean_percentile(image, selem, out=None, mask=None, shift_x=False,
+                             shift_y=False, p0=0, p1=1, num_threads=1):
     """Return image subtracted from its local mean.
 
     Only greyvalues between percentiles [p0, p1] are considered in the filter.
@@ -185,6 +198,10 @@ def subtract_mean_percentile(image, selem, out=None, mask=None,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -195,11 +212,12 @@ def subtract_mean_percentile(image, selem, out=None, mask=None,
 
     return _apply(percentile_cy._subtract_mean,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
 def enhance_contrast_percentile(image, selem, out=None, mask=None,
-                                shift_x=False, shift_y=False, p0=0, p1=1):
+                                shift_x=False, shift_y=False, p0=0, p1=1,
+                                num_threads=1):
     """Enhance contrast of an image.
 
     This replaces each pixel by the local maximum if the pixel greyvalue is
@@ -226,6 +244,10 @@ def enhance_contrast_percentile(image, selem, out=None, mask=None,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -236,11 +258,11 @@ def enhance_contrast_percentile(image, selem, out=None, mask=None,
 
     return _apply(percentile_cy._enhance_contrast,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
 def percentile(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
-               p0=0):
+               p0=0, num_threads=1, method='sliding'):
     """Return local percentile of an image.
 
     Returns the value of the p0 lower percentile of the local greyvalue
@@ -265,21 +287,47 @@ def percentile(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
         structuring element).
     p0 : float in [0, ..., 1]
         Set the percentile value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
+    method : {'sliding', 'constant_time'}, optional
+        Algorithm used to compute the local histograms. 'sliding' (default)
+        updates the histogram along a snake-like path, at a cost per pixel
+        growing with the size of `selem`. 'constant_time' requires a 2-D
+        image; for a rectangular `selem` (all ones), it sums one histogram
+        per image column [1]_, at a cost per pixel independent of the size of
+        `selem`. Other shapes, such as disks, update the histogram along the
+        edges of `selem` like 'sliding', but search ranks in a two-level
+        histogram, which is much faster for 16-bit images.
 
     Returns
     -------
     out : 2-D array (same dtype as input image)
         Output image.
 
+    References
+    ----------
+    .. [1] S. Perreault and P. Hebert, "Median Filtering in Constant Time",
+           IEEE Transactions on Image Processing, Sept 2007. Volume: 16,
+           Issue: 9, Page(s): 2389 - 2394.
+
     """
 
+    if method == 'constant_time':
+        return _apply_constant_time(image, selem, out=out, mask=mask,
+                                    shift_x=shift_x, shift_y=shift_y, p0=p0,
+                                    num_threads=num_threads)
+    elif method != 'sliding':
+        raise ValueError('Unknown method: {}'.format(method))
+
     return _apply(percentile_cy._percentile,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=0.)
+                  shift_y=shift_y, p0=p0, p1=0., num_threads=num_threads)
 
 
 def pop_percentile(image, selem, out=None, mask=None, shift_x=False,
-                   shift_y=False, p0=0, p1=1):
+                   shift_y=False, p0=0, p1=1, num_threads=1):
     """Return the local number (population) of pixels.
 
     The number of pixels is defined as the number of pixels which are included
@@ -305,6 +353,10 @@ def pop_percentile(image, selem, out=None, mask=None, shift_x=False,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -315,11 +367,11 @@ def pop_percentile(image, selem, out=None, mask=None, shift_x=False,
 
     return _apply(percentile_cy._pop,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
 def sum_percentile(image, selem, out=None, mask=None, shift_x=False,
-                   shift_y=False, p0=0, p1=1):
+                   shift_y=False, p0=0, p1=1, num_threads=1):
     """Return the local sum of pixels.
 
     Only greyvalues between percentiles [p0, p1] are considered in the filter.
@@ -345,6 +397,10 @@ def sum_percentile(image, selem, out=None, mask=None, shift_x=False,
     p0, p1 : float in [0, ..., 1]
         Define the [p0, p1] percentile interval to be considered for computing
         the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -355,11 +411,11 @@ def sum_percentile(image, selem, out=None, mask=None, shift_x=False,
 
     return _apply(percentile_cy._sum,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=p1)
+                  shift_y=shift_y, p0=p0, p1=p1, num_threads=num_threads)
 
 
 def threshold_percentile(image, selem, out=None, mask=None, shift_x=False,
-                         shift_y=False, p0=0):
+                         shift_y=False, p0=0, num_threads=1):
     """Local threshold of an image.
 
     The resulting binary mask is True if the greyvalue of the center pixel is
@@ -384,6 +440,10 @@ def threshold_percentile(image, selem, out=None, mask=None, shift_x=False,
         structuring element).
     p0 : float in [0, ..., 1]
         Set the percentile value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -394,4 +454,4 @@ def threshold_percentile(image, selem, out=None, mask=None, shift_x=False,
 
     return _apply(percentile_cy._threshold,
                   image, selem, out=out, mask=mask, shift_x=shift_x,
-                  shift_y=shift_y, p0=p0, p1=0)
+                  shift_y=shift_y, p0=p0, p1=0, num_threads=num_threads)
@@ -34,20 +34,21 @@ __all__ = ['mean_bilateral', 'pop_bilateral', 'sum_bilateral']
 
 
 def _apply(func, image, selem, out, mask, shift_x, shift_y, s0, s1,
-           out_dtype=None):
+           out_dtype=None, num_threads=1):
 
     assert_nD(image, 2)
     image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask,
                                                     out_dtype)
 
     func(image, selem, shift_x=shift_x, shift_y=shift_y, mask=mask,
-         out=out, n_bins=n_bins, s0=s0, s1=s1)
+         out=out, n_bins=n_bins, s0=s0, s1=s1,
+         num_threads=num_threads)
 
     return out.reshape(out.shape[:2])
 
 
 def mean_bilateral(image, selem, out=None, mask=None, shift_x=False,
-                   shift_y=False, s0=10, s1=10):
+                   shift_y=False, s0=10, s1=10, num_threads=1):
     """Apply a flat kernel bilateral filter.
 
     This is an edge-preserving and noise reducing denoising filter. It averages
@@ -80,6 +81,10 @@ def mean_bilateral(image, selem, out=None, mask=None, shift_x=False,
     s0, s1 : int
         Define the [s0, s1] interval around the greyvalue of the center pixel
         to be considered for computing the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -101,11 +106,12 @@ def mean_bilateral(image, selem, out=None, mask=None, shift_x=False,
     """
 
     return _apply(bilateral_cy._mean, image, selem, out=out,
-                  mask=mask, shift_x=shift_x, shift_y=shift_y, s0=s0, s1=s1)
+                  mask=mask, shift_x=shift_x, shift_y=shift_y, s0=s0, s1=s1,
+                  num_threads=num_threads)
 
 
 def pop_bilateral(image, selem, out=None, mask=None, shift_x=False,
-                  shift_y=False, s0=10, s1=10):
+                  shift_y=False, s0=10, s1=10, num_threads=1):
     """Return the local number (population) of pixels.
 
 
@@ -132,6 +138,10 @@ def pop_bilateral(image, selem, out=None, mask=None, shift_x=False,
     s0, s1 : int
         Define the [s0, s1] interval around the greyvalue of the center pixel
         to be considered for computing the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -157,11 +167,12 @@ def pop_bilateral(image, selem, out=None, mask=None, shift_x=False,
     """
 
     return _apply(bilateral_cy._pop, image, selem, out=out,
-                  mask=mask, shift_x=shift_x, shift_y=shift_y, s0=s0, s1=s1)
+                  mask=mask, shift_x=shift_x, shift_y=shift_y, s0=s0, s1=s1,
+                  num_threads=num_threads)
 
 
 def sum_bilateral(image, selem, out=None, mask=None, shift_x=False,
-                  shift_y=False, s0=10, s1=10):
+                  shift_y=False, s0=10, s1=10, num_threads=1):
     """Apply a flat kernel bilateral filter.
 
     This is an edge-preserving and noise reducing denoising filter. It averages
@@ -197,6 +208,10 @@ def sum_bilateral(image, selem, out=None, mask=None, shift_x=False,
     s0, s1 : int
         Define the [s0, s1] interval around the greyvalue of the center pixel
         to be considered for computing the value.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        horizontal band of the image with its own local histogram; the
+        result does not depend on the number of threads.
 
     Returns
     -------
@@ -218,4 +233,5 @@ def sum_bilateral(image, selem, out=None, mask=None, shift_x=False,
     """
 
     return _apply(bilateral_cy._sum, image, selem, out=out,
-                  mask=mask, shift_x=shift_x, shift_y=shift_y, s0=s0, s1=s1)
+                  mask=mask, shift_x=shift_x, shift_y=shift_y, s0=s0, s1=s1,
+                  num_threads=num_threads)
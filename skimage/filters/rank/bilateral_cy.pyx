@@ -81,10 +81,11 @@ def _mean(dtype_t[:, ::1] image,
           char[:, ::1] mask,
           dtype_t_out[:, :, ::1] out,
           signed char shift_x, signed char shift_y, Py_ssize_t s0, Py_ssize_t s1,
-          Py_ssize_t n_bins):
+          Py_ssize_t n_bins,
+          Py_ssize_t num_threads=1):
 
     _core(_kernel_mean[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, 0, 0, s0, s1, n_bins)
+          shift_x, shift_y, 0, 0, s0, s1, n_bins, num_threads)
 
 
 def _pop(dtype_t[:, ::1] image,
@@ -92,10 +93,11 @@ def _pop(dtype_t[:, ::1] image,
          char[:, ::1] mask,
          dtype_t_out[:, :, ::1] out,
          signed char shift_x, signed char shift_y, Py_ssize_t s0, Py_ssize_t s1,
-         Py_ssize_t n_bins):
+         Py_ssize_t n_bins,
+         Py_ssize_t num_threads=1):
 
     _core(_kernel_pop[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, 0, 0, s0, s1, n_bins)
+          shift_x, shift_y, 0, 0, s0, s1, n_bins, num_threads)
 
 
 def _sum(dtype_t[:, ::1] image,
@@ -103,7 +105,8 @@ def _sum(dtype_t[:, ::1] image,
          char[:, ::1] mask,
          dtype_t_out[:, :, ::1] out,
          signed char shift_x, signed char shift_y, Py_ssize_t s0, Py_ssize_t s1,
-         Py_ssize_t n_bins):
+         Py_ssize_t n_bins,
+         Py_ssize_t num_threads=1):
 
     _core(_kernel_sum[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, 0, 0, s0, s1, n_bins)
+          shift_x, shift_y, 0, 0, s0, s1, n_bins, num_threads)
@@ -7,6 +7,7 @@ import numpy as np
 
 cimport numpy as cnp
 from libc.stdlib cimport malloc, free
+from cython.parallel import prange
 
 
 cdef inline dtype_t _max(dtype_t a, dtype_t b) nogil:
@@ -42,6 +43,156 @@ cdef inline char is_in_mask(Py_ssize_t rows, Py_ssize_t cols,
             return 0
 
 
+
+
+cdef struct _selem_borders:
+    # relative row and column of every structuring element pixel, used to
+    # prime the histogram at the start of a band
+    Py_ssize_t* all_r
+    Py_ssize_t* all_c
+    Py_ssize_t num_all
+    # relative pixel row and column for each of the 4 attack borders east,
+    # west, north and south e.g. e_r lists the rows of the east structuring
+    # element border
+    Py_ssize_t* e_r
+    Py_ssize_t* e_c
+    Py_ssize_t num_e
+    Py_ssize_t* w_r
+    Py_ssize_t* w_c
+    Py_ssize_t num_w
+    Py_ssize_t* n_r
+    Py_ssize_t* n_c
+    Py_ssize_t num_n
+    Py_ssize_t* s_r
+    Py_ssize_t* s_c
+    Py_ssize_t num_s
+
+
+cdef int _core_band(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*, double,
+                                dtype_t, Py_ssize_t, Py_ssize_t, double,
+                                double, Py_ssize_t, Py_ssize_t) nogil,
+                    dtype_t* image, char* mask, dtype_t_out* out,
+                    Py_ssize_t rows, Py_ssize_t cols, Py_ssize_t odepth,
+                    _selem_borders* se,
+                    Py_ssize_t r_start, Py_ssize_t r_stop,
+                    double p0, double p1,
+                    Py_ssize_t s0, Py_ssize_t s1,
+                    Py_ssize_t n_bins) nogil:
+    """Filter the rows ``[r_start, r_stop)`` of the image.
+
+    The band owns its histogram, which is primed at ``(r_start, 0)`` and then
+    follows the snake-like path down to ``r_stop``. Returns -1 if the
+    histogram could not be allocated, 0 otherwise.
+    """
+
+    cdef Py_ssize_t mid_bin = n_bins / 2
+
+    # define local variable types
+    cdef Py_ssize_t r, c, rr, cc, s, i, even_row
+
+    # number of pixels actually inside the neighborhood (double)
+    cdef double pop = 0
+
+    # the current local histogram distribution
+    cdef Py_ssize_t* histo = <Py_ssize_t*>malloc(n_bins * sizeof(Py_ssize_t))
+    if histo is NULL:
+        return -1
+
+    for i in range(n_bins):
+        histo[i] = 0
+
+    r = r_start
+    c = 0
+    for s in range(se.num_all):
+        rr = r + se.all_r[s]
+        cc = c + se.all_c[s]
+        if is_in_mask(rows, cols, rr, cc, mask):
+            histogram_increment(histo, &pop, image[rr * cols + cc])
+
+    kernel(&out[(r * cols + c) * odepth], odepth, histo, pop,
+           image[r * cols + c], n_bins, mid_bin, p0, p1, s0, s1)
+
+    # main loop
+    for even_row in range(r_start, r_stop, 2):
+
+        # ---> west to east
+        for c in range(1, cols):
+            for s in range(se.num_e):
+                rr = r + se.e_r[s]
+                cc = c + se.e_c[s]
+                if is_in_mask(rows, cols, rr, cc, mask):
+                    histogram_increment(histo, &pop, image[rr * cols + cc])
+
+            for s in range(se.num_w):
+                rr = r + se.w_r[s]
+                cc = c + se.w_c[s] - 1
+                if is_in_mask(rows, cols, rr, cc, mask):
+                    histogram_decrement(histo, &pop, image[rr * cols + cc])
+
+            kernel(&out[(r * cols + c) * odepth], odepth, histo, pop,
+                   image[r * cols + c], n_bins, mid_bin, p0, p1, s0, s1)
+
+        r += 1  # pass to the next row
+        if r >= r_stop:
+            break
+
+        # ---> north to south
+        for s in range(se.num_s):
+            rr = r + se.s_r[s]
+            cc = c + se.s_c[s]
+            if is_in_mask(rows, cols, rr, cc, mask):
+                histogram_increment(histo, &pop, image[rr * cols + cc])
+
+        for s in range(se.num_n):
+            rr = r + se.n_r[s] - 1
+            cc = c + se.n_c[s]
+            if is_in_mask(rows, cols, rr, cc, mask):
+                histogram_decrement(histo, &pop, image[rr * cols + cc])
+
+        kernel(&out[(r * cols + c) * odepth], odepth, histo, pop,
+               image[r * cols + c], n_bins, mid_bin, p0, p1, s0, s1)
+
+        # ---> east to west
+        for c in range(cols - 2, -1, -1):
+            for s in range(se.num_w):
+                rr = r + se.w_r[s]
+                cc = c + se.w_c[s]
+                if is_in_mask(rows, cols, rr, cc, mask):
+                    histogram_increment(histo, &pop, image[rr * cols + cc])
+
+            for s in range(se.num_e):
+                rr = r + se.e_r[s]
+                cc = c + se.e_c[s] + 1
+                if is_in_mask(rows, cols, rr, cc, mask):
+                    histogram_decrement(histo, &pop, image[rr * cols + cc])
+
+            kernel(&out[(r * cols + c) * odepth], odepth, histo, pop,
+                   image[r * cols + c], n_bins, mid_bin, p0, p1, s0, s1)
+
+        r += 1  # pass to the next row
+        if r >= r_stop:
+            break
+
+        # ---> north to south
+        for s in range(se.num_s):
+            rr = r + se.s_r[s]
+            cc = c + se.s_c[s]
+            if is_in_mask(rows, cols, rr, cc, mask):
+                histogram_increment(histo, &pop, image[rr * cols + cc])
+
+        for s in range(se.num_n):
+            rr = r + se.n_r[s] - 1
+            cc = c + se.n_c[s]
+            if is_in_mask(rows, cols, rr, cc, mask):
+                histogram_decrement(histo, &pop, image[rr * cols + cc])
+
+        kernel(&out[(r * cols + c) * odepth], odepth, histo, pop,
+               image[r * cols + c], n_bins, mid_bin, p0, p1, s0, s1)
+
+    free(histo)
+    return 0
+
+
 cdef void _core(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*, double,
                             dtype_t, Py_ssize_t, Py_ssize_t, double,
                             double, Py_ssize_t, Py_ssize_t) nogil,
@@ -52,9 +203,14 @@ cdef void _core(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*, double,
                 signed char shift_x, signed char shift_y,
                 double p0, double p1,
                 Py_ssize_t s0, Py_ssize_t s1,
-                Py_ssize_t n_bins) except *:
+                Py_ssize_t n_bins,
+                Py_ssize_t num_threads) except *:
     """Compute histogram for each pixel neighborhood, apply kernel function and
     use kernel function return value for output image.
+
+    The image is split into at most `num_threads` horizontal bands, each of
+    which is processed by its own thread with a private histogram. The result
+    does not depend on the number of threads.
     """
 
     cdef Py_ssize_t rows = image.shape[0]
@@ -72,16 +228,14 @@ cdef void _core(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*, double,
     assert centre_r < srows
     assert centre_c < scols
 
-    cdef Py_ssize_t mid_bin = n_bins / 2
-
     # define pointers to the data
+    cdef dtype_t* image_data = &image[0, 0]
     cdef char* mask_data = &mask[0, 0]
+    cdef dtype_t_out* out_data = &out[0, 0, 0]
 
     # define local variable types
-    cdef Py_ssize_t r, c, rr, cc, s, value, local_max, i, even_row
-
-    # number of pixels actually inside the neighborhood (double)
-    cdef double pop = 0
+    cdef Py_ssize_t r, c, band, band_rows, n_bands
+    cdef int failed = 0
 
     # build attack and release borders by using difference along axis
     t = np.hstack((selem, np.zeros((selem.shape[0], 1))))
@@ -96,174 +250,321 @@ cdef void _core(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*, double,
     t = np.vstack((np.zeros((1, selem.shape[1])), selem))
     cdef unsigned char[:, :] t_n = (np.diff(t, axis=0) > 0).view(np.uint8)
 
-    # the current local histogram distribution
-    cdef Py_ssize_t* histo
-
-    # these lists contain the relative pixel row and column for each of the 4
-    # attack borders east, west, north and south e.g. se_e_r lists the rows of
-    # the east structuring element border
     cdef Py_ssize_t se_size = srows * scols * sizeof(Py_ssize_t)
-    cdef Py_ssize_t* se_e_r
-    cdef Py_ssize_t* se_e_c
-    cdef Py_ssize_t* se_w_r
-    cdef Py_ssize_t* se_w_c
-    cdef Py_ssize_t* se_n_r
-    cdef Py_ssize_t* se_n_c
-    cdef Py_ssize_t* se_s_r
-    cdef Py_ssize_t* se_s_c
-
-    # number of element in each attack border
-    cdef Py_ssize_t num_se_n, num_se_s, num_se_e, num_se_w
+    cdef _selem_borders se
+
+    # split the rows in bands of (almost) equal height, one per thread
+    if num_threads < 1:
+        num_threads = 1
+    n_bands = min(num_threads, max(rows, 1))
+    band_rows = (rows + n_bands - 1) / n_bands
+    if band_rows < 1:
+        band_rows = 1
+    n_bands = max((rows + band_rows - 1) / band_rows, 1)
 
     with nogil:
 
-        se_e_r = <Py_ssize_t*>malloc(se_size)
-        se_e_c = <Py_ssize_t*>malloc(se_size)
-        se_w_r = <Py_ssize_t*>malloc(se_size)
-        se_w_c = <Py_ssize_t*>malloc(se_size)
-        se_n_r = <Py_ssize_t*>malloc(se_size)
-        se_n_c = <Py_ssize_t*>malloc(se_size)
-        se_s_r = <Py_ssize_t*>malloc(se_size)
-        se_s_c = <Py_ssize_t*>malloc(se_size)
-        histo = <Py_ssize_t*>malloc(n_bins * sizeof(Py_ssize_t))
-
-        if (se_e_r is NULL or se_e_c is NULL or se_w_r is NULL or
-            se_w_c is NULL or se_n_r is NULL or se_n_c is NULL or
-            se_s_r is NULL or se_s_c is NULL or histo is NULL):
-            free(se_e_r)
-            free(se_e_c)
-            free(se_w_r)
-            free(se_w_c)
-            free(se_n_r)
-            free(se_n_c)
-            free(se_s_r)
-            free(se_s_c)
-            free(histo)
-            with gil:
-                raise MemoryError()
-
-        for i in range(n_bins):
-            histo[i] = 0
-
-        num_se_n = num_se_s = num_se_e = num_se_w = 0
-
-        for r in range(srows):
-            for c in range(scols):
-                if t_e[r, c]:
-                    se_e_r[num_se_e] = r - centre_r
-                    se_e_c[num_se_e] = c - centre_c
-                    num_se_e += 1
-                if t_w[r, c]:
-                    se_w_r[num_se_w] = r - centre_r
-                    se_w_c[num_se_w] = c - centre_c
-                    num_se_w += 1
-                if t_n[r, c]:
-                    se_n_r[num_se_n] = r - centre_r
-                    se_n_c[num_se_n] = c - centre_c
-                    num_se_n += 1
-                if t_s[r, c]:
-                    se_s_r[num_se_s] = r - centre_r
-                    se_s_c[num_se_s] = c - centre_c
-                    num_se_s += 1
-
-        for r in range(srows):
-            for c in range(scols):
-                rr = r - centre_r
-                cc = c - centre_c
-                if selem[r, c]:
-                    if is_in_mask(rows, cols, rr, cc, mask_data):
-                        histogram_increment(histo, &pop, image[rr, cc])
-
-        r = 0
-        c = 0
-        kernel(&out[r, c, 0], odepth, histo, pop, image[r, c], n_bins, mid_bin,
-               p0, p1, s0, s1)
-
-        # main loop
-        r = 0
-        for even_row in range(0, rows, 2):
-
-            # ---> west to east
-            for c in range(1, cols):
-                for s in range(num_se_e):
-                    rr = r + se_e_r[s]
-                    cc = c + se_e_c[s]
-                    if is_in_mask(rows, cols, rr, cc, mask_data):
-                        histogram_increment(histo, &pop, image[rr, cc])
-
-                for s in range(num_se_w):
-                    rr = r + se_w_r[s]
-                    cc = c + se_w_c[s] - 1
-                    if is_in_mask(rows, cols, rr, cc, mask_data):
-                        histogram_decrement(histo, &pop, image[rr, cc])
-
-                kernel(&out[r, c, 0], odepth, histo, pop, image[r, c], n_bins,
-                       mid_bin, p0, p1, s0, s1)
-
-            r += 1  # pass to the next row
-            if r >= rows:
-                break
+        se.all_r = <Py_ssize_t*>malloc(se_size)
+        se.all_c = <Py_ssize_t*>malloc(se_size)
+        se.e_r = <Py_ssize_t*>malloc(se_size)
+        se.e_c = <Py_ssize_t*>malloc(se_size)
+        se.w_r = <Py_ssize_t*>malloc(se_size)
+        se.w_c = <Py_ssize_t*>malloc(se_size)
+        se.n_r = <Py_ssize_t*>malloc(se_size)
+        se.n_c = <Py_ssize_t*>malloc(se_size)
+        se.s_r = <Py_ssize_t*>malloc(se_size)
+        se.s_c = <Py_ssize_t*>malloc(se_size)
+
+        if (se.all_r is NULL or se.all_c is NULL or
+            se.e_r is NULL or se.e_c is NULL or se.w_r is NULL or
+            se.w_c is NULL or se.n_r is NULL or se.n_c is NULL or
+            se.s_r is NULL or se.s_c is NULL):
+            failed = 1
+        else:
+            se.num_all = se.num_n = se.num_s = se.num_e = se.num_w = 0
+
+            for r in range(srows):
+                for c in range(scols):
+                    if selem[r, c]:
+                        se.all_r[se.num_all] = r - centre_r
+                        se.all_c[se.num_all] = c - centre_c
+                        se.num_all += 1
+                    if t_e[r, c]:
+                        se.e_r[se.num_e] = r - centre_r
+                        se.e_c[se.num_e] = c - centre_c
+                        se.num_e += 1
+                    if t_w[r, c]:
+                        se.w_r[se.num_w] = r - centre_r
+                        se.w_c[se.num_w] = c - centre_c
+                        se.num_w += 1
+                    if t_n[r, c]:
+                        se.n_r[se.num_n] = r - centre_r
+                        se.n_c[se.num_n] = c - centre_c
+                        se.num_n += 1
+                    if t_s[r, c]:
+                        se.s_r[se.num_s] = r - centre_r
+                        se.s_c[se.num_s] = c - centre_c
+                        se.num_s += 1
+
+            for band in prange(n_bands, num_threads=n_bands,
+                               schedule='static'):
+                failed |= _core_band(kernel, image_data, mask_data, out_data,
+                                     rows, cols, odepth, &se,
+                                     band * band_rows,
+                                     min((band + 1) * band_rows, rows),
+                                     p0, p1, s0, s1, n_bins)
+
+        # release memory allocated by malloc
+        free(se.all_r)
+        free(se.all_c)
+        free(se.e_r)
+        free(se.e_c)
+        free(se.w_r)
+        free(se.w_c)
+        free(se.n_r)
+        free(se.n_c)
+        free(se.s_r)
+        free(se.s_c)
+
+    if failed:
+        raise MemoryError()
+
+
+cdef inline char is_in_mask_3D(Py_ssize_t planes, Py_ssize_t rows,
+                               Py_ssize_t cols, Py_ssize_t p, Py_ssize_t r,
+                               Py_ssize_t c, char* mask) nogil:
+    """Check whether given coordinate is within volume and mask is true."""
+    if (p < 0 or p > planes - 1 or r < 0 or r > rows - 1 or
+            c < 0 or c > cols - 1):
+        return 0
+    else:
+        if mask[(p * rows + r) * cols + c]:
+            return 1
+        else:
+            return 0
 
-            # ---> north to south
-            for s in range(num_se_s):
-                rr = r + se_s_r[s]
-                cc = c + se_s_c[s]
-                if is_in_mask(rows, cols, rr, cc, mask_data):
-                    histogram_increment(histo, &pop, image[rr, cc])
-
-            for s in range(num_se_n):
-                rr = r + se_n_r[s] - 1
-                cc = c + se_n_c[s]
-                if is_in_mask(rows, cols, rr, cc, mask_data):
-                    histogram_decrement(histo, &pop, image[rr, cc])
-
-            kernel(&out[r, c, 0], odepth, histo, pop, image[r, c], n_bins,
-                   mid_bin, p0, p1, s0, s1)
-
-            # ---> east to west
-            for c in range(cols - 2, -1, -1):
-                for s in range(num_se_w):
-                    rr = r + se_w_r[s]
-                    cc = c + se_w_c[s]
-                    if is_in_mask(rows, cols, rr, cc, mask_data):
-                        histogram_increment(histo, &pop, image[rr, cc])
-
-                for s in range(num_se_e):
-                    rr = r + se_e_r[s]
-                    cc = c + se_e_c[s] + 1
-                    if is_in_mask(rows, cols, rr, cc, mask_data):
-                        histogram_decrement(histo, &pop, image[rr, cc])
-
-                kernel(&out[r, c, 0], odepth, histo, pop, image[r, c], n_bins,
-                       mid_bin, p0, p1, s0, s1)
-
-            r += 1  # pass to the next row
-            if r >= rows:
-                break
 
-            # ---> north to south
-            for s in range(num_se_s):
-                rr = r + se_s_r[s]
-                cc = c + se_s_c[s]
-                if is_in_mask(rows, cols, rr, cc, mask_data):
-                    histogram_increment(histo, &pop, image[rr, cc])
+cdef struct _border_3D:
+    # relative plane, row and column of each pixel of a structuring element
+    # border
+    Py_ssize_t* p
+    Py_ssize_t* r
+    Py_ssize_t* c
+    Py_ssize_t num
+
+
+cdef inline void _update_histogram_3D(Py_ssize_t* histo, double* pop,
+                                      dtype_t* image, char* mask,
+                                      Py_ssize_t planes, Py_ssize_t rows,
+                                      Py_ssize_t cols, Py_ssize_t p,
+                                      Py_ssize_t r, Py_ssize_t c,
+                                      _border_3D* border, char add) nogil:
+    """Add (or remove) the pixels of `border` centred at (p, r, c)."""
+
+    cdef Py_ssize_t s, pp, rr, cc
+
+    for s in range(border.num):
+        pp = p + border.p[s]
+        rr = r + border.r[s]
+        cc = c + border.c[s]
+        if is_in_mask_3D(planes, rows, cols, pp, rr, cc, mask):
+            if add:
+                histogram_increment(histo, pop,
+                                    image[(pp * rows + rr) * cols + cc])
+            else:
+                histogram_decrement(histo, pop,
+                                    image[(pp * rows + rr) * cols + cc])
+
+
+cdef inline void _move_3D(Py_ssize_t* histo, double* pop,
+                          dtype_t* image, char* mask,
+                          Py_ssize_t planes, Py_ssize_t rows, Py_ssize_t cols,
+                          Py_ssize_t p, Py_ssize_t r, Py_ssize_t c,
+                          Py_ssize_t dp, Py_ssize_t dr, Py_ssize_t dc,
+                          _border_3D* forward, _border_3D* backward) nogil:
+    """Update the histogram after a one pixel move to (p, r, c).
+
+    The move is made along (dp, dr, dc), `forward` being the attack border in
+    that direction and `backward` the release border.
+    """
+    _update_histogram_3D(histo, pop, image, mask, planes, rows, cols,
+                         p, r, c, forward, 1)
+    _update_histogram_3D(histo, pop, image, mask, planes, rows, cols,
+                         p - dp, r - dr, c - dc, backward, 0)
+
+
+cdef int _core_3D_band(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*,
+                                   double, dtype_t, Py_ssize_t, Py_ssize_t,
+                                   double, double, Py_ssize_t,
+                                   Py_ssize_t) nogil,
+                       dtype_t* image, char* mask, dtype_t_out* out,
+                       Py_ssize_t planes, Py_ssize_t rows, Py_ssize_t cols,
+                       Py_ssize_t odepth, _border_3D* borders,
+                       Py_ssize_t p_start, Py_ssize_t p_stop,
+                       double p0, double p1,
+                       Py_ssize_t s0, Py_ssize_t s1,
+                       Py_ssize_t n_bins) nogil:
+    """Filter the planes ``[p_start, p_stop)`` of the volume.
+
+    `borders` holds, in this order, the full structuring element and its
+    attack borders towards +plane, -plane, +row, -row, +col and -col. The
+    histogram follows a snake-like path within each plane, and alternates the
+    row direction from one plane to the next. Returns -1 if the histogram
+    could not be allocated, 0 otherwise.
+    """
 
-            for s in range(num_se_n):
-                rr = r + se_n_r[s] - 1
-                cc = c + se_n_c[s]
-                if is_in_mask(rows, cols, rr, cc, mask_data):
-                    histogram_decrement(histo, &pop, image[rr, cc])
+    cdef Py_ssize_t mid_bin = n_bins / 2
+    cdef Py_ssize_t p, r, c, i, idx
+    cdef Py_ssize_t row_dir = 1
+    cdef Py_ssize_t col_dir = 1
+    cdef double pop = 0
 
-            kernel(&out[r, c, 0], odepth, histo, pop, image[r, c],
+    cdef Py_ssize_t* histo = <Py_ssize_t*>malloc(n_bins * sizeof(Py_ssize_t))
+    if histo is NULL:
+        return -1
+
+    for i in range(n_bins):
+        histo[i] = 0
+
+    p = p_start
+    r = 0
+    c = 0
+    _update_histogram_3D(histo, &pop, image, mask, planes, rows, cols,
+                         p, r, c, &borders[0], 1)
+    idx = (p * rows + r) * cols + c
+    kernel(&out[idx * odepth], odepth, histo, pop, image[idx], n_bins,
+           mid_bin, p0, p1, s0, s1)
+
+    while True:
+        # sweep the current row
+        for i in range(cols - 1):
+            c += col_dir
+            if col_dir > 0:
+                _move_3D(histo, &pop, image, mask, planes, rows, cols,
+                         p, r, c, 0, 0, 1, &borders[5], &borders[6])
+            else:
+                _move_3D(histo, &pop, image, mask, planes, rows, cols,
+                         p, r, c, 0, 0, -1, &borders[6], &borders[5])
+            idx = (p * rows + r) * cols + c
+            kernel(&out[idx * odepth], odepth, histo, pop, image[idx],
                    n_bins, mid_bin, p0, p1, s0, s1)
+        col_dir = -col_dir
+
+        # pass to the next row of the plane, if any
+        if 0 <= r + row_dir < rows:
+            r += row_dir
+            if row_dir > 0:
+                _move_3D(histo, &pop, image, mask, planes, rows, cols,
+                         p, r, c, 0, 1, 0, &borders[3], &borders[4])
+            else:
+                _move_3D(histo, &pop, image, mask, planes, rows, cols,
+                         p, r, c, 0, -1, 0, &borders[4], &borders[3])
+        else:
+            # pass to the next plane
+            row_dir = -row_dir
+            p += 1
+            if p >= p_stop:
+                break
+            _move_3D(histo, &pop, image, mask, planes, rows, cols,
+                     p, r, c, 1, 0, 0, &borders[1], &borders[2])
+
+        idx = (p * rows + r) * cols + c
+        kernel(&out[idx * odepth], odepth, histo, pop, image[idx], n_bins,
+               mid_bin, p0, p1, s0, s1)
+
+    free(histo)
+    return 0
+
+
+cdef void _core_3D(void kernel(dtype_t_out*, Py_ssize_t, Py_ssize_t*, double,
+                               dtype_t, Py_ssize_t, Py_ssize_t, double,
+                               double, Py_ssize_t, Py_ssize_t) nogil,
+                   dtype_t[:, :, ::1] image,
+                   char[:, :, ::1] selem,
+                   char[:, :, ::1] mask,
+                   dtype_t_out[:, :, :, ::1] out,
+                   signed char shift_x, signed char shift_y,
+                   signed char shift_z,
+                   double p0, double p1,
+                   Py_ssize_t s0, Py_ssize_t s1,
+                   Py_ssize_t n_bins,
+                   Py_ssize_t num_threads) except *:
+    """Compute histogram for each voxel neighborhood, apply kernel function
+    and use kernel function return value for output image.
+
+    The volume is split into at most `num_threads` slabs of planes, each of
+    which is processed by its own thread with a private histogram. The result
+    does not depend on the number of threads.
+    """
 
-        # release memory allocated by malloc
-        free(se_e_r)
-        free(se_e_c)
-        free(se_w_r)
-        free(se_w_c)
-        free(se_n_r)
-        free(se_n_c)
-        free(se_s_r)
-        free(se_s_c)
-        free(histo)
+    cdef Py_ssize_t planes = image.shape[0]
+    cdef Py_ssize_t rows = image.shape[1]
+    cdef Py_ssize_t cols = image.shape[2]
+    cdef Py_ssize_t odepth = out.shape[3]
+
+    cdef Py_ssize_t centre_p = <Py_ssize_t>(selem.shape[0] / 2) + shift_z
+    cdef Py_ssize_t centre_r = <Py_ssize_t>(selem.shape[1] / 2) + shift_y
+    cdef Py_ssize_t centre_c = <Py_ssize_t>(selem.shape[2] / 2) + shift_x
+
+    # check that structuring element center is inside the element bounding box
+    assert centre_p >= 0
+    assert centre_r >= 0
+    assert centre_c >= 0
+    assert centre_p < selem.shape[0]
+    assert centre_r < selem.shape[1]
+    assert centre_c < selem.shape[2]
+
+    cdef dtype_t* image_data = &image[0, 0, 0]
+    cdef char* mask_data = &mask[0, 0, 0]
+    cdef dtype_t_out* out_data = &out[0, 0, 0, 0]
+
+    cdef Py_ssize_t band, band_planes, n_bands, i
+    cdef int failed = 0
+
+    # build the full element and the attack and release borders along each
+    # axis by using difference along axis
+    np_selem = np.asarray(selem)
+    border_masks = [np_selem != 0]
+    for axis in range(3):
+        pad_shape = list(np_selem.shape)
+        pad_shape[axis] = 1
+        pad = np.zeros(pad_shape)
+        t = np.concatenate((np_selem, pad), axis=axis)
+        border_masks.append(np.diff(t, axis=axis) < 0)
+        t = np.concatenate((pad, np_selem), axis=axis)
+        border_masks.append(np.diff(t, axis=axis) > 0)
+
+    # keep references to the offset arrays for the duration of the filter
+    cdef Py_ssize_t[:, ::1] offsets
+    offset_arrays = []
+    cdef _border_3D borders[7]
+    for i in range(7):
+        offsets = np.ascontiguousarray(
+            np.array(np.nonzero(border_masks[i]), dtype=np.intp).reshape(3, -1)
+            - np.array([[centre_p], [centre_r], [centre_c]], dtype=np.intp))
+        offset_arrays.append(offsets)
+        borders[i].num = offsets.shape[1]
+        if borders[i].num:
+            borders[i].p = &offsets[0, 0]
+            borders[i].r = &offsets[1, 0]
+            borders[i].c = &offsets[2, 0]
+
+    # split the planes in slabs of (almost) equal depth, one per thread
+    if num_threads < 1:
+        num_threads = 1
+    n_bands = min(num_threads, max(planes, 1))
+    band_planes = (planes + n_bands - 1) / n_bands
+    if band_planes < 1:
+        band_planes = 1
+    n_bands = max((planes + band_planes - 1) / band_planes, 1)
+
+    with nogil:
+        for band in prange(n_bands, num_threads=n_bands, schedule='static'):
+            failed |= _core_3D_band(kernel, image_data, mask_data, out_data,
+                                    planes, rows, cols, odepth, borders,
+                                    band * band_planes,
+                                    min((band + 1) * band_planes, planes),
+                                    p0, p1, s0, s1, n_bins)
+
+    if failed:
+        raise MemoryError()
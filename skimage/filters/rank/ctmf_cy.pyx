@@ -0,0 +1,469 @@
+#cython: cdivision=True
+#cython: boundscheck=False
+#cython: nonecheck=False
+#cython: wraparound=False
+
+"""Constant time rank filters for rectangular neighborhoods.
+
+The local histogram is the sum of one histogram per image column, each
+covering the rows of the neighborhood. Moving the neighborhood one pixel to the
+right adds one column histogram and removes another one, moving it one row
+down updates each column histogram with one pixel, hence the cost per pixel
+does not depend on the size of the neighborhood [1]_.
+
+Histograms are stored on two levels: a coarse histogram with about
+``sqrt(n_bins)`` buckets is maintained for each column and for the
+neighborhood, while the fine histogram of a neighborhood bucket is only brought
+up to date when a rank falls into that bucket.
+
+Neighborhoods of any other shape, such as disks, do not decompose into column
+histograms. Their histogram is updated with the pixels entering and leaving
+the neighborhood when it moves one pixel to the right, as in the sliding
+filters, but it is stored on the same two levels, so that finding a rank
+scans about ``2 * sqrt(n_bins)`` bins instead of all of them.
+
+References
+----------
+.. [1] S. Perreault and P. Hebert, "Median Filtering in Constant Time",
+       IEEE Transactions on Image Processing, Sept 2007. Volume: 16,
+       Issue: 9, Page(s): 2389 - 2394.
+
+"""
+
+from libc.stdlib cimport malloc, calloc, free
+from cython.parallel import prange
+
+import numpy as np
+
+cimport numpy as cnp
+from .core_cy cimport dtype_t, dtype_t_out
+
+
+# budget for the column histograms of one tile, in bytes
+cdef Py_ssize_t TILE_HISTOGRAM_BYTES = 1 << 23
+
+
+cdef inline void _column_update(unsigned int* col_fine,
+                                Py_ssize_t* col_coarse, Py_ssize_t* col_pop,
+                                Py_ssize_t value, Py_ssize_t shift,
+                                int step) nogil:
+    col_fine[value] += step
+    col_coarse[value >> shift] += step
+    col_pop[0] += step
+
+
+cdef inline void _fine_update(Py_ssize_t* fine, unsigned int* col_fine,
+                              Py_ssize_t start, Py_ssize_t stop,
+                              int step) nogil:
+    cdef Py_ssize_t k
+    for k in range(start, stop):
+        fine[k] += step * <Py_ssize_t>col_fine[k]
+
+
+cdef int _ctmf_tile(dtype_t* image, char* mask, dtype_t_out* out,
+                    Py_ssize_t rows, Py_ssize_t cols,
+                    Py_ssize_t top, Py_ssize_t bottom,
+                    Py_ssize_t left, Py_ssize_t right,
+                    Py_ssize_t r0, Py_ssize_t r1,
+                    Py_ssize_t c0, Py_ssize_t c1,
+                    double p0, Py_ssize_t n_bins, Py_ssize_t shift) nogil:
+    """Filter the output pixels in rows ``[r0, r1)`` and columns ``[c0, c1)``.
+
+    Returns -1 if the histograms could not be allocated, 0 otherwise.
+    """
+
+    cdef Py_ssize_t n_coarse = ((n_bins - 1) >> shift) + 1
+    cdef Py_ssize_t bucket = 1 << shift
+    cdef Py_ssize_t kernel_width = left + right + 1
+
+    # the column histograms cover every column reached from the tile
+    cdef Py_ssize_t cs = c0 - left if c0 - left > 0 else 0
+    cdef Py_ssize_t ce = c1 + right if c1 + right < cols else cols
+    cdef Py_ssize_t ncol = ce - cs
+
+    cdef Py_ssize_t r, c, j, b, k, rr, value, start, stop, cin, cout
+    cdef Py_ssize_t pop, cum
+    cdef double thr
+
+    cdef unsigned int* col_fine = <unsigned int*>calloc(
+        ncol * n_bins, sizeof(unsigned int))
+    cdef Py_ssize_t* col_coarse = <Py_ssize_t*>calloc(
+        ncol * n_coarse, sizeof(Py_ssize_t))
+    cdef Py_ssize_t* col_pop = <Py_ssize_t*>calloc(ncol, sizeof(Py_ssize_t))
+    cdef Py_ssize_t* coarse = <Py_ssize_t*>malloc(
+        n_coarse * sizeof(Py_ssize_t))
+    cdef Py_ssize_t* fine = <Py_ssize_t*>malloc(n_bins * sizeof(Py_ssize_t))
+    # column at which each bucket of the fine histogram was last brought up
+    # to date
+    cdef Py_ssize_t* fine_col = <Py_ssize_t*>malloc(
+        n_coarse * sizeof(Py_ssize_t))
+
+    if (col_fine is NULL or col_coarse is NULL or col_pop is NULL or
+            coarse is NULL or fine is NULL or fine_col is NULL):
+        free(col_fine)
+        free(col_coarse)
+        free(col_pop)
+        free(coarse)
+        free(fine)
+        free(fine_col)
+        return -1
+
+    for r in range(r0, r1):
+
+        # update the column histograms
+        if r == r0:
+            for rr in range(r0 - top, r0 + bottom + 1):
+                if rr < 0 or rr >= rows:
+                    continue
+                for j in range(ncol):
+                    if mask[rr * cols + cs + j]:
+                        value = image[rr * cols + cs + j]
+                        _column_update(&col_fine[j * n_bins],
+                                       &col_coarse[j * n_coarse],
+                                       &col_pop[j], value, shift, 1)
+        else:
+            rr = r + bottom
+            if rr < rows:
+                for j in range(ncol):
+                    if mask[rr * cols + cs + j]:
+                        value = image[rr * cols + cs + j]
+                        _column_update(&col_fine[j * n_bins],
+                                       &col_coarse[j * n_coarse],
+                                       &col_pop[j], value, shift, 1)
+            rr = r - top - 1
+            if rr >= 0:
+                for j in range(ncol):
+                    if mask[rr * cols + cs + j]:
+                        value = image[rr * cols + cs + j]
+                        _column_update(&col_fine[j * n_bins],
+                                       &col_coarse[j * n_coarse],
+                                       &col_pop[j], value, shift, -1)
+
+        # coarse histogram of the neighborhood of (r, c0)
+        for b in range(n_coarse):
+            coarse[b] = 0
+            fine_col[b] = -1
+        pop = 0
+        start = c0 - left if c0 - left > 0 else 0
+        stop = c0 + right + 1 if c0 + right + 1 < cols else cols
+        for j in range(start - cs, stop - cs):
+            pop += col_pop[j]
+            for b in range(n_coarse):
+                coarse[b] += col_coarse[j * n_coarse + b]
+
+        for c in range(c0, c1):
+
+            if c > c0:
+                cin = c + right
+                if cin < cols:
+                    j = cin - cs
+                    pop += col_pop[j]
+                    for b in range(n_coarse):
+                        coarse[b] += col_coarse[j * n_coarse + b]
+                cout = c - left - 1
+                if cout >= 0:
+                    j = cout - cs
+                    pop -= col_pop[j]
+                    for b in range(n_coarse):
+                        coarse[b] -= col_coarse[j * n_coarse + b]
+
+            if pop == 0:
+                out[r * cols + c] = <dtype_t_out>0
+                continue
+
+            # p0 >= 1 selects the maximum, i.e. the last non-empty bin
+            if p0 >= 1:
+                thr = pop - 1
+            else:
+                thr = p0 * pop
+
+            # find the bucket holding the rank
+            cum = 0
+            for b in range(n_coarse):
+                if cum + coarse[b] > thr:
+                    break
+                cum += coarse[b]
+
+            # bring the fine histogram of the bucket up to date
+            start = b * bucket
+            stop = start + bucket if start + bucket < n_bins else n_bins
+            if fine_col[b] < 0 or 2 * (c - fine_col[b]) > kernel_width:
+                for k in range(start, stop):
+                    fine[k] = 0
+                j = c - left if c - left > 0 else 0
+                while j <= c + right and j < cols:
+                    _fine_update(fine, &col_fine[(j - cs) * n_bins],
+                                 start, stop, 1)
+                    j += 1
+            else:
+                for j in range(fine_col[b] + 1, c + 1):
+                    cin = j + right
+                    if cin < cols:
+                        _fine_update(fine, &col_fine[(cin - cs) * n_bins],
+                                     start, stop, 1)
+                    cout = j - left - 1
+                    if cout >= 0:
+                        _fine_update(fine, &col_fine[(cout - cs) * n_bins],
+                                     start, stop, -1)
+            fine_col[b] = c
+
+            for k in range(start, stop):
+                cum += fine[k]
+                if cum > thr:
+                    break
+            out[r * cols + c] = <dtype_t_out>k
+
+    free(col_fine)
+    free(col_coarse)
+    free(col_pop)
+    free(coarse)
+    free(fine)
+    free(fine_col)
+    return 0
+
+
+cdef inline void _fine_coarse_update(Py_ssize_t* fine, Py_ssize_t* coarse,
+                                     Py_ssize_t* pop, Py_ssize_t value,
+                                     Py_ssize_t shift, int step) nogil:
+    fine[value] += step
+    coarse[value >> shift] += step
+    pop[0] += step
+
+
+cdef int _footprint_band(dtype_t* image, char* mask, dtype_t_out* out,
+                         Py_ssize_t rows, Py_ssize_t cols,
+                         Py_ssize_t r0, Py_ssize_t r1,
+                         Py_ssize_t* offsets, Py_ssize_t n_offsets,
+                         Py_ssize_t* enter, Py_ssize_t n_enter,
+                         Py_ssize_t* leave, Py_ssize_t n_leave,
+                         double p0, Py_ssize_t n_bins, Py_ssize_t shift) nogil:
+    """Filter the output rows ``[r0, r1)`` with an arbitrary neighborhood.
+
+    `offsets`, `enter` and `leave` hold ``(row, col)`` pairs of offsets from
+    the filtered pixel of the pixels of the neighborhood, of the pixels
+    entering it and of the pixels leaving it when it moves to the right.
+
+    Returns -1 if the histograms could not be allocated, 0 otherwise.
+    """
+
+    cdef Py_ssize_t n_coarse = ((n_bins - 1) >> shift) + 1
+    cdef Py_ssize_t bucket = 1 << shift
+
+    cdef Py_ssize_t r, c, b, k, rr, cc, start, stop, pop, cum
+    cdef double thr
+
+    cdef Py_ssize_t* coarse = <Py_ssize_t*>malloc(
+        n_coarse * sizeof(Py_ssize_t))
+    cdef Py_ssize_t* fine = <Py_ssize_t*>malloc(n_bins * sizeof(Py_ssize_t))
+
+    if coarse is NULL or fine is NULL:
+        free(coarse)
+        free(fine)
+        return -1
+
+    for r in range(r0, r1):
+
+        # histogram of the neighborhood of (r, 0)
+        for b in range(n_coarse):
+            coarse[b] = 0
+        for k in range(n_bins):
+            fine[k] = 0
+        pop = 0
+        for k in range(n_offsets):
+            rr = r + offsets[2 * k]
+            cc = offsets[2 * k + 1]
+            if 0 <= rr < rows and 0 <= cc < cols and mask[rr * cols + cc]:
+                _fine_coarse_update(fine, coarse, &pop,
+                                    image[rr * cols + cc], shift, 1)
+
+        for c in range(cols):
+
+            if c > 0:
+                for k in range(n_enter):
+                    rr = r + enter[2 * k]
+                    cc = c + enter[2 * k + 1]
+                    if (0 <= rr < rows and 0 <= cc < cols and
+                            mask[rr * cols + cc]):
+                        _fine_coarse_update(fine, coarse, &pop,
+                                            image[rr * cols + cc], shift, 1)
+                for k in range(n_leave):
+                    rr = r + leave[2 * k]
+                    cc = c + leave[2 * k + 1]
+                    if (0 <= rr < rows and 0 <= cc < cols and
+                            mask[rr * cols + cc]):
+                        _fine_coarse_update(fine, coarse, &pop,
+                                            image[rr * cols + cc], shift, -1)
+
+            if pop == 0:
+                out[r * cols + c] = <dtype_t_out>0
+                continue
+
+            # p0 >= 1 selects the maximum, i.e. the last non-empty bin
+            if p0 >= 1:
+                thr = pop - 1
+            else:
+                thr = p0 * pop
+
+            # find the bucket holding the rank, then the bin
+            cum = 0
+            for b in range(n_coarse):
+                if cum + coarse[b] > thr:
+                    break
+                cum += coarse[b]
+            start = b * bucket
+            stop = start + bucket if start + bucket < n_bins else n_bins
+            for k in range(start, stop):
+                cum += fine[k]
+                if cum > thr:
+                    break
+            out[r * cols + c] = <dtype_t_out>k
+
+    free(coarse)
+    free(fine)
+    return 0
+
+
+def _percentile(dtype_t[:, ::1] image,
+                Py_ssize_t srows, Py_ssize_t scols,
+                char[:, ::1] mask,
+                dtype_t_out[:, ::1] out,
+                signed char shift_x, signed char shift_y, double p0,
+                Py_ssize_t n_bins, Py_ssize_t num_threads=1):
+    """Local `p0` percentile over a `srows` x `scols` rectangle.
+
+    ``p0 = 0`` gives the local minimum, ``p0 = 0.5`` the local median and
+    ``p0 = 1`` the local maximum.
+    """
+
+    cdef Py_ssize_t rows = image.shape[0]
+    cdef Py_ssize_t cols = image.shape[1]
+
+    cdef Py_ssize_t centre_r = <Py_ssize_t>(srows / 2) + shift_y
+    cdef Py_ssize_t centre_c = <Py_ssize_t>(scols / 2) + shift_x
+
+    # check that structuring element center is inside the element bounding box
+    assert centre_r >= 0
+    assert centre_c >= 0
+    assert centre_r < srows
+    assert centre_c < scols
+
+    cdef Py_ssize_t top = centre_r
+    cdef Py_ssize_t bottom = srows - 1 - centre_r
+    cdef Py_ssize_t left = centre_c
+    cdef Py_ssize_t right = scols - 1 - centre_c
+
+    # use about sqrt(n_bins) coarse buckets
+    cdef Py_ssize_t shift = ((n_bins - 1).bit_length() + 1) // 2
+
+    # split the image in row bands, one per thread, and in column stripes
+    # whose histograms fit in the memory budget
+    cdef Py_ssize_t n_bands, band_rows, n_stripes, stripe_cols, unit
+    cdef int failed = 0
+
+    if num_threads < 1:
+        num_threads = 1
+    n_bands = min(num_threads, rows)
+    band_rows = (rows + n_bands - 1) // n_bands
+    n_bands = (rows + band_rows - 1) // band_rows
+
+    stripe_cols = TILE_HISTOGRAM_BYTES // (n_bins * sizeof(unsigned int))
+    stripe_cols = max(stripe_cols - scols, scols, 1)
+    n_stripes = (cols + stripe_cols - 1) // stripe_cols
+
+    cdef dtype_t* image_data = &image[0, 0]
+    cdef char* mask_data = &mask[0, 0]
+    cdef dtype_t_out* out_data = &out[0, 0]
+
+    with nogil:
+        for unit in prange(n_bands * n_stripes, num_threads=num_threads,
+                           schedule='dynamic'):
+            failed |= _ctmf_tile(
+                image_data, mask_data, out_data, rows, cols,
+                top, bottom, left, right,
+                (unit // n_stripes) * band_rows,
+                min((unit // n_stripes + 1) * band_rows, rows),
+                (unit % n_stripes) * stripe_cols,
+                min((unit % n_stripes + 1) * stripe_cols, cols),
+                p0, n_bins, shift)
+
+    if failed:
+        raise MemoryError()
+
+
+def _percentile_footprint(dtype_t[:, ::1] image,
+                          cnp.uint8_t[:, ::1] selem,
+                          char[:, ::1] mask,
+                          dtype_t_out[:, ::1] out,
+                          signed char shift_x, signed char shift_y, double p0,
+                          Py_ssize_t n_bins, Py_ssize_t num_threads=1):
+    """Local `p0` percentile over the neighborhood defined by `selem`.
+
+    ``p0 = 0`` gives the local minimum, ``p0 = 0.5`` the local median and
+    ``p0 = 1`` the local maximum.
+    """
+
+    cdef Py_ssize_t rows = image.shape[0]
+    cdef Py_ssize_t cols = image.shape[1]
+    cdef Py_ssize_t srows = selem.shape[0]
+    cdef Py_ssize_t scols = selem.shape[1]
+
+    cdef Py_ssize_t centre_r = <Py_ssize_t>(srows / 2) + shift_y
+    cdef Py_ssize_t centre_c = <Py_ssize_t>(scols / 2) + shift_x
+
+    # check that structuring element center is inside the element bounding box
+    assert centre_r >= 0
+    assert centre_c >= 0
+    assert centre_r < srows
+    assert centre_c < scols
+
+    # offsets of the pixels of the neighborhood, and of the pixels entering
+    # and leaving it when it moves one column to the right
+    footprint = np.asarray(selem).astype(bool)
+    padded = np.pad(footprint, ((0, 0), (1, 1)), mode='constant')
+    centre = np.array([centre_r, centre_c])
+    cdef Py_ssize_t[:, ::1] offsets = np.ascontiguousarray(
+        np.transpose(np.nonzero(footprint)) - centre, dtype=np.intp)
+    cdef Py_ssize_t[:, ::1] enter = np.ascontiguousarray(
+        np.transpose(np.nonzero(footprint & ~padded[:, 2:])) - centre,
+        dtype=np.intp)
+    cdef Py_ssize_t[:, ::1] leave = np.ascontiguousarray(
+        np.transpose(np.nonzero(footprint & ~padded[:, :-2]))
+        - centre - [0, 1], dtype=np.intp)
+
+    # use about sqrt(n_bins) coarse buckets
+    cdef Py_ssize_t shift = ((n_bins - 1).bit_length() + 1) // 2
+
+    # split the image in row bands, one per thread
+    cdef Py_ssize_t n_bands, band_rows, band
+    cdef int failed = 0
+
+    if num_threads < 1:
+        num_threads = 1
+    n_bands = min(num_threads, rows)
+    band_rows = (rows + n_bands - 1) // n_bands
+    n_bands = (rows + band_rows - 1) // band_rows
+
+    if offsets.shape[0] == 0:
+        np.asarray(out)[...] = 0
+        return
+
+    cdef dtype_t* image_data = &image[0, 0]
+    cdef char* mask_data = &mask[0, 0]
+    cdef dtype_t_out* out_data = &out[0, 0]
+    cdef Py_ssize_t* offsets_data = &offsets[0, 0]
+    # a footprint has at least one entering and one leaving pixel
+    cdef Py_ssize_t* enter_data = &enter[0, 0]
+    cdef Py_ssize_t* leave_data = &leave[0, 0]
+
+    with nogil:
+        for band in prange(n_bands, num_threads=num_threads,
+                           schedule='dynamic'):
+            failed |= _footprint_band(
+                image_data, mask_data, out_data, rows, cols,
+                band * band_rows, min((band + 1) * band_rows, rows),
+                offsets_data, offsets.shape[0],
+                enter_data, enter.shape[0], leave_data, leave.shape[0],
+                p0, n_bins, shift)
+
+    if failed:
+        raise MemoryError()
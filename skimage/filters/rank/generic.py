@@ -25,6 +25,10 @@ histogram computation. By default the entire image is filtered.
 
 This implementation outperforms grey.dilation for large structuring elements.
 
+3-D images are filtered with 3-D structuring elements (e.g. ``ball`` or
+``cube``): the histogram is then updated along the same snake-like path within
+each plane, and moves from plane to plane at the end of each of them.
+
 Input image can be 8-bit or 16-bit, for 16-bit input images, the number of
 histogram bins is determined from the maximum value present in the image.
 
@@ -54,7 +58,7 @@ from scipy import ndimage as ndi
 from ...util import img_as_ubyte
 from ..._shared.utils import assert_nD, warn
 
-from . import generic_cy
+from . import generic_cy, ctmf_cy
 
 
 __all__ = ['autolevel', 'bottomhat', 'equalize', 'gradient', 'maximum', 'mean',
@@ -65,7 +69,7 @@ __all__ = ['autolevel', 'bottomhat', 'equalize', 'gradient', 'maximum', 'mean',
 
 def _handle_input(image, selem, out, mask, out_dtype=None, pixel_size=1):
 
-    assert_nD(image, 2)
+    assert_nD(image, [2, 3])
     if image.dtype not in (np.uint8, np.uint16):
         message = ('Possible precision loss converting image of type {} to '
                    'uint8 as required by rank filters. Convert manually using '
@@ -75,6 +79,9 @@ def _handle_input(image, selem, out, mask, out_dtype=None, pixel_size=1):
         image = img_as_ubyte(image)
 
     selem = np.ascontiguousarray(img_as_ubyte(selem > 0))
+    if selem.ndim != image.ndim:
+        raise ValueError('Image dimensions and neighborhood dimensions '
+                         'do not match')
     image = np.ascontiguousarray(image)
 
     if mask is None:
@@ -91,7 +98,7 @@ def _handle_input(image, selem, out, mask, out_dtype=None, pixel_size=1):
             out_dtype = image.dtype
         out = np.empty(image.shape+(pixel_size,), dtype=out_dtype)
     else:
-        if len(out.shape) == 2:
+        if out.ndim == image.ndim:
             out = out.reshape(out.shape+(pixel_size,))
 
     is_8bit = image.dtype in (np.uint8, np.int8)
@@ -113,26 +120,73 @@ def _handle_input(image, selem, out, mask, out_dtype=None, pixel_size=1):
 
 
 def _apply_scalar_per_pixel(func, image, selem, out, mask, shift_x, shift_y,
-                            out_dtype=None):
+                            out_dtype=None, num_threads=1):
 
     image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask,
                                                     out_dtype)
 
     func(image, selem, shift_x=shift_x, shift_y=shift_y, mask=mask,
-         out=out, n_bins=n_bins)
+         out=out, n_bins=n_bins, num_threads=num_threads)
 
     return out.reshape(out.shape[:2])
 
 
+def _apply_scalar_per_pixel_3D(func, image, selem, out, mask, shift_x,
+                               shift_y, shift_z, out_dtype=None,
+                               num_threads=1):
+
+    image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask,
+                                                    out_dtype)
+
+    func(image, selem, shift_x=shift_x, shift_y=shift_y, shift_z=shift_z,
+         mask=mask, out=out, n_bins=n_bins, num_threads=num_threads)
+
+    return out.reshape(out.shape[:3])
+
+
 def _apply_vector_per_pixel(func, image, selem, out, mask, shift_x, shift_y,
-                            out_dtype=None, pixel_size=1):
+                            out_dtype=None, pixel_size=1, num_threads=1):
 
     image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask,
                                                     out_dtype,
                                                     pixel_size=pixel_size)
 
     func(image, selem, shift_x=shift_x, shift_y=shift_y, mask=mask,
-         out=out, n_bins=n_bins)
+         out=out, n_bins=n_bins, num_threads=num_threads)
+
+    return out
+
+
+def _apply_vector_per_pixel_3D(func, image, selem, out, mask, shift_x,
+                               shift_y, shift_z, out_dtype=None, pixel_size=1,
+                               num_threads=1):
+
+    image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask,
+                                                    out_dtype,
+                                                    pixel_size=pixel_size)
+
+    func(image, selem, shift_x=shift_x, shift_y=shift_y, shift_z=shift_z,
+         mask=mask, out=out, n_bins=n_bins, num_threads=num_threads)
+
+    return out
+
+
+def _apply_constant_time(image, selem, out, mask, shift_x, shift_y, p0,
+                         num_threads=1):
+
+    image, selem, out, mask, n_bins = _handle_input(image, selem, out, mask)
+    if image.ndim != 2:
+        raise ValueError("The 'constant_time' method requires a 2-D image.")
+
+    out = out.reshape(out.shape[:2])
+    if selem.all():
+        ctmf_cy._percentile(image, selem.shape[0], selem.shape[1], mask=mask,
+                            out=out, shift_x=shift_x, shift_y=shift_y, p0=p0,
+                            n_bins=n_bins, num_threads=num_threads)
+    else:
+        ctmf_cy._percentile_footprint(image, selem, mask=mask, out=out,
+                                      shift_x=shift_x, shift_y=shift_y, p0=p0,
+                                      n_bins=n_bins, num_threads=num_threads)
 
     return out
 
@@ -161,7 +215,8 @@ def _default_selem(func):
     return func_out
 
 
-def autolevel(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def autolevel(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+              shift_z=False, num_threads=1):
     """Auto-level image using local histogram.
 
     This filter locally stretches the histogram of greyvalues to cover the
@@ -169,23 +224,27 @@ def autolevel(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -198,12 +257,22 @@ def autolevel(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._autolevel, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._autolevel, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._autolevel_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def bottomhat(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def bottomhat(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+              shift_z=False, num_threads=1):
     """Local bottom-hat of an image.
 
     This filter computes the morphological closing of the image and then
@@ -211,23 +280,27 @@ def bottomhat(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : 2-D array
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -240,33 +313,47 @@ def bottomhat(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._bottomhat, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._bottomhat, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._bottomhat_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def equalize(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def equalize(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+             shift_z=False, num_threads=1):
     """Equalize image using local histogram.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -279,33 +366,47 @@ def equalize(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._equalize, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._equalize, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._equalize_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def gradient(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def gradient(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+             shift_z=False, num_threads=1):
     """Return local gradient of an image (i.e. local maximum - local minimum).
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -318,33 +419,57 @@ def gradient(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._gradient, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._gradient, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._gradient_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def maximum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def maximum(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+            shift_z=False, num_threads=1,
+            method='sliding'):
     """Return local maximum of an image.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
+    method : {'sliding', 'constant_time'}, optional
+        Algorithm used to compute the local histograms. 'sliding' (default)
+        updates the histogram along a snake-like path, at a cost per pixel
+        growing with the size of `selem`. 'constant_time' requires a 2-D
+        image; for a rectangular `selem` (all ones), it sums one histogram
+        per image column [1]_, at a cost per pixel independent of the size of
+        `selem`. Other shapes, such as disks, update the histogram along the
+        edges of `selem` like 'sliding', but search ranks in a two-level
+        histogram, which is much faster for 16-bit images.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     See also
@@ -356,6 +481,12 @@ def maximum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
     The lower algorithm complexity makes `skimage.filters.rank.maximum`
     more efficient for larger images and structuring elements.
 
+    References
+    ----------
+    .. [1] S. Perreault and P. Hebert, "Median Filtering in Constant Time",
+           IEEE Transactions on Image Processing, Sept 2007. Volume: 16,
+           Issue: 9, Page(s): 2389 - 2394.
+
     Examples
     --------
     >>> from skimage import data
@@ -366,33 +497,53 @@ def maximum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._maximum, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    if method == 'constant_time':
+        return _apply_constant_time(image, selem, out=out, mask=mask,
+                                    shift_x=shift_x, shift_y=shift_y, p0=1,
+                                    num_threads=num_threads)
+    elif method != 'sliding':
+        raise ValueError('Unknown method: {}'.format(method))
+
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._maximum, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._maximum_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def mean(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def mean(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+         shift_z=False, num_threads=1):
     """Return local mean of an image.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -405,33 +556,46 @@ def mean(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._mean, image, selem, out=out,
-                                   mask=mask, shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._mean, image, selem, out=out,
+                                       mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._mean_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def geometric_mean(image, selem, out=None, mask=None,
-                   shift_x=False, shift_y=False):
+def geometric_mean(image, selem, out=None, mask=None, shift_x=False,
+                   shift_y=False, shift_z=False, num_threads=1):
     """Return local geometric mean of an image.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -449,33 +613,47 @@ def geometric_mean(image, selem, out=None, mask=None,
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._geometric_mean, image, selem, out=out,
-                                   mask=mask, shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._geometric_mean, image,
+                                       selem, out=out, mask=mask,
+                                       shift_x=shift_x, shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._geometric_mean_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
 def subtract_mean(image, selem, out=None, mask=None, shift_x=False,
-                  shift_y=False):
+                  shift_y=False, shift_z=False, num_threads=1):
     """Return image subtracted from its local mean.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -488,36 +666,59 @@ def subtract_mean(image, selem, out=None, mask=None, shift_x=False,
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._subtract_mean, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._subtract_mean, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._subtract_mean_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
 @_default_selem
-def median(image, selem=None, out=None, mask=None,
-           shift_x=False, shift_y=False):
+def median(image, selem=None, out=None, mask=None, shift_x=False,
+           shift_y=False, shift_z=False, num_threads=1,
+           method='sliding'):
     """Return local median of an image.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array, optional
-        The neighborhood expressed as a 2-D array of 1's and 0's. If None, a
+    selem : ndarray, optional
+        The neighborhood expressed as an ndarray of 1's and 0's. If None, a
         full square of size 3 is used.
-    out : 2-D array (same dtype as input)
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
+    method : {'sliding', 'constant_time'}, optional
+        Algorithm used to compute the local histograms. 'sliding' (default)
+        updates the histogram along a snake-like path, at a cost per pixel
+        growing with the size of `selem`. 'constant_time' requires a 2-D
+        image; for a rectangular `selem` (all ones), it sums one histogram
+        per image column [1]_, at a cost per pixel independent of the size of
+        `selem`. Other shapes, such as disks, update the histogram along the
+        edges of `selem` like 'sliding', but search ranks in a two-level
+        histogram, which is much faster for 16-bit images.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     See also
@@ -525,6 +726,12 @@ def median(image, selem=None, out=None, mask=None,
     skimage.filters.median : Implementation of a median filtering which handles
         images with floating precision.
 
+    References
+    ----------
+    .. [1] S. Perreault and P. Hebert, "Median Filtering in Constant Time",
+           IEEE Transactions on Image Processing, Sept 2007. Volume: 16,
+           Issue: 9, Page(s): 2389 - 2394.
+
     Examples
     --------
     >>> from skimage import data
@@ -535,33 +742,63 @@ def median(image, selem=None, out=None, mask=None,
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._median, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    if method == 'constant_time':
+        return _apply_constant_time(image, selem, out=out, mask=mask,
+                                    shift_x=shift_x, shift_y=shift_y, p0=0.5,
+                                    num_threads=num_threads)
+    elif method != 'sliding':
+        raise ValueError('Unknown method: {}'.format(method))
+
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._median, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._median_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def minimum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def minimum(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+            shift_z=False, num_threads=1,
+            method='sliding'):
     """Return local minimum of an image.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
+    method : {'sliding', 'constant_time'}, optional
+        Algorithm used to compute the local histograms. 'sliding' (default)
+        updates the histogram along a snake-like path, at a cost per pixel
+        growing with the size of `selem`. 'constant_time' requires a 2-D
+        image; for a rectangular `selem` (all ones), it sums one histogram
+        per image column [1]_, at a cost per pixel independent of the size of
+        `selem`. Other shapes, such as disks, update the histogram along the
+        edges of `selem` like 'sliding', but search ranks in a two-level
+        histogram, which is much faster for 16-bit images.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     See also
@@ -573,6 +810,12 @@ def minimum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
     The lower algorithm complexity makes `skimage.filters.rank.minimum` more
     efficient for larger images and structuring elements.
 
+    References
+    ----------
+    .. [1] S. Perreault and P. Hebert, "Median Filtering in Constant Time",
+           IEEE Transactions on Image Processing, Sept 2007. Volume: 16,
+           Issue: 9, Page(s): 2389 - 2394.
+
     Examples
     --------
     >>> from skimage import data
@@ -583,35 +826,55 @@ def minimum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._minimum, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    if method == 'constant_time':
+        return _apply_constant_time(image, selem, out=out, mask=mask,
+                                    shift_x=shift_x, shift_y=shift_y, p0=0,
+                                    num_threads=num_threads)
+    elif method != 'sliding':
+        raise ValueError('Unknown method: {}'.format(method))
+
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._minimum, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._minimum_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def modal(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def modal(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+          shift_z=False, num_threads=1):
     """Return local mode of an image.
 
     The mode is the value that appears most often in the local histogram.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -624,13 +887,21 @@ def modal(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._modal, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._modal, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._modal_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
 def enhance_contrast(image, selem, out=None, mask=None, shift_x=False,
-                     shift_y=False):
+                     shift_y=False, shift_z=False, num_threads=1):
     """Enhance contrast of an image.
 
     This replaces each pixel by the local maximum if the pixel greyvalue is
@@ -639,23 +910,27 @@ def enhance_contrast(image, selem, out=None, mask=None, shift_x=False,
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         The result of the local enhance_contrast.
 
     Examples
@@ -668,12 +943,22 @@ def enhance_contrast(image, selem, out=None, mask=None, shift_x=False,
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._enhance_contrast, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._enhance_contrast, image,
+                                       selem, out=out, mask=mask,
+                                       shift_x=shift_x, shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._enhance_contrast_3D,
+                                          image, selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def pop(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def pop(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+        shift_z=False, num_threads=1):
     """Return the local number (population) of pixels.
 
     The number of pixels is defined as the number of pixels which are included
@@ -681,23 +966,27 @@ def pop(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -718,12 +1007,21 @@ def pop(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._pop, image, selem, out=out,
-                                   mask=mask, shift_x=shift_x,
-                                   shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._pop, image, selem, out=out,
+                                       mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._pop_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def sum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def sum(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+        shift_z=False, num_threads=1):
     """Return the local sum of pixels.
 
     Note that the sum may overflow depending on the data type of the input
@@ -731,23 +1029,27 @@ def sum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -768,12 +1070,21 @@ def sum(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._sum, image, selem, out=out,
-                                   mask=mask, shift_x=shift_x,
-                                   shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._sum, image, selem, out=out,
+                                       mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._sum_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def threshold(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def threshold(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+              shift_z=False, num_threads=1):
     """Local threshold of an image.
 
     The resulting binary mask is True if the greyvalue of the center pixel is
@@ -781,23 +1092,27 @@ def threshold(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -818,12 +1133,22 @@ def threshold(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._threshold, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._threshold, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._threshold_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def tophat(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def tophat(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+           shift_z=False, num_threads=1):
     """Local top-hat of an image.
 
     This filter computes the morphological opening of the image and then
@@ -831,23 +1156,27 @@ def tophat(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -860,27 +1189,35 @@ def tophat(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._tophat, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._tophat, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._tophat_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
 def noise_filter(image, selem, out=None, mask=None, shift_x=False,
-                 shift_y=False):
+                 shift_y=False, shift_z=False, num_threads=1):
     """Noise feature.
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
@@ -889,10 +1226,14 @@ def noise_filter(image, selem, out=None, mask=None, shift_x=False,
     ----------
     .. [1] N. Hashimoto et al. Referenceless image quality evaluation
                      for whole slide imaging. J Pathol Inform 2012;3:9.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -905,19 +1246,33 @@ def noise_filter(image, selem, out=None, mask=None, shift_x=False,
 
     """
 
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        centre_shift = (shift_y, shift_x)
+    else:
+        centre_shift = (shift_z, shift_y, shift_x)
     # ensure that the central pixel in the structuring element is empty
-    centre_r = int(selem.shape[0] / 2) + shift_y
-    centre_c = int(selem.shape[1] / 2) + shift_x
+    centre = tuple(int(size / 2) + shift
+                   for size, shift in zip(selem.shape, centre_shift))
     # make a local copy
     selem_cpy = selem.copy()
-    selem_cpy[centre_r, centre_c] = 0
+    selem_cpy[centre] = 0
 
-    return _apply_scalar_per_pixel(generic_cy._noise_filter, image, selem_cpy,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._noise_filter, image,
+                                       selem_cpy, out=out, mask=mask,
+                                       shift_x=shift_x, shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._noise_filter_3D, image,
+                                          selem_cpy, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def entropy(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def entropy(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+            shift_z=False, num_threads=1):
     """Local entropy.
 
     The entropy is computed using base 2 logarithm i.e. the filter returns the
@@ -926,19 +1281,23 @@ def entropy(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     Parameters
     ----------
-    image : 2-D array (uint8, uint16)
+    image : ([P,] M, N) ndarray (uint8, uint16)
         Input image.
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
-    out : 2-D array (same dtype as input)
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
+    out : ([P,] M, N) array (same dtype as input)
         If None, a new array is allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
@@ -959,34 +1318,47 @@ def entropy(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._entropy, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y,
-                                   out_dtype=np.double)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._entropy, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y, out_dtype=np.double,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._entropy_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          out_dtype=np.double,
+                                          num_threads=num_threads)
 
 
-def otsu(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def otsu(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+         shift_z=False, num_threads=1):
     """Local Otsu's threshold value for each pixel.
 
     Parameters
     ----------
-    image : ndarray
-        Image array (uint8 array).
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
+    image : ([P,] M, N) ndarray (uint8)
+        Input image.
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
     out : ndarray
         If None, a new array will be allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     References
@@ -1004,33 +1376,46 @@ def otsu(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._otsu, image, selem, out=out,
-                                   mask=mask, shift_x=shift_x,
-                                   shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._otsu, image, selem, out=out,
+                                       mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._otsu_3D, image, selem,
+                                          out=out, mask=mask, shift_x=shift_x,
+                                          shift_y=shift_y, shift_z=shift_z,
+                                          num_threads=num_threads)
 
 
-def windowed_histogram(image, selem, out=None, mask=None,
-                       shift_x=False, shift_y=False, n_bins=None):
+def windowed_histogram(image, selem, out=None, mask=None, shift_x=False,
+                       shift_y=False, shift_z=False, n_bins=None,
+                       num_threads=1):
     """Normalized sliding window histogram
 
     Parameters
     ----------
-    image : ndarray
-        Image array (uint8 array).
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
+    image : ([P,] M, N) ndarray (uint8)
+        Input image.
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
     out : ndarray
         If None, a new array will be allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
     n_bins : int or None
         The number of histogram bins. Will default to ``image.max() + 1``
         if None is passed.
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
@@ -1055,36 +1440,50 @@ def windowed_histogram(image, selem, out=None, mask=None,
     if n_bins is None:
         n_bins = int(image.max()) + 1
 
-    return _apply_vector_per_pixel(generic_cy._windowed_hist, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y,
-                                   out_dtype=np.double,
-                                   pixel_size=n_bins)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_vector_per_pixel(generic_cy._windowed_hist, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y, out_dtype=np.double,
+                                       pixel_size=n_bins,
+                                       num_threads=num_threads)
+    else:
+        return _apply_vector_per_pixel_3D(generic_cy._windowed_hist_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z, out_dtype=np.double,
+                                          pixel_size=n_bins,
+                                          num_threads=num_threads)
 
 
-def majority(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
+def majority(image, selem, out=None, mask=None, shift_x=False, shift_y=False,
+             shift_z=False, num_threads=1):
     """Majority filter assign to each pixel the most occuring value within
     its neighborhood.
 
     Parameters
     ----------
-    image : ndarray
-        Image array (uint8, uint16 array).
-    selem : 2-D array
-        The neighborhood expressed as a 2-D array of 1's and 0's.
+    image : ([P,] M, N) ndarray (uint8, uint16)
+        Input image.
+    selem : ndarray
+        The neighborhood expressed as an ndarray of 1's and 0's.
     out : ndarray
         If None, a new array will be allocated.
     mask : ndarray
         Mask array that defines (>0) area of the image included in the local
         neighborhood. If None, the complete image is used (default).
-    shift_x, shift_y : int
+    shift_x, shift_y, shift_z : int
         Offset added to the structuring element center point. Shift is bounded
         to the structuring element sizes (center must be inside the given
         structuring element).
+    num_threads : int, optional
+        Number of threads used to filter the image. Each thread processes a
+        band of rows (of planes for 3-D images) with its own local histogram;
+        the result does not depend on the number of threads.
 
     Returns
     -------
-    out : 2-D array (same dtype as input image)
+    out : ([P,] M, N) ndarray (same dtype as input image)
         Output image.
 
     Examples
@@ -1097,6 +1496,15 @@ def majority(image, selem, out=None, mask=None, shift_x=False, shift_y=False):
 
     """
 
-    return _apply_scalar_per_pixel(generic_cy._majority, image, selem,
-                                   out=out, mask=mask,
-                                   shift_x=shift_x, shift_y=shift_y)
+    np_image = np.asanyarray(image)
+    if np_image.ndim == 2:
+        return _apply_scalar_per_pixel(generic_cy._majority, image, selem,
+                                       out=out, mask=mask, shift_x=shift_x,
+                                       shift_y=shift_y,
+                                       num_threads=num_threads)
+    else:
+        return _apply_scalar_per_pixel_3D(generic_cy._majority_3D, image,
+                                          selem, out=out, mask=mask,
+                                          shift_x=shift_x, shift_y=shift_y,
+                                          shift_z=shift_z,
+                                          num_threads=num_threads)
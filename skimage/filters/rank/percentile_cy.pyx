@@ -258,10 +258,11 @@ def _autolevel(dtype_t[:, ::1] image,
                char[:, ::1] mask,
                dtype_t_out[:, :, ::1] out,
                signed char shift_x, signed char shift_y, double p0, double p1,
-               Py_ssize_t n_bins):
+               Py_ssize_t n_bins,
+               Py_ssize_t num_threads=1):
 
     _core(_kernel_autolevel[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _gradient(dtype_t[:, ::1] image,
@@ -269,10 +270,11 @@ def _gradient(dtype_t[:, ::1] image,
               char[:, ::1] mask,
               dtype_t_out[:, :, ::1] out,
               signed char shift_x, signed char shift_y, double p0, double p1,
-              Py_ssize_t n_bins):
+              Py_ssize_t n_bins,
+              Py_ssize_t num_threads=1):
 
     _core(_kernel_gradient[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _mean(dtype_t[:, ::1] image,
@@ -280,10 +282,11 @@ def _mean(dtype_t[:, ::1] image,
           char[:, ::1] mask,
           dtype_t_out[:, :, ::1] out,
           signed char shift_x, signed char shift_y, double p0, double p1,
-          Py_ssize_t n_bins):
+          Py_ssize_t n_bins,
+          Py_ssize_t num_threads=1):
 
     _core(_kernel_mean[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _sum(dtype_t[:, ::1] image,
@@ -291,10 +294,11 @@ def _sum(dtype_t[:, ::1] image,
          char[:, ::1] mask,
          dtype_t_out[:, :, ::1] out,
          signed char shift_x, signed char shift_y, double p0, double p1,
-         Py_ssize_t n_bins):
+         Py_ssize_t n_bins,
+         Py_ssize_t num_threads=1):
 
     _core(_kernel_sum[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _subtract_mean(dtype_t[:, ::1] image,
@@ -302,10 +306,11 @@ def _subtract_mean(dtype_t[:, ::1] image,
                    char[:, ::1] mask,
                    dtype_t_out[:, :, ::1] out,
                    signed char shift_x, signed char shift_y, double p0, double p1,
-                   Py_ssize_t n_bins):
+                   Py_ssize_t n_bins,
+                   Py_ssize_t num_threads=1):
 
     _core(_kernel_subtract_mean[dtype_t_out, dtype_t], image, selem, mask,
-          out, shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          out, shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _enhance_contrast(dtype_t[:, ::1] image,
@@ -313,10 +318,11 @@ def _enhance_contrast(dtype_t[:, ::1] image,
                       char[:, ::1] mask,
                       dtype_t_out[:, :, ::1] out,
                       signed char shift_x, signed char shift_y, double p0, double p1,
-                      Py_ssize_t n_bins):
+                      Py_ssize_t n_bins,
+                      Py_ssize_t num_threads=1):
 
     _core(_kernel_enhance_contrast[dtype_t_out, dtype_t], image, selem, mask,
-          out, shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          out, shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _percentile(dtype_t[:, ::1] image,
@@ -324,10 +330,11 @@ def _percentile(dtype_t[:, ::1] image,
                 char[:, ::1] mask,
                 dtype_t_out[:, :, ::1] out,
                 signed char shift_x, signed char shift_y, double p0, double p1,
-                Py_ssize_t n_bins):
+                Py_ssize_t n_bins,
+                Py_ssize_t num_threads=1):
 
     _core(_kernel_percentile[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, 1, 0, 0, n_bins)
+          shift_x, shift_y, p0, 1, 0, 0, n_bins, num_threads)
 
 
 def _pop(dtype_t[:, ::1] image,
@@ -335,10 +342,11 @@ def _pop(dtype_t[:, ::1] image,
          char[:, ::1] mask,
          dtype_t_out[:, :, ::1] out,
          signed char shift_x, signed char shift_y, double p0, double p1,
-         Py_ssize_t n_bins):
+         Py_ssize_t n_bins,
+         Py_ssize_t num_threads=1):
 
     _core(_kernel_pop[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, p1, 0, 0, n_bins)
+          shift_x, shift_y, p0, p1, 0, 0, n_bins, num_threads)
 
 
 def _threshold(dtype_t[:, ::1] image,
@@ -346,7 +354,8 @@ def _threshold(dtype_t[:, ::1] image,
                char[:, ::1] mask,
                dtype_t_out[:, :, ::1] out,
                signed char shift_x, signed char shift_y, double p0, double p1,
-               Py_ssize_t n_bins):
+               Py_ssize_t n_bins,
+               Py_ssize_t num_threads=1):
 
     _core(_kernel_threshold[dtype_t_out, dtype_t], image, selem, mask, out,
-          shift_x, shift_y, p0, 1, 0, 0, n_bins)
+          shift_x, shift_y, p0, 1, 0, 0, n_bins, num_threads)
@@ -1,5 +1,6 @@
 import os
 import numpy as np
+from scipy import ndimage as ndi
 from skimage._shared.testing import (assert_equal, assert_array_equal,
                                      assert_allclose)
 from skimage._shared import testing
@@ -10,6 +11,7 @@ from skimage import data, util, morphology
 from skimage.morphology import grey, disk
 from skimage.filters import rank
 from skimage.filters.rank import __all__ as all_rank_filters
+from skimage.filters.rank.generic import __all__ as generic_filters
 from skimage._shared._warnings import expected_warnings
 from skimage._shared.testing import test_parallel, arch32, parametrize, xfail
 from pytest import param
@@ -723,3 +725,123 @@ class TestRank():
         expected = rank.windowed_histogram(
             img, elem).argmax(-1).astype(np.uint8)
         assert_equal(expected, rank.majority(img, elem))
+
+
+    @parametrize('filter', all_rank_filters)
+    @parametrize('num_threads', [2, 3, 7])
+    def test_num_threads(self, filter, num_threads):
+        # the result must not depend on how the image is split in bands
+        image = img_as_ubyte(data.camera()[:101, :67])
+        mask = np.ones(image.shape, dtype=np.uint8)
+        mask[20:40, 10:30] = 0
+        selem = disk(4)
+        func = getattr(rank, filter)
+        expected = func(image, selem, mask=mask)
+        result = func(image, selem, mask=mask, num_threads=num_threads)
+        assert_equal(expected, result)
+
+
+    @parametrize('filter', generic_filters)
+    def test_3d_flat_selem_matches_2d(self, filter):
+        # a selem with a single plane gives slice-by-slice 2-D filtering
+        func = getattr(rank, filter)
+        image = img_as_ubyte(data.camera()[:60, :50])
+        volume = np.stack([image, image[::-1], image[:, ::-1]])
+        selem = disk(3)
+        expected = np.stack([func(plane, selem) for plane in volume])
+        result = func(volume, selem[np.newaxis])
+        assert_equal(expected, result)
+
+    @parametrize('func', [rank.minimum, rank.maximum])
+    def test_3d_vs_ndimage(self, func):
+        np.random.seed(0)
+        volume = (np.random.rand(15, 20, 12) * 255).astype(np.uint8)
+        ndi_func = {rank.minimum: ndi.minimum_filter,
+                    rank.maximum: ndi.maximum_filter}[func]
+        for selem in (morphology.ball(2), morphology.cube(3)):
+            expected = ndi_func(volume, footprint=selem, mode='nearest')
+            assert_equal(expected, func(volume, selem))
+
+    def test_3d_median_mask_and_shift(self):
+        np.random.seed(0)
+        volume = (np.random.rand(8, 10, 9) * 255).astype(np.uint8)
+        mask = np.random.rand(*volume.shape) > 0.3
+        selem = morphology.ball(1)
+        result = rank.mean(volume, selem, mask=mask, shift_x=1, shift_z=-1)
+
+        expected = np.zeros_like(volume)
+        offsets = np.transpose(np.nonzero(selem)) - 1 - [-1, 0, 1]
+        for p, r, c in np.ndindex(*volume.shape):
+            values = [volume[p + dp, r + dr, c + dc]
+                      for dp, dr, dc in offsets
+                      if 0 <= p + dp < 8 and 0 <= r + dr < 10 and
+                      0 <= c + dc < 9 and mask[p + dp, r + dr, c + dc]]
+            if values:
+                expected[p, r, c] = int(np.sum(values, dtype=float) /
+                                        len(values))
+        assert_equal(expected, result)
+
+    @parametrize('num_threads', [2, 5])
+    def test_3d_num_threads(self, num_threads):
+        np.random.seed(0)
+        volume = (np.random.rand(11, 20, 12) * 255).astype(np.uint8)
+        selem = morphology.ball(2)
+        assert_equal(rank.entropy(volume, selem),
+                     rank.entropy(volume, selem, num_threads=num_threads))
+
+    def test_3d_selem_dimension_mismatch(self):
+        volume = np.zeros((5, 5, 5), dtype=np.uint8)
+        with testing.raises(ValueError):
+            rank.median(volume, disk(1))
+
+    @parametrize('func, kwargs', [(rank.median, {}),
+                                  (rank.minimum, {}),
+                                  (rank.maximum, {}),
+                                  (rank.percentile, {'p0': 0.3}),
+                                  (rank.percentile, {'p0': 1.})])
+    @parametrize('dtype, max_value', [(np.uint8, 255), (np.uint16, 4095)])
+    def test_constant_time_method(self, func, kwargs, dtype, max_value):
+        np.random.seed(0)
+        image = (np.random.rand(53, 71) * max_value).astype(dtype)
+        mask = np.random.rand(*image.shape) > 0.2
+        for shape, shift_x, shift_y in [((1, 1), 0, 0), ((5, 7), 0, 0),
+                                        ((9, 4), 1, -1), ((60, 90), 0, 0)]:
+            selem = np.ones(shape, dtype=np.uint8)
+            expected = func(image, selem, mask=mask, shift_x=shift_x,
+                            shift_y=shift_y, **kwargs)
+            for num_threads in (1, 3):
+                result = func(image, selem, mask=mask, shift_x=shift_x,
+                              shift_y=shift_y, method='constant_time',
+                              num_threads=num_threads, **kwargs)
+                assert_equal(expected, result)
+
+    @parametrize('func, kwargs', [(rank.median, {}),
+                                  (rank.minimum, {}),
+                                  (rank.maximum, {}),
+                                  (rank.percentile, {'p0': 0.3}),
+                                  (rank.percentile, {'p0': 1.})])
+    @parametrize('dtype, max_value', [(np.uint8, 255), (np.uint16, 4095)])
+    def test_constant_time_method_footprint(self, func, kwargs, dtype,
+                                            max_value):
+        np.random.seed(0)
+        image = (np.random.rand(53, 71) * max_value).astype(dtype)
+        mask = np.random.rand(*image.shape) > 0.2
+        ring = disk(4)
+        ring[3:6, 3:6] = 0
+        for selem, shift_x, shift_y in [(disk(1), 0, 0), (disk(5), 1, -1),
+                                        (ring, 0, 0), (disk(40), 0, 0)]:
+            expected = func(image, selem, mask=mask, shift_x=shift_x,
+                            shift_y=shift_y, **kwargs)
+            for num_threads in (1, 3):
+                result = func(image, selem, mask=mask, shift_x=shift_x,
+                              shift_y=shift_y, method='constant_time',
+                              num_threads=num_threads, **kwargs)
+                assert_equal(expected, result)
+
+    def test_constant_time_method_invalid(self):
+        image = np.zeros((10, 10), dtype=np.uint8)
+        with testing.raises(ValueError):
+            rank.median(image, disk(2), method='unknown')
+        with testing.raises(ValueError):
+            rank.median(np.zeros((4, 4, 4), dtype=np.uint8),
+                        morphology.cube(3), method='constant_time')
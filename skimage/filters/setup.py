@@ -17,6 +17,7 @@ def configuration(parent_package='', top_path=None):
             'rank/generic_cy.pyx',
             'rank/percentile_cy.pyx',
             'rank/bilateral_cy.pyx',
+            'rank/ctmf_cy.pyx',
             '_multiotsu.pyx'], working_path=base_path)
 
     config.add_extension('rank.core_cy', sources=['rank/core_cy.c'],
@@ -31,6 +32,9 @@ def configuration(parent_package='', top_path=None):
     config.add_extension(
         'rank.bilateral_cy', sources=['rank/bilateral_cy.c'],
         include_dirs=[get_numpy_include_dirs()])
+    config.add_extension(
+        'rank.ctmf_cy', sources=['rank/ctmf_cy.c'],
+        include_dirs=[get_numpy_include_dirs()])
 
     return config
 
@@ -1,11 +1,15 @@
 from math import sqrt, atan2, pi as PI
+import itertools
+import sys
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 from scipy import ndimage as ndi
 
 from ._label import label
 from . import _moments
 
-from functools import wraps
+from functools import partial, wraps
 
 
 __all__ = ['regionprops', 'perimeter']
@@ -111,16 +115,94 @@ COL_DTYPES = {
 PROP_VALS = set(PROPS.values())
 
 
+def _check_label_image(label_image):
+    if label_image.ndim not in (2, 3):
+        raise TypeError('Only 2-D and 3-D images supported.')
+
+    if not np.issubdtype(label_image.dtype, np.integer):
+        raise TypeError('Label image must be of integer type.')
+
+
+def _nbytes(value):
+    """Size in bytes of a cached property value.
+
+    Array buffers count for their `nbytes`, and the items of tuples and lists,
+    such as the ``coords`` and ``slice`` properties or the arrays of
+    ``moments_hu``, are counted along with their container.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class _PropertyCache:
+    """Property values cached for the regions of a label image.
+
+    Values are keyed by ``(label, property_name)`` and shared by all the
+    regions, so that the least recently used values of any region can be
+    evicted once their total size exceeds `max_bytes`.
+
+    Parameters
+    ----------
+    max_bytes : int, optional
+        Maximum total size of the cached values, in bytes. Default is no limit.
+    scalar_only : bool, optional
+        Whether to skip caching the properties whose size depends on the
+        region, such as ``image`` or ``filled_image``.
+    """
+
+    def __init__(self, max_bytes=None, scalar_only=False):
+        self.max_bytes = max_bytes
+        self.scalar_only = scalar_only
+        self.nbytes = 0
+        self._values = OrderedDict()
+
+    def __len__(self):
+        return len(self._values)
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def __getitem__(self, key):
+        value, _ = self._values[key]
+        self._values.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        if self.scalar_only and key[1] in OBJECT_COLUMNS:
+            return
+        nbytes = _nbytes(value)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return
+
+        if key in self._values:
+            self.nbytes -= self._values.pop(key)[1]
+        self._values[key] = (value, nbytes)
+        self.nbytes += nbytes
+
+        if self.max_bytes is not None:
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_nbytes) = self._values.popitem(last=False)
+                self.nbytes -= evicted_nbytes
+
+
 def _cached(f):
     @wraps(f)
     def wrapper(obj):
-        cache = obj._cache
         prop = f.__name__
 
-        if not ((prop in cache) and obj._cache_active):
-            cache[prop] = f(obj)
+        if not obj._cache_active:
+            return f(obj)
 
-        return cache[prop]
+        key = (obj._cache_key, prop)
+        try:
+            return obj._cache[key]
+        except KeyError:
+            value = f(obj)
+            obj._cache[key] = value
+            return value
 
     return wrapper
 
@@ -140,8 +222,11 @@ class RegionProperties:
     on the available region properties.
     """
 
+    __slots__ = ('label', 'slice', '_slice', '_label_image',
+                 '_intensity_image', '_cache_active', '_cache', '_ndim')
+
     def __init__(self, slice, label, label_image, intensity_image,
-                 cache_active):
+                 cache_active, cache=None):
 
         if intensity_image is not None:
             if not intensity_image.shape == label_image.shape:
@@ -155,10 +240,16 @@ class RegionProperties:
         self._label_image = label_image
         self._intensity_image = intensity_image
 
-        self._cache_active = cache_active
-        self._cache = {}
+        if cache is None:
+            cache = _PropertyCache(scalar_only=(cache_active == 'scalar'))
+        self._cache_active = bool(cache_active)
+        self._cache = cache
         self._ndim = label_image.ndim
 
+    @property
+    def _cache_key(self):
+        return self.label
+
     @_cached
     def area(self):
         return np.sum(self.image)
@@ -378,6 +469,457 @@ class RegionProperties:
 _RegionProperties = RegionProperties
 
 
+# Properties that `_RegionPropertiesTable` computes for all regions at once
+BATCH_PROPS = {
+    'area', 'bbox', 'bbox_area', 'centroid', 'eccentricity',
+    'equivalent_diameter', 'extent', 'inertia_tensor',
+    'inertia_tensor_eigvals', 'label', 'local_centroid', 'major_axis_length',
+    'max_intensity', 'mean_intensity', 'min_intensity', 'minor_axis_length',
+    'moments', 'moments_central', 'moments_hu', 'moments_normalized',
+    'orientation', 'weighted_centroid', 'weighted_local_centroid',
+    'weighted_moments', 'weighted_moments_central', 'weighted_moments_hu',
+    'weighted_moments_normalized'
+}
+
+BATCH_PROPS_2D = {
+    'eccentricity', 'moments_hu', 'orientation', 'weighted_moments_hu'
+}
+
+BATCH_PROPS_INTENSITY = {
+    'max_intensity', 'mean_intensity', 'min_intensity', 'weighted_centroid',
+    'weighted_local_centroid', 'weighted_moments', 'weighted_moments_central',
+    'weighted_moments_hu', 'weighted_moments_normalized'
+}
+
+
+def _batch_moments(coords, index, n_regions, weights=None, center=None,
+                   order=3):
+    """Raw or central moments of every region.
+
+    Parameters
+    ----------
+    coords : tuple of (K,) arrays
+        Coordinates of the K labeled pixels, one array per dimension.
+    index : (K,) array of int
+        Index of the region of each pixel.
+    n_regions : int
+        Number of regions.
+    weights : (K,) array, optional
+        Weight of each pixel. Default is one for all pixels.
+    center : (n_regions, D) array, optional
+        Center of each region, for central moments.
+    order : int, optional
+        Maximum order of moments. Default is 3.
+
+    Returns
+    -------
+    M : (n_regions, ``order + 1``, ``order + 1``, ...) array
+        Moments of each region.
+    """
+    ndim = len(coords)
+    powers = []
+    for dim, coord in enumerate(coords):
+        delta = coord.astype(np.double)
+        if center is not None:
+            delta -= center[index, dim]
+        powers.append(delta[:, np.newaxis] ** np.arange(order + 1))
+
+    M = np.zeros((n_regions,) + (order + 1,) * ndim)
+    for exponents in itertools.product(range(order + 1), repeat=ndim):
+        if weights is None:
+            term = np.ones(len(index))
+        else:
+            term = weights.copy()
+        for dim, k in enumerate(exponents):
+            if k:
+                term *= powers[dim][:, k]
+        M[(slice(None),) + exponents] = np.bincount(index, weights=term,
+                                                    minlength=n_regions)
+    return M
+
+
+def _batch_centroid(M):
+    """Centroid of every region from their raw moments."""
+    ndim = M.ndim - 1
+    first = [M[(slice(None),) + tuple(row)]
+             for row in np.eye(ndim, dtype=int)]
+    return np.stack(first, axis=1) / M[(slice(None),) + (0,) * ndim + (None,)]
+
+
+def _batch_moments_normalized(mu, order=3):
+    """Normalized moments of every region from their central moments."""
+    ndim = mu.ndim - 1
+    nu = np.zeros_like(mu)
+    mu0 = mu[(slice(None),) + (0,) * ndim]
+    for powers in itertools.product(range(order + 1), repeat=ndim):
+        if sum(powers) < 2:
+            nu[(slice(None),) + powers] = np.nan
+        else:
+            nu[(slice(None),) + powers] = (mu[(slice(None),) + powers] /
+                                           (mu0 ** (sum(powers) / ndim + 1)))
+    return nu
+
+
+def _batch_moments_hu(nu):
+    """Hu moments of every region from their normalized moments (2D)."""
+    t0 = nu[:, 3, 0] + nu[:, 1, 2]
+    t1 = nu[:, 2, 1] + nu[:, 0, 3]
+    q0 = t0 * t0
+    q1 = t1 * t1
+    n4 = 4 * nu[:, 1, 1]
+    s = nu[:, 2, 0] + nu[:, 0, 2]
+    d = nu[:, 2, 0] - nu[:, 0, 2]
+    hu = np.zeros((nu.shape[0], 7))
+    hu[:, 0] = s
+    hu[:, 1] = d * d + n4 * nu[:, 1, 1]
+    hu[:, 3] = q0 + q1
+    hu[:, 5] = d * (q0 - q1) + n4 * t0 * t1
+    t0 = t0 * (q0 - 3 * q1)
+    t1 = t1 * (3 * q0 - q1)
+    q0 = nu[:, 3, 0] - 3 * nu[:, 1, 2]
+    q1 = 3 * nu[:, 2, 1] - nu[:, 0, 3]
+    hu[:, 2] = q0 * q0 + q1 * q1
+    hu[:, 4] = q0 * t0 + q1 * t1
+    hu[:, 6] = q1 * t0 - q0 * t1
+    return hu
+
+
+def _block_slices(shape, chunks=None):
+    """Slices of the blocks of an array, in C order.
+
+    Parameters
+    ----------
+    shape : tuple of int
+        Shape of the array.
+    chunks : int, tuple or None, optional
+        Block shape, either as a single int, as one int per dimension, or as
+        the sizes of all the blocks along each dimension like in
+        ``dask.array.Array.chunks``. If None, the array is a single block.
+
+    Returns
+    -------
+    slices : list of tuple of slice
+        Slices of the blocks.
+    """
+    if chunks is None:
+        return [tuple(slice(0, size) for size in shape)]
+    if np.isscalar(chunks):
+        chunks = (chunks,) * len(shape)
+
+    bounds = []
+    for size, chunk in zip(shape, chunks):
+        if np.isscalar(chunk):
+            edges = list(range(0, size, chunk)) + [size]
+        else:
+            edges = np.concatenate([[0], np.cumsum(chunk)])
+        bounds.append([slice(start, stop)
+                       for start, stop in zip(edges[:-1], edges[1:])
+                       if stop > start])
+    return list(itertools.product(*bounds))
+
+
+class _RegionPropertiesTable:
+    """Properties of all the regions of a label image, computed at once.
+
+    Each property is an array whose first axis runs over the regions, in
+    increasing label order, and whose remaining axes have the shape of the
+    corresponding `RegionProperties` attribute. Pixel sums are accumulated for
+    all regions in a single pass over the labeled pixels with
+    ``np.bincount``, instead of looping over the regions.
+
+    The label and intensity images are read block by block, so that they may
+    be memory maps or dask arrays larger than the memory. The partial sums,
+    extrema and bounding boxes of the blocks are merged for regions that span
+    several blocks, in block order, so that the result does not depend on the
+    number of workers.
+    """
+
+    def __init__(self, label_image, intensity_image=None, chunks=None,
+                 num_workers=1):
+
+        _check_label_image(label_image)
+        if intensity_image is not None:
+            if not intensity_image.shape == label_image.shape:
+                raise ValueError('Label and intensity image must have the'
+                                 ' same shape.')
+
+        self._label_image = label_image
+        self._intensity_image = intensity_image
+        self._ndim = label_image.ndim
+
+        self._cache_active = True
+        self._cache = _PropertyCache()
+        self._cache_key = None
+
+        if chunks is None:
+            chunks = getattr(label_image, 'chunks', None)
+        self._blocks = _block_slices(label_image.shape, chunks)
+        self._num_workers = num_workers
+
+        # bounding boxes of all the labels, merged over the blocks
+        starts = np.zeros((0, self._ndim), dtype=np.intp)
+        stops = np.zeros((0, self._ndim), dtype=np.intp)
+        for labels, block_starts, block_stops in self._map(self._block_bbox):
+            if len(labels) and labels[-1] >= len(starts):
+                new_size = labels[-1] + 1
+                starts = np.concatenate(
+                    [starts, np.full((new_size - len(starts), self._ndim),
+                                     np.iinfo(np.intp).max)])
+                stops = np.concatenate(
+                    [stops, np.full((new_size - len(stops), self._ndim), -1)])
+            starts[labels] = np.minimum(starts[labels], block_starts)
+            stops[labels] = np.maximum(stops[labels], block_stops)
+
+        self._labels = np.flatnonzero(stops[:, 0] >= 0)
+        self._labels = self._labels[self._labels > 0]
+        self._n_regions = len(self._labels)
+        self._lookup = np.zeros(len(starts), dtype=np.intp)
+        self._lookup[self._labels] = np.arange(self._n_regions)
+        self._bbox = np.concatenate([starts[self._labels],
+                                     stops[self._labels]], axis=1)
+
+    def _map(self, func):
+        """Apply `func` to the slices of the blocks, in block order."""
+        if self._num_workers == 1 or len(self._blocks) == 1:
+            for block in self._blocks:
+                yield func(block)
+        else:
+            with ThreadPoolExecutor(max_workers=self._num_workers) as executor:
+                for result in executor.map(func, self._blocks):
+                    yield result
+
+    def _block_bbox(self, block):
+        """Labels of a block and their bounding boxes, in image coordinates.
+
+        Only the labels present in the block are visited, so that the cost
+        does not grow with the largest label of the image.
+        """
+        label_block = np.asarray(self._label_image[block])
+        pixels = np.flatnonzero(label_block > 0)
+        labels, index = np.unique(label_block.ravel()[pixels],
+                                  return_inverse=True)
+        coords = np.unravel_index(pixels, label_block.shape)
+        starts = np.full((len(labels), self._ndim), np.iinfo(np.intp).max,
+                         dtype=np.intp)
+        stops = np.full((len(labels), self._ndim), -1, dtype=np.intp)
+        for dim, (coord, sl) in enumerate(zip(coords, block)):
+            np.minimum.at(starts[:, dim], index, coord + sl.start)
+            np.maximum.at(stops[:, dim], index, coord + sl.start + 1)
+        return labels.astype(np.intp), starts, stops
+
+    def _block_pixels(self, block):
+        """Regions, region index and local coordinates of labeled pixels."""
+        label_block = np.asarray(self._label_image[block])
+        pixels = np.flatnonzero(label_block > 0)
+        index = self._lookup[label_block.ravel()[pixels]]
+        coords = np.unravel_index(pixels, label_block.shape)
+        local_coords = tuple(coord + sl.start - self._bbox[index, dim]
+                             for dim, (coord, sl)
+                             in enumerate(zip(coords, block)))
+        regions, index = np.unique(index, return_inverse=True)
+        return regions, index, local_coords, pixels
+
+    def _block_intensity(self, block, pixels):
+        if self._intensity_image is None:
+            raise AttributeError('No intensity image specified.')
+        intensity_block = np.asarray(self._intensity_image[block])
+        return intensity_block.ravel()[pixels]
+
+    def _block_moments(self, block, weighted=False, center=None, order=3):
+        regions, index, local_coords, pixels = self._block_pixels(block)
+        weights = None
+        if weighted:
+            weights = self._block_intensity(block, pixels).astype(np.double)
+        if center is not None:
+            center = center[regions]
+        return regions, _batch_moments(local_coords, index, len(regions),
+                                       weights=weights, center=center,
+                                       order=order)
+
+    def _block_extrema(self, block):
+        regions, index, _, pixels = self._block_pixels(block)
+        values = self._block_intensity(block, pixels)
+        order = np.lexsort((values, index))
+        first = np.searchsorted(index[order], np.arange(len(regions)))
+        last = np.append(first[1:], len(order)) - 1
+        return regions, values[order[first]], values[order[last]]
+
+    def _moments(self, weighted=False, center=None, order=3):
+        """Merge the moments of the blocks."""
+        M = np.zeros((self._n_regions,) + (order + 1,) * self._ndim)
+        func = partial(self._block_moments, weighted=weighted,
+                       center=center, order=order)
+        for regions, block_M in self._map(func):
+            M[regions] += block_M
+        return M
+
+    @property
+    @_cached
+    def _extrema(self):
+        """Merge the minimum and maximum intensities of the blocks."""
+        dtype = self._intensity_image.dtype
+        minimum = np.zeros(self._n_regions, dtype=dtype)
+        maximum = np.zeros(self._n_regions, dtype=dtype)
+        seen = np.zeros(self._n_regions, dtype=bool)
+        for regions, block_min, block_max in self._map(self._block_extrema):
+            first = ~seen[regions]
+            minimum[regions] = np.where(
+                first, block_min, np.minimum(minimum[regions], block_min))
+            maximum[regions] = np.where(
+                first, block_max, np.maximum(maximum[regions], block_max))
+            seen[regions] = True
+        return minimum, maximum
+
+    @property
+    def label(self):
+        return self._labels
+
+    @property
+    @_cached
+    def area(self):
+        return self._moments(order=0).ravel().astype(np.intp)
+
+    @property
+    def bbox(self):
+        return self._bbox
+
+    @property
+    def bbox_area(self):
+        bbox = self.bbox
+        return np.prod(bbox[:, self._ndim:] - bbox[:, :self._ndim], axis=1)
+
+    @property
+    def centroid(self):
+        return self.local_centroid + self.bbox[:, :self._ndim]
+
+    @property
+    def eccentricity(self):
+        l1 = self.inertia_tensor_eigvals[:, 0]
+        l2 = self.inertia_tensor_eigvals[:, -1]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(l1 == 0, 0, np.sqrt(1 - l2 / l1))
+
+    @property
+    def equivalent_diameter(self):
+        if self._ndim == 2:
+            return np.sqrt(4 * self.area / PI)
+        elif self._ndim == 3:
+            return (6 * self.area / PI) ** (1. / 3)
+
+    @property
+    def extent(self):
+        return self.area / self.bbox_area
+
+    @property
+    @_cached
+    def inertia_tensor(self):
+        mu = self.moments_central
+        ndim = self._ndim
+        mu0 = mu[(slice(None),) + (0,) * ndim]
+        result = np.zeros((self._n_regions, ndim, ndim))
+
+        # see `skimage.measure.inertia_tensor`
+        corners2 = np.stack([mu[(slice(None),) + tuple(2 * row)]
+                             for row in np.eye(ndim, dtype=int)], axis=1)
+        diagonal = (np.sum(corners2, axis=1)[:, np.newaxis] - corners2)
+        result[:, range(ndim), range(ndim)] = diagonal / mu0[:, np.newaxis]
+
+        for dims in itertools.combinations(range(ndim), 2):
+            mu_index = np.zeros(ndim, dtype=int)
+            mu_index[list(dims)] = 1
+            value = -mu[(slice(None),) + tuple(mu_index)] / mu0
+            result[:, dims[0], dims[1]] = value
+            result[:, dims[1], dims[0]] = value
+        return result
+
+    @property
+    @_cached
+    def inertia_tensor_eigvals(self):
+        return np.linalg.eigvalsh(self.inertia_tensor)[:, ::-1]
+
+    @property
+    def local_centroid(self):
+        M = self.moments
+        return _batch_centroid(M)
+
+    @property
+    def major_axis_length(self):
+        return 4 * np.sqrt(self.inertia_tensor_eigvals[:, 0])
+
+    @property
+    def max_intensity(self):
+        return self._extrema[1]
+
+    @property
+    def mean_intensity(self):
+        return self._moments(weighted=True, order=0).ravel() / self.area
+
+    @property
+    def min_intensity(self):
+        return self._extrema[0]
+
+    @property
+    def minor_axis_length(self):
+        return 4 * np.sqrt(self.inertia_tensor_eigvals[:, -1])
+
+    @property
+    @_cached
+    def moments(self):
+        return self._moments()
+
+    @property
+    @_cached
+    def moments_central(self):
+        return self._moments(center=self.local_centroid)
+
+    @property
+    def moments_hu(self):
+        return _batch_moments_hu(self.moments_normalized)
+
+    @property
+    @_cached
+    def moments_normalized(self):
+        return _batch_moments_normalized(self.moments_central)
+
+    @property
+    def orientation(self):
+        T = self.inertia_tensor
+        a, b, c = T[:, 0, 0], T[:, 0, 1], T[:, 1, 1]
+        return np.where(a - c == 0,
+                        np.where(b < 0, -PI / 4., PI / 4.),
+                        0.5 * np.arctan2(-2 * b, c - a))
+
+    @property
+    def weighted_centroid(self):
+        return self.weighted_local_centroid + self.bbox[:, :self._ndim]
+
+    @property
+    @_cached
+    def weighted_local_centroid(self):
+        M = self.weighted_moments
+        return _batch_centroid(M)
+
+    @property
+    @_cached
+    def weighted_moments(self):
+        return self._moments(weighted=True)
+
+    @property
+    @_cached
+    def weighted_moments_central(self):
+        return self._moments(weighted=True,
+                             center=self.weighted_local_centroid)
+
+    @property
+    def weighted_moments_hu(self):
+        return _batch_moments_hu(self.weighted_moments_normalized)
+
+    @property
+    @_cached
+    def weighted_moments_normalized(self):
+        return _batch_moments_normalized(self.weighted_moments_central)
+
+
 def _props_to_dict(regions, properties=('label', 'bbox'), separator='-'):
     """Convert image region properties list into a column dictionary.
 
@@ -488,8 +1030,42 @@ def _props_to_dict(regions, properties=('label', 'bbox'), separator='-'):
     return out
 
 
+def _batch_unsupported(properties, ndim, has_intensity):
+    """Properties that `_RegionPropertiesTable` cannot compute.
+
+    Properties it does not implement, such as ``perimeter`` or
+    ``convex_area``, as well as properties that would raise an error, are left
+    to `RegionProperties`.
+    """
+    unsupported = set(properties) - BATCH_PROPS
+    if ndim != 2:
+        unsupported |= set(properties) & BATCH_PROPS_2D
+    if not has_intensity:
+        unsupported |= set(properties) & BATCH_PROPS_INTENSITY
+    return sorted(unsupported)
+
+
+def _table_to_dict(table, properties=('label', 'bbox'), separator='-'):
+    """Convert a `_RegionPropertiesTable` into a column dictionary.
+
+    The columns are those of :func:`_props_to_dict`.
+    """
+    out = {}
+    for prop in properties:
+        dtype = COL_DTYPES[prop]
+        values = getattr(table, prop)
+        if values.ndim == 1:
+            out[prop] = values.astype(dtype)
+        else:
+            for ind in np.ndindex(values.shape[1:]):
+                modified_prop = separator.join(map(str, (prop,) + ind))
+                out[modified_prop] = values[(slice(None),) + ind].astype(dtype)
+    return out
+
+
 def regionprops_table(label_image, intensity_image=None, cache=True,
-                      properties=('label', 'bbox'), separator='-'):
+                      properties=('label', 'bbox'), separator='-',
+                      chunks=None, num_workers=1):
     """Find image properties and convert them into a dictionary
 
     Parameters
@@ -519,6 +1095,17 @@ def regionprops_table(label_image, intensity_image=None, cache=True,
         Object columns are those that cannot be split in this way because the
         number of columns would change depending on the object. For example,
         ``image`` and ``coords``.
+    chunks : int or tuple, optional
+        Shape of the blocks in which the label and intensity images are read,
+        either as a single int or as one int per dimension. By default, the
+        chunks of the label image are used if it has a ``chunks`` attribute,
+        like dask arrays, and the image is read at once otherwise. Reading by
+        blocks makes it possible to measure memory maps or dask arrays that do
+        not fit in memory; regions spanning several blocks are measured
+        exactly. Only the properties listed in the notes below are available
+        when reading by blocks.
+    num_workers : int, optional
+        Number of threads reading and measuring the blocks in parallel.
 
     Returns
     -------
@@ -548,6 +1135,21 @@ def regionprops_table(label_image, intensity_image=None, cache=True,
     size), an object array will be used, with the corresponding property name
     as the key.
 
+    When all the requested properties are among the moment-based and
+    intensity properties (for instance "area", "bbox", "centroid", "moments",
+    "inertia_tensor", "orientation" or "mean_intensity"), they are computed for
+    all regions at once with vectorized accumulations over the labeled pixels,
+    which is much faster than measuring the regions one by one for images with
+    many small regions. Requesting any other property, such as "perimeter" or
+    "convex_area", measures every region individually, which requires the
+    whole label image in memory. The properties computed at once are:
+    "area", "bbox", "bbox_area", "centroid", "eccentricity",
+    "equivalent_diameter", "extent", "inertia_tensor",
+    "inertia_tensor_eigvals", "label", "local_centroid", "major_axis_length",
+    "max_intensity", "mean_intensity", "min_intensity", "minor_axis_length",
+    "moments", "moments_central", "moments_hu", "moments_normalized",
+    "orientation" and their "weighted_" counterparts.
+
     Examples
     --------
     >>> from skimage import data, util, measure
@@ -578,12 +1180,26 @@ def regionprops_table(label_image, intensity_image=None, cache=True,
     [5 rows x 7 columns]
 
     """
+    unsupported = _batch_unsupported(properties, label_image.ndim,
+                                     intensity_image is not None)
+    if not unsupported:
+        table = _RegionPropertiesTable(label_image, intensity_image,
+                                       chunks=chunks, num_workers=num_workers)
+        return _table_to_dict(table, properties=properties,
+                              separator=separator)
+
+    if (chunks is not None or num_workers != 1 or
+            not isinstance(label_image, np.ndarray)):
+        raise ValueError('Properties {} cannot be measured by blocks.'
+                         .format(unsupported))
+
     regions = regionprops(label_image, intensity_image=intensity_image,
                           cache=cache)
     return _props_to_dict(regions, properties=properties, separator=separator)
 
 
-def regionprops(label_image, intensity_image=None, cache=True):
+def regionprops(label_image, intensity_image=None, cache=True,
+                cache_size=None):
     """Measure properties of labeled image regions.
 
     Parameters
@@ -600,10 +1216,17 @@ def regionprops(label_image, intensity_image=None, cache=True):
     intensity_image : (N, M) ndarray, optional
         Intensity (i.e., input) image with same size as labeled image.
         Default is None.
-    cache : bool, optional
+    cache : bool or 'scalar', optional
         Determine whether to cache calculated properties. The computation is
         much faster for cached properties, whereas the memory consumption
-        increases.
+        increases. With 'scalar', only the properties whose size does not
+        depend on the region, such as ``area``, ``centroid`` or ``moments``,
+        are cached, while ``image``, ``intensity_image``, ``convex_image`` and
+        ``filled_image`` are recomputed when needed.
+    cache_size : int, optional
+        Maximum size in bytes of the property values cached for all the
+        regions together. Beyond it, the least recently used values are
+        evicted from the cache. By default, the cache size is not bounded.
 
     Returns
     -------
@@ -777,13 +1400,11 @@ def regionprops(label_image, intensity_image=None, cache=True):
 
     """
 
-    if label_image.ndim not in (2, 3):
-        raise TypeError('Only 2-D and 3-D images supported.')
-
-    if not np.issubdtype(label_image.dtype, np.integer):
-        raise TypeError('Label image must be of integer type.')
+    _check_label_image(label_image)
 
     regions = []
+    shared_cache = _PropertyCache(max_bytes=cache_size,
+                                  scalar_only=(cache == 'scalar'))
 
     objects = ndi.find_objects(label_image)
     for i, sl in enumerate(objects):
@@ -793,7 +1414,7 @@ def regionprops(label_image, intensity_image=None, cache=True):
         label = i + 1
 
         props = RegionProperties(sl, label, label_image, intensity_image,
-                                 cache)
+                                 cache, cache=shared_cache)
         regions.append(props)
 
     return regions
@@ -881,7 +1502,8 @@ def _install_properties_docs():
     prop_doc = _parse_docs()
 
     for p in [member for member in dir(RegionProperties)
-              if not member.startswith('_')]:
+              if not member.startswith('_') and
+              member not in RegionProperties.__slots__]:
         getattr(RegionProperties, p).__doc__ = prop_doc[p]
         setattr(RegionProperties, p, property(getattr(RegionProperties, p)))
 
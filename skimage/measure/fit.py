@@ -1,7 +1,8 @@
 import math
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 from numpy.linalg import inv, pinv
-from scipy import optimize
 from .._shared.utils import check_random_state
 
 
@@ -130,6 +131,70 @@ class LineModelND(BaseModel):
               ((data - origin) @ direction)[..., np.newaxis] * direction
         return _norm_along_axis(res, axis=1)
 
+    @classmethod
+    def estimate_batch(cls, data):
+        """Estimate a line model from each of a batch of point sets.
+
+        Vectorized version of `estimate`, e.g. to score many hypotheses at
+        once in `ransac`.
+
+        Parameters
+        ----------
+        data : (B, N, dim) array
+            `B` sets of N points in a space of dimensionality dim >= 2.
+
+        Returns
+        -------
+        params : (B, 2, dim) array
+            Origin and direction of the line of each set.
+        success : (B, ) array of bool
+            True for the sets whose estimation succeeded.
+        """
+        if data.ndim != 3 or data.shape[2] < 2:
+            raise ValueError('Input data must be at least 2D.')
+
+        origin = data.mean(axis=1)
+        data = data - origin[:, np.newaxis]
+
+        if data.shape[1] == 2:  # well determined
+            direction = data[:, 1] - data[:, 0]
+            norm = np.sqrt(np.sum(direction ** 2, axis=1))
+            direction[norm != 0] /= norm[norm != 0, np.newaxis]
+        elif data.shape[1] > 2:  # over-determined
+            _, _, v = np.linalg.svd(data, full_matrices=False)
+            direction = v[:, 0]
+        else:  # under-determined
+            raise ValueError('At least 2 input points needed.')
+
+        params = np.stack([origin, direction], axis=1)
+        return params, np.ones(len(params), dtype=bool)
+
+    @classmethod
+    def residuals_batch(cls, params, data):
+        """Residuals of data to each of a batch of line models.
+
+        Vectorized version of `residuals`.
+
+        Parameters
+        ----------
+        params : (B, 2, dim) array
+            Origin and direction of each line.
+        data : (N, dim) array
+            N points in a space of dimension dim.
+
+        Returns
+        -------
+        residuals : (B, N) array
+            Residual of each data point to each line.
+        """
+        _check_data_atleast_2D(data)
+        origin = params[:, 0, np.newaxis]
+        direction = params[:, 1, np.newaxis]
+        data = data - origin
+        res = data - np.sum(data * direction, axis=2)[..., np.newaxis] * \
+            direction
+        return np.sqrt(np.sum(res ** 2, axis=2))
+
     def predict(self, x, axis=0, params=None):
         """Predict intersection of the estimated line model with a hyperplane
         orthogonal to a given axis.
@@ -320,6 +385,81 @@ class CircleModel(BaseModel):
 
         return r - np.sqrt((x - xc)**2 + (y - yc)**2)
 
+    @classmethod
+    def estimate_batch(cls, data):
+        """Estimate a circle model from each of a batch of point sets.
+
+        Vectorized version of `estimate`, e.g. to score many hypotheses at
+        once in `ransac`.
+
+        Parameters
+        ----------
+        data : (B, N, 2) array
+            `B` sets of N points with ``(x, y)`` coordinates, respectively.
+
+        Returns
+        -------
+        params : (B, 3) array
+            Parameters `xc`, `yc`, `r` of the circle of each set.
+        success : (B, ) array of bool
+            True for the sets whose estimation succeeded.
+
+        """
+        if data.ndim != 3 or data.shape[2] != 2:
+            raise ValueError('Input data must have shape (B, N, 2).')
+
+        x = data[:, :, 0]
+        y = data[:, :, 1]
+
+        x2y2 = (x ** 2 + y ** 2)
+        sum_x = np.sum(x, axis=1)
+        sum_y = np.sum(y, axis=1)
+        sum_xy = np.sum(x * y, axis=1)
+        m1 = np.stack([np.stack([np.sum(x ** 2, axis=1), sum_xy, sum_x], -1),
+                       np.stack([sum_xy, np.sum(y ** 2, axis=1), sum_y], -1),
+                       np.stack([sum_x, sum_y,
+                                 np.full(len(x), float(x.shape[1]))], -1)],
+                      axis=1)
+        m2 = np.stack([np.sum(x * x2y2, axis=1),
+                       np.sum(y * x2y2, axis=1),
+                       np.sum(x2y2, axis=1)], axis=1)[..., np.newaxis]
+        a, b, c = np.moveaxis((np.linalg.pinv(m1) @ m2)[..., 0], -1, 0)
+        xc = a / 2
+        yc = b / 2
+        with np.errstate(invalid='ignore'):
+            r = np.sqrt(4 * c + a ** 2 + b ** 2) / 2
+
+        params = np.stack([xc, yc, r], axis=1)
+        return params, np.ones(len(params), dtype=bool)
+
+    @classmethod
+    def residuals_batch(cls, params, data):
+        """Residuals of data to each of a batch of circle models.
+
+        Vectorized version of `residuals`.
+
+        Parameters
+        ----------
+        params : (B, 3) array
+            Parameters `xc`, `yc`, `r` of each circle.
+        data : (N, 2) array
+            N points with ``(x, y)`` coordinates, respectively.
+
+        Returns
+        -------
+        residuals : (B, N) array
+            Residual of each data point to each circle.
+
+        """
+        _check_data_dim(data, dim=2)
+
+        xc, yc, r = params[:, 0:1], params[:, 1:2], params[:, 2:3]
+
+        x = data[:, 0]
+        y = data[:, 1]
+
+        return r - np.sqrt((x - xc)**2 + (y - yc)**2)
+
     def predict_xy(self, t, params=None):
         """Predict x- and y-coordinates using the estimated model.
 
@@ -347,6 +487,98 @@ class CircleModel(BaseModel):
         return np.concatenate((x[..., None], y[..., None]), axis=t.ndim)
 
 
+def _ellipse_distance(u, v, a, b):
+    """Shortest distance of points to an axis-aligned ellipse.
+
+    The ellipse is centered at the origin and has the semi-axes `a` and `b`
+    along the u- and v-axis. The closest point is found with the robust
+    bisection of [1]_, run for all points at once.
+
+    Parameters
+    ----------
+    u, v : (N, ) array
+        Coordinates of the points.
+    a, b : float
+        Semi-axes of the ellipse.
+
+    Returns
+    -------
+    distance : (N, ) array
+        Distance of each point to the ellipse.
+
+    References
+    ----------
+    .. [1] D. Eberly, "Distance from a Point to an Ellipse, an Ellipsoid, or
+           a Hyperellipsoid", Geometric Tools, 2013.
+
+    """
+    # by symmetry, work in the first quadrant with a >= b
+    u = np.abs(np.asarray(u, dtype=np.double))
+    v = np.abs(np.asarray(v, dtype=np.double))
+    a = abs(a)
+    b = abs(b)
+    if a < b:
+        u, v = v, u
+        a, b = b, a
+
+    if b == 0:
+        # the ellipse degenerates to the segment [-a, a] of the u-axis
+        return np.hypot(np.maximum(u - a, 0), v)
+
+    distance = np.empty(u.shape, dtype=np.double)
+
+    # points on the minor axis: the closest point is the covertex
+    on_minor = u == 0
+    distance[on_minor] = np.abs(v[on_minor] - b)
+
+    # points on the major axis: the closest point is the vertex unless the
+    # point lies close enough to the center
+    on_major = (v == 0) & ~on_minor
+    u0 = u[on_major]
+    distance[on_major] = np.abs(u0 - a)
+    inner = a * u0 < a ** 2 - b ** 2
+    if np.any(inner):
+        ratio = a * u0[inner] / (a ** 2 - b ** 2)
+        distance_inner = np.hypot(a * ratio - u0[inner],
+                                  b * np.sqrt(1 - ratio ** 2))
+        distance_major = distance[on_major]
+        distance_major[inner] = distance_inner
+        distance[on_major] = distance_major
+
+    # remaining points: the closest point is
+    # (r0 * u / (t + r0 - 1), v / t) with r0 = (a / b) ** 2, where t is the
+    # root of the decreasing function
+    # F(t) = (r0 * z0 / (t + r0 - 1)) ** 2 + (z1 / t) ** 2 - 1
+    # in [z1, max(1, |(r0 * z0, z1)|)]. Bisecting on t rather than on
+    # s = t - 1 keeps its relative precision for points close to the major
+    # axis, where t is tiny.
+    general = ~(on_minor | on_major)
+    u1 = u[general]
+    v1 = v[general]
+    z0 = u1 / a
+    z1 = v1 / b
+    r0 = (a / b) ** 2
+    r1 = r0 - 1
+    n0 = r0 * z0
+    g = z0 ** 2 + z1 ** 2 - 1
+    t0 = z1
+    t1 = np.where(g < 0, 1, np.hypot(n0, z1))
+    # bisect until the interval cannot shrink any further in double
+    # precision
+    max_iter = np.finfo(np.double).nmant - np.finfo(np.double).minexp + 1
+    for _ in range(max_iter):
+        t = 0.5 * (t0 + t1)
+        if np.all((t == t0) | (t == t1)):
+            break
+        f = (n0 / (t + r1)) ** 2 + (z1 / t) ** 2 - 1
+        t0 = np.where(f >= 0, t, t0)
+        t1 = np.where(f <= 0, t, t1)
+    t = np.where(g == 0, 1, 0.5 * (t0 + t1))
+    distance[general] = np.hypot(r0 * u1 / (t + r1) - u1, v1 / t - v1)
+
+    return distance
+
+
 class EllipseModel(BaseModel):
     """Total least squares estimator for 2D ellipses.
 
@@ -506,43 +738,13 @@ class EllipseModel(BaseModel):
         ctheta = math.cos(theta)
         stheta = math.sin(theta)
 
-        x = data[:, 0]
-        y = data[:, 1]
+        # coordinates in the frame of the ellipse axes
+        x = data[:, 0] - xc
+        y = data[:, 1] - yc
+        u = ctheta * x + stheta * y
+        v = -stheta * x + ctheta * y
 
-        N = data.shape[0]
-
-        def fun(t, xi, yi):
-            ct = math.cos(t)
-            st = math.sin(t)
-            xt = xc + a * ctheta * ct - b * stheta * st
-            yt = yc + a * stheta * ct + b * ctheta * st
-            return (xi - xt) ** 2 + (yi - yt) ** 2
-
-        # def Dfun(t, xi, yi):
-        #     ct = math.cos(t)
-        #     st = math.sin(t)
-        #     xt = xc + a * ctheta * ct - b * stheta * st
-        #     yt = yc + a * stheta * ct + b * ctheta * st
-        #     dfx_t = - 2 * (xi - xt) * (- a * ctheta * st
-        #                                - b * stheta * ct)
-        #     dfy_t = - 2 * (yi - yt) * (- a * stheta * st
-        #                                + b * ctheta * ct)
-        #     return [dfx_t + dfy_t]
-
-        residuals = np.empty((N, ), dtype=np.double)
-
-        # initial guess for parameter t of closest point on ellipse
-        t0 = np.arctan2(y - yc, x - xc) - theta
-
-        # determine shortest distance to ellipse for each point
-        for i in range(N):
-            xi = x[i]
-            yi = y[i]
-            # faster without Dfun, because of the python overhead
-            t, _ = optimize.leastsq(fun, t0[i], args=(xi, yi))
-            residuals[i] = np.sqrt(fun(t, xi, yi))
-
-        return residuals
+        return _ellipse_distance(u, v, a, b)
 
     def predict_xy(self, t, params=None):
         """Predict x- and y-coordinates using the estimated model.
@@ -578,6 +780,10 @@ class EllipseModel(BaseModel):
         return np.concatenate((x[..., None], y[..., None]), axis=t.ndim)
 
 
+# trials run by each worker between two checks of the stop criteria
+_RANSAC_ROUND_TRIALS = 10
+
+
 def _dynamic_max_trials(n_inliers, n_samples, min_samples, probability):
     """Determine number trials such that at least one outlier-free subset is
     sampled for the given inlier/outlier ratio.
@@ -618,10 +824,266 @@ def _dynamic_max_trials(n_inliers, n_samples, min_samples, probability):
     return int(np.ceil(nom / denom))
 
 
+def _random_subsets(random_state, num_samples, min_samples, num_subsets):
+    """Draw `num_subsets` random subsets of `min_samples` distinct indices."""
+    idxs = random_state.randint(num_samples, size=(num_subsets, min_samples))
+    # draw again the few subsets with repeated indices
+    repeated = np.any(np.diff(np.sort(idxs, axis=1), axis=1) == 0, axis=1)
+    for i in np.flatnonzero(repeated):
+        idxs[i] = random_state.choice(num_samples, min_samples, replace=False)
+    return idxs
+
+
+def _preemptive_scoring(model_class, params, data, residual_threshold,
+                        block_size, random_state):
+    """Select the hypotheses with the most inliers by preemptive scoring.
+
+    The hypotheses are scored on successive blocks of `block_size` random
+    data points, and only the half with the most inliers so far is scored on
+    the next block, until a single hypothesis remains or all the data is
+    used.
+
+    Returns
+    -------
+    selected : array of int
+        Indices of the remaining hypotheses.
+    """
+    num_samples = data[0].shape[0]
+    order = random_state.permutation(num_samples)
+    selected = np.arange(len(params))
+    inlier_num = np.zeros(len(params), dtype=np.intp)
+    for start in range(0, num_samples, block_size):
+        if len(selected) <= 1:
+            break
+        block = order[start:start + block_size]
+        residuals = np.abs(model_class.residuals_batch(
+            params[selected], *[d[block] for d in data]))
+        inlier_num[selected] += np.sum(residuals < residual_threshold, axis=1)
+        best_first = np.argsort(-inlier_num[selected], kind='stable')
+        selected = selected[best_first[:max(1, len(selected) // 2)]]
+    return selected
+
+
+def _ransac_trials(data, model_class, min_samples, residual_threshold,
+                   is_data_valid, is_model_valid, max_trials, stop_sample_num,
+                   stop_residuals_sum, stop_probability, random_state,
+                   batch_size, preemptive_block):
+    """Run up to `max_trials` RANSAC trials, see `ransac`.
+
+    Returns
+    -------
+    best_model : object
+        Best model, None if no valid model was found.
+    best_inlier_num : int
+        Number of inliers of the best model.
+    best_inlier_residuals_sum : float
+        Sum of the squared residuals of the best model.
+    best_inliers : (N, ) array
+        Boolean mask of the inliers of the best model.
+    """
+    best_model = None
+    best_inlier_num = 0
+    best_inlier_residuals_sum = np.inf
+    best_inliers = None
+
+    # number of samples
+    num_samples = data[0].shape[0]
+
+    if batch_size is not None:
+        num_trials = 0
+        while num_trials < max_trials:
+            num_batch = min(batch_size, max_trials - num_trials)
+            num_trials += num_batch
+
+            # choose random sample sets
+            random_idxs = _random_subsets(random_state, num_samples,
+                                          min_samples, num_batch)
+            samples = [d[random_idxs] for d in data]
+
+            # check if random sample sets are valid
+            if is_data_valid is not None:
+                valid = [is_data_valid(*[sample[i] for sample in samples])
+                         for i in range(num_batch)]
+                samples = [sample[np.asarray(valid, dtype=bool)]
+                           for sample in samples]
+                if len(samples[0]) == 0:
+                    continue
+
+            # estimate models for current random sample sets
+            params, success = model_class.estimate_batch(*samples)
+
+            # check if estimated models are valid
+            if is_model_valid is not None:
+                for i in np.flatnonzero(success):
+                    sample_model = model_class()
+                    sample_model.params = params[i]
+                    success[i] = is_model_valid(
+                        sample_model, *[sample[i] for sample in samples])
+            params = params[success]
+            if len(params) == 0:
+                continue
+
+            if preemptive_block is not None:
+                params = params[_preemptive_scoring(
+                    model_class, params, data, residual_threshold,
+                    preemptive_block, random_state)]
+
+            batch_residuals = np.abs(model_class.residuals_batch(params,
+                                                                 *data))
+            # consensus sets / inliers
+            batch_inliers = batch_residuals < residual_threshold
+            batch_residuals_sum = np.sum(batch_residuals ** 2, axis=1)
+            batch_inlier_num = np.sum(batch_inliers, axis=1)
+
+            # most inliers, then least sum of residuals
+            best = np.lexsort((batch_residuals_sum, -batch_inlier_num))[0]
+            if (
+                batch_inlier_num[best] > best_inlier_num
+                or (batch_inlier_num[best] == best_inlier_num
+                    and batch_residuals_sum[best] < best_inlier_residuals_sum)
+            ):
+                best_model = model_class()
+                best_model.params = params[best]
+                best_inlier_num = batch_inlier_num[best]
+                best_inlier_residuals_sum = batch_residuals_sum[best]
+                best_inliers = batch_inliers[best]
+                if (
+                    best_inlier_num >= stop_sample_num
+                    or best_inlier_residuals_sum <= stop_residuals_sum
+                    or num_trials - 1
+                        >= _dynamic_max_trials(best_inlier_num, num_samples,
+                                               min_samples, stop_probability)
+                ):
+                    break
+
+    else:
+        for num_trials in range(max_trials):
+
+            # choose random sample set
+            samples = []
+            random_idxs = random_state.choice(num_samples, min_samples,
+                                              replace=False)
+            for d in data:
+                samples.append(d[random_idxs])
+
+            # check if random sample set is valid
+            if is_data_valid is not None and not is_data_valid(*samples):
+                continue
+
+            # estimate model for current random sample set
+            sample_model = model_class()
+
+            success = sample_model.estimate(*samples)
+
+            if success is not None:  # backwards compatibility
+                if not success:
+                    continue
+
+            # check if estimated model is valid
+            if is_model_valid is not None \
+                    and not is_model_valid(sample_model, *samples):
+                continue
+
+            sample_model_residuals = np.abs(sample_model.residuals(*data))
+            # consensus set / inliers
+            sample_model_inliers = sample_model_residuals < residual_threshold
+            sample_model_residuals_sum = np.sum(sample_model_residuals**2)
+
+            # choose as new best model if number of inliers is maximal
+            sample_inlier_num = np.sum(sample_model_inliers)
+            if (
+                # more inliers
+                sample_inlier_num > best_inlier_num
+                # same number of inliers but less "error" in terms of residuals
+                or (sample_inlier_num == best_inlier_num
+                    and sample_model_residuals_sum < best_inlier_residuals_sum)
+            ):
+                best_model = sample_model
+                best_inlier_num = sample_inlier_num
+                best_inlier_residuals_sum = sample_model_residuals_sum
+                best_inliers = sample_model_inliers
+                if (
+                    best_inlier_num >= stop_sample_num
+                    or best_inlier_residuals_sum <= stop_residuals_sum
+                    or num_trials
+                        >= _dynamic_max_trials(best_inlier_num, num_samples,
+                                               min_samples, stop_probability)
+                ):
+                    break
+
+    return (best_model, best_inlier_num, best_inlier_residuals_sum,
+            best_inliers)
+
+
+def _ransac_parallel(trials_args, max_trials, stop_sample_num,
+                     stop_residuals_sum, stop_probability, random_state,
+                     batch_size, preemptive_block, num_workers):
+    """Run RANSAC trials on several threads, see `ransac`.
+
+    Each worker draws its samples from its own random generator, seeded from
+    `random_state`, and runs the same number of trials per round. The best
+    models of the workers are merged in worker order after each round and the
+    stop criteria are checked on the merged model, so that the result only
+    depends on `random_state` and `num_workers`.
+    """
+    data = trials_args[0]
+    num_samples = data[0].shape[0]
+    min_samples = trials_args[2]
+    round_trials = batch_size or _RANSAC_ROUND_TRIALS
+
+    seeds = random_state.randint(np.iinfo(np.int32).max, size=num_workers)
+    worker_states = [np.random.RandomState(seed) for seed in seeds]
+
+    best_model = None
+    best_inlier_num = 0
+    best_inlier_residuals_sum = np.inf
+    best_inliers = None
+
+    num_trials = 0
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        while num_trials < max_trials:
+            remaining = max_trials - num_trials
+            worker_trials = [min(round_trials,
+                                 max(0, remaining - w * round_trials))
+                             for w in range(num_workers)]
+            num_trials += sum(worker_trials)
+
+            # the stop criteria are only checked between rounds
+            futures = [executor.submit(_ransac_trials, *trials_args, n,
+                                       np.inf, -np.inf, 1, state, batch_size,
+                                       preemptive_block)
+                       for n, state in zip(worker_trials, worker_states)
+                       if n > 0]
+
+            for future in futures:
+                model, inlier_num, residuals_sum, inliers = future.result()
+                if model is not None and (
+                    inlier_num > best_inlier_num
+                    or (inlier_num == best_inlier_num
+                        and residuals_sum < best_inlier_residuals_sum)
+                ):
+                    best_model = model
+                    best_inlier_num = inlier_num
+                    best_inlier_residuals_sum = residuals_sum
+                    best_inliers = inliers
+
+            if best_model is not None and (
+                best_inlier_num >= stop_sample_num
+                or best_inlier_residuals_sum <= stop_residuals_sum
+                or num_trials - 1
+                    >= _dynamic_max_trials(best_inlier_num, num_samples,
+                                           min_samples, stop_probability)
+            ):
+                break
+
+    return best_model, best_inliers
+
+
 def ransac(data, model_class, min_samples, residual_threshold,
            is_data_valid=None, is_model_valid=None,
            max_trials=100, stop_sample_num=np.inf, stop_residuals_sum=0,
-           stop_probability=1, random_state=None):
+           stop_probability=1, random_state=None, batch_size=None,
+           preemptive_block=None, num_workers=1):
     """Fit a model to data with the RANSAC (random sample consensus) algorithm.
 
     RANSAC is an iterative algorithm for the robust estimation of parameters
@@ -666,6 +1128,13 @@ def ransac(data, model_class, min_samples, residual_threshold,
 
         where `success` indicates whether the model estimation succeeded
         (`True` or `None` for success, `False` for failure).
+        Batched RANSAC (see `batch_size`) also requires the class methods:
+
+         * ``params, success = estimate_batch(*samples)``
+         * ``residuals = residuals_batch(params, *data)``
+
+        where `samples` are ``(B, min_samples, D)`` arrays, `params` stacks
+        the parameters of the `B` models and `residuals` has shape ``(B, N)``.
     min_samples : int
         The minimum number of data points to fit a model to.
     residual_threshold : float
@@ -699,6 +1168,27 @@ def ransac(data, model_class, min_samples, residual_threshold,
         If RandomState instance, random_state is the random number generator;
         If None, the random number generator is the RandomState instance used
         by `np.random`.
+    batch_size : int, optional
+        If given, hypotheses are estimated and scored by batches of this size
+        with the vectorized ``estimate_batch`` and ``residuals_batch`` methods
+        of `model_class`, which removes the per-trial overhead. The stop
+        criteria are checked after each batch. Transforms of
+        ``skimage.transform`` (except ``PiecewiseAffineTransform`` and
+        ``PolynomialTransform``), `LineModelND` and `CircleModel` support
+        batches.
+    preemptive_block : int, optional
+        With `batch_size`, score the hypotheses of a batch preemptively:
+        after each block of this many random data points, only the half of
+        the hypotheses with the most inliers so far is kept, and the best
+        remaining hypothesis is then scored on all the data [2]_.
+    num_workers : int, optional
+        Number of threads running trials in parallel. Each thread draws its
+        samples from a random generator seeded from `random_state` and runs
+        rounds of `batch_size` trials (10 trials without batches). The best
+        models of the threads are merged and the stop criteria are checked
+        after each round, so that the result only depends on `random_state`
+        and `num_workers`. The functions `is_data_valid` and
+        `is_model_valid` must be thread-safe.
 
 
     Returns
@@ -711,6 +1201,9 @@ def ransac(data, model_class, min_samples, residual_threshold,
     References
     ----------
     .. [1] "RANSAC", Wikipedia, https://en.wikipedia.org/wiki/RANSAC
+    .. [2] D. Nister, "Preemptive RANSAC for live structure and motion
+           estimation", Machine Vision and Applications 16 (2005): 321-329.
+           :DOI:`10.1007/s00138-005-0006-y`
 
     Examples
     --------
@@ -778,11 +1271,6 @@ def ransac(data, model_class, min_samples, residual_threshold,
 
     """
 
-    best_model = None
-    best_inlier_num = 0
-    best_inlier_residuals_sum = np.inf
-    best_inliers = None
-
     random_state = check_random_state(random_state)
 
     if min_samples < 0:
@@ -791,6 +1279,9 @@ def ransac(data, model_class, min_samples, residual_threshold,
     if max_trials < 0:
         raise ValueError("`max_trials` must be greater than zero")
 
+    if num_workers < 1:
+        raise ValueError("`num_workers` must be greater than zero")
+
     if stop_probability < 0 or stop_probability > 1:
         raise ValueError("`stop_probability` must be in range [0, 1]")
 
@@ -799,62 +1290,27 @@ def ransac(data, model_class, min_samples, residual_threshold,
 
     # make sure data is list and not tuple, so it can be modified below
     data = list(data)
-    # number of samples
-    num_samples = data[0].shape[0]
-
-    for num_trials in range(max_trials):
-
-        # choose random sample set
-        samples = []
-        random_idxs = random_state.choice(num_samples, min_samples,
-                                          replace=False)
-        for d in data:
-            samples.append(d[random_idxs])
-
-        # check if random sample set is valid
-        if is_data_valid is not None and not is_data_valid(*samples):
-            continue
-
-        # estimate model for current random sample set
-        sample_model = model_class()
 
-        success = sample_model.estimate(*samples)
-
-        if success is not None:  # backwards compatibility
-            if not success:
-                continue
-
-        # check if estimated model is valid
-        if is_model_valid is not None \
-                and not is_model_valid(sample_model, *samples):
-            continue
-
-        sample_model_residuals = np.abs(sample_model.residuals(*data))
-        # consensus set / inliers
-        sample_model_inliers = sample_model_residuals < residual_threshold
-        sample_model_residuals_sum = np.sum(sample_model_residuals**2)
-
-        # choose as new best model if number of inliers is maximal
-        sample_inlier_num = np.sum(sample_model_inliers)
-        if (
-            # more inliers
-            sample_inlier_num > best_inlier_num
-            # same number of inliers but less "error" in terms of residuals
-            or (sample_inlier_num == best_inlier_num
-                and sample_model_residuals_sum < best_inlier_residuals_sum)
-        ):
-            best_model = sample_model
-            best_inlier_num = sample_inlier_num
-            best_inlier_residuals_sum = sample_model_residuals_sum
-            best_inliers = sample_model_inliers
-            if (
-                best_inlier_num >= stop_sample_num
-                or best_inlier_residuals_sum <= stop_residuals_sum
-                or num_trials
-                    >= _dynamic_max_trials(best_inlier_num, num_samples,
-                                           min_samples, stop_probability)
-            ):
-                break
+    if batch_size is not None:
+        if batch_size < 1:
+            raise ValueError("`batch_size` must be greater than zero")
+        if not (hasattr(model_class, 'estimate_batch') and
+                hasattr(model_class, 'residuals_batch')):
+            raise ValueError("Batched RANSAC requires `model_class` to "
+                             "implement `estimate_batch` and "
+                             "`residuals_batch`.")
+
+    trials_args = (data, model_class, min_samples, residual_threshold,
+                   is_data_valid, is_model_valid)
+    if num_workers == 1:
+        best_model, _, _, best_inliers = _ransac_trials(
+            *trials_args, max_trials, stop_sample_num, stop_residuals_sum,
+            stop_probability, random_state, batch_size, preemptive_block)
+    else:
+        best_model, best_inliers = _ransac_parallel(
+            trials_args, max_trials, stop_sample_num, stop_residuals_sum,
+            stop_probability, random_state, batch_size, preemptive_block,
+            num_workers)
 
     # estimate final model using all inliers
     if best_inliers is not None:
@@ -1,7 +1,7 @@
 import numpy as np
 from skimage.measure import LineModelND, CircleModel, EllipseModel, ransac
 from skimage.transform import AffineTransform
-from skimage.measure.fit import _dynamic_max_trials
+from skimage.measure.fit import _dynamic_max_trials, _ellipse_distance
 
 from skimage._shared import testing
 from skimage._shared.testing import (assert_equal, assert_almost_equal,
@@ -241,6 +241,60 @@ def test_ellipse_model_residuals():
     assert_almost_equal(abs(model.residuals(np.array([[0, 10]]))), 5)
 
 
+def test_ellipse_model_residuals_closest_point():
+    rng = np.random.RandomState(0)
+    t = np.linspace(0, 2 * np.pi, 20001)
+    model = EllipseModel()
+    for params in [(10, 15, 4, 8, 0.5), (1, 1, 20, 1, 2), (3, -2, 6, 6, 1)]:
+        model.params = params
+        data = (model.predict_xy(rng.uniform(0, 2 * np.pi, 200))
+                + rng.normal(scale=2, size=(200, 2)))
+        residuals = model.residuals(data)
+        # shortest distance to a dense sampling of the ellipse
+        xy = model.predict_xy(t)
+        distance = np.hypot(data[:, None, 0] - xy[None, :, 0],
+                            data[:, None, 1] - xy[None, :, 1]).min(axis=1)
+        assert_array_less(residuals, distance + 1e-12)
+        assert_almost_equal(residuals, distance, decimal=3)
+
+
+def test_ellipse_model_residuals_special_points():
+    model = EllipseModel()
+    model.params = (0, 0, 10, 5, 0)
+    # center, points on the axes and on the ellipse
+    data = np.array([[0, 0], [3, 0], [-20, 0], [0, -7], [10, 0], [6, 4]])
+    assert_almost_equal(model.residuals(data),
+                        [5, np.hypot(4 - 3, 5 * np.sqrt(1 - 0.4 ** 2)),
+                         10, 2, 0, 0])
+    # circle
+    model.params = (1, 2, 3, 3, 0.3)
+    assert_almost_equal(model.residuals(np.array([[1, 2], [5, 2], [1, 6]])),
+                        [3, 1, 1])
+    # ellipse degenerated to a segment
+    model.params = (0, 0, 0, 4, 0)
+    assert_almost_equal(model.residuals(np.array([[3, 2], [0, 6], [0, 0]])),
+                        [3, 2, 0])
+
+
+def test_ellipse_model_residuals_near_major_axis():
+    # interior points on the major axis of a rotated ellipse are only on the
+    # axis up to rounding after the rotation
+    model = EllipseModel()
+    xc, yc, a, b, theta = 5, -3, 10, 4, 0.7
+    model.params = (xc, yc, a, b, theta)
+    u = np.array([-3, 0.5, 3, 5.5])
+    offsets = np.array([0, 1e-16, -1e-14, 1e-10])
+    data = np.column_stack([xc + u * np.cos(theta) - offsets * np.sin(theta),
+                            yc + u * np.sin(theta) + offsets * np.cos(theta)])
+    # on the axis, the closest point is at u = a ** 2 u / (a ** 2 - b ** 2)
+    ratio = a * np.abs(u) / (a ** 2 - b ** 2)
+    expected = np.hypot(a * ratio - np.abs(u), b * np.sqrt(1 - ratio ** 2))
+    assert_almost_equal(model.residuals(data), expected)
+    assert_almost_equal(_ellipse_distance([3.], [1e-16], 10., 4.),
+                        [np.hypot(3 * 100 / 84 - 3,
+                                  4 * np.sqrt(1 - (30 / 84) ** 2))])
+
+
 def test_ransac_shape():
     # generate original data without noise
     model0 = CircleModel()
@@ -368,3 +422,102 @@ def test_ransac_sample_duplicates():
     data = np.arange(4)
     ransac(data, DummyModel, min_samples=3, residual_threshold=0.0,
            max_trials=10)
+
+
+def test_model_estimate_batch():
+    random_state = np.random.RandomState(0)
+    for model_class, shape in ((LineModelND, (20, 2, 3)),
+                               (LineModelND, (20, 5, 2)),
+                               (CircleModel, (20, 3, 2)),
+                               (CircleModel, (20, 6, 2))):
+        samples = random_state.random_sample(shape)
+        data = random_state.random_sample((10, shape[2]))
+        params, success = model_class.estimate_batch(samples)
+        assert np.all(success)
+        residuals = model_class.residuals_batch(params, data)
+        assert_equal(residuals.shape, (20, 10))
+        for i in range(len(samples)):
+            model = model_class()
+            model.estimate(samples[i])
+            assert_almost_equal(np.concatenate(model.params, axis=None),
+                                params[i].ravel())
+            assert_almost_equal(model.residuals(data), residuals[i])
+
+
+@testing.parametrize('preemptive_block', [None, 10])
+def test_ransac_batch(preemptive_block):
+    random_state = np.random.RandomState(1)
+
+    src = 100 * random_state.random_sample((50, 2))
+    model0 = AffineTransform(scale=(0.5, 0.3), rotation=1,
+                             translation=(10, 20))
+    dst = model0(src)
+
+    outliers = (0, 5, 20)
+    dst[outliers[0]] = (10000, 10000)
+    dst[outliers[1]] = (-100, 100)
+    dst[outliers[2]] = (50, 50)
+
+    model_est, inliers = ransac((src, dst), AffineTransform, 3, 20,
+                                random_state=random_state, batch_size=16,
+                                preemptive_block=preemptive_block)
+    assert_almost_equal(model0.params, model_est.params)
+    assert np.all(np.nonzero(inliers == False)[0] == outliers)
+
+    # stop criteria are checked after each batch
+    model_est, inliers = ransac((src, dst), AffineTransform, 3, 20,
+                                random_state=random_state, batch_size=16,
+                                stop_sample_num=10)
+    assert np.sum(inliers) >= 10
+
+
+def test_ransac_batch_validity():
+    def is_data_valid(data):
+        return data.shape[0] > 2
+    model, inliers = ransac(np.empty((10, 2)), LineModelND, 2, np.inf,
+                            is_data_valid=is_data_valid, random_state=1,
+                            batch_size=8)
+    assert_equal(model, None)
+    assert_equal(inliers, None)
+
+    def is_model_valid(model, data):
+        return model.params[1][0] > 0
+    data = np.random.RandomState(0).random_sample((30, 2))
+    model, inliers = ransac(data, LineModelND, 2, np.inf,
+                            is_model_valid=is_model_valid, random_state=1,
+                            batch_size=8, max_trials=8)
+    assert model is not None
+
+    with testing.raises(ValueError):
+        ransac(data, EllipseModel, 5, 1, batch_size=8)
+    with testing.raises(ValueError):
+        ransac(data, LineModelND, 2, 1, batch_size=0)
+
+
+@testing.parametrize('batch_size', [None, 8])
+def test_ransac_num_workers(batch_size):
+    random_state = np.random.RandomState(1)
+
+    src = 100 * random_state.random_sample((50, 2))
+    model0 = AffineTransform(scale=(0.5, 0.3), rotation=1,
+                             translation=(10, 20))
+    dst = model0(src)
+
+    outliers = (0, 5, 20)
+    dst[outliers[0]] = (10000, 10000)
+    dst[outliers[1]] = (-100, 100)
+    dst[outliers[2]] = (50, 50)
+
+    results = [ransac((src, dst), AffineTransform, 3, 20, random_state=seed,
+                      batch_size=batch_size, num_workers=3, max_trials=50)
+               for seed in (2, 2, 3)]
+    for model_est, inliers in results:
+        assert_almost_equal(model0.params, model_est.params)
+        assert np.all(np.nonzero(inliers == False)[0] == outliers)
+
+    # identical results for the same seed and number of workers
+    assert_equal(results[0][0].params, results[1][0].params)
+    assert_equal(results[0][1], results[1][1])
+
+    with testing.raises(ValueError):
+        ransac((src, dst), AffineTransform, 3, 20, num_workers=0)
@@ -5,10 +5,13 @@ from numpy import array
 from skimage.measure._regionprops import (regionprops, PROPS, perimeter,
                                           _parse_docs, _props_to_dict,
                                           regionprops_table, OBJECT_COLUMNS,
-                                          COL_DTYPES)
+                                          COL_DTYPES, BATCH_PROPS,
+                                          BATCH_PROPS_2D, _PropertyCache)
+from skimage.measure import label
 from skimage._shared import testing
 from skimage._shared.testing import (assert_array_equal, assert_almost_equal,
-                                     assert_array_almost_equal, assert_equal)
+                                     assert_array_almost_equal, assert_equal,
+                                     assert_allclose)
 
 
 SAMPLE = np.array(
@@ -466,6 +469,55 @@ def test_cache():
     assert np.any(f0 != f1)
 
 
+def test_cache_scalar():
+    label_image = np.zeros((5, 5), dtype=int)
+    label_image[1:4, 1:4] = 1
+    label_image[2, 2] = 0
+    region = regionprops(label_image, cache='scalar')[0]
+    area = region.area
+    image = region.image
+    region._label_image[2, 2] = 1
+
+    # scalar properties are cached, region-sized arrays are recomputed
+    assert region.area == area
+    assert np.any(region.image != image)
+
+
+def test_cache_size():
+    label_image = np.zeros((10, 10), dtype=int)
+    label_image[1:3, 1:3] = 1
+    label_image[5:8, 5:8] = 2
+    regions = regionprops(label_image, cache_size=10)
+    cache = regions[0]._cache
+    assert regions[1]._cache is cache
+
+    image0 = regions[0].image
+    assert (1, 'image') in cache
+    regions[1].image
+    # the least recently used image of the first region has been evicted
+    assert (1, 'image') not in cache
+    assert (2, 'image') in cache
+    assert cache.nbytes <= 10
+    assert_array_equal(regions[0].image, image0)
+
+
+def test_cache_size_sequences():
+    cache = _PropertyCache(max_bytes=1000)
+    # the arrays held by tuples and lists count towards the size of the cache
+    cache[1, 'centroid'] = (np.zeros(50), np.zeros(50))
+    assert cache.nbytes >= 800
+    cache[2, 'centroid'] = [np.zeros(50), np.zeros(50)]
+    assert (1, 'centroid') not in cache
+    assert cache.nbytes <= 1000
+
+
+def test_slots():
+    region = regionprops(SAMPLE)[0]
+    assert not hasattr(region, '__dict__')
+    with testing.raises(AttributeError):
+        region.foo = 1
+
+
 def test_docstrings_and_props():
     def foo():
         """foo"""
@@ -516,6 +568,69 @@ def test_regionprops_table():
                    'bbox+2': array([10]), 'bbox+3': array([18])}
 
 
+def test_regionprops_table_batch():
+    rng = np.random.RandomState(0)
+    for shape, threshold in (((40, 50), 0.55), ((12, 13, 14), 0.75)):
+        label_image = label(rng.rand(*shape) > threshold)
+        intensity_image = rng.randint(1, 200, size=shape)
+        properties = BATCH_PROPS
+        if len(shape) == 3:
+            properties = BATCH_PROPS - BATCH_PROPS_2D
+        properties = sorted(properties)
+
+        out = regionprops_table(label_image, intensity_image,
+                                properties=properties)
+        expected = _props_to_dict(regionprops(label_image, intensity_image),
+                                  properties=properties)
+
+        assert list(out) == list(expected)
+        for key in expected:
+            assert out[key].dtype == expected[key].dtype
+            assert_allclose(out[key], expected[key], atol=1e-8)
+
+
+def test_regionprops_table_batch_fallback():
+    # properties not handled by the batch engine are measured per region
+    out = regionprops_table(SAMPLE, properties=('label', 'area', 'perimeter'))
+    region = regionprops(SAMPLE)[0]
+    assert_almost_equal(out['perimeter'], [region.perimeter])
+
+    with testing.raises(NotImplementedError):
+        regionprops_table(SAMPLE_3D, properties=('label', 'orientation'))
+    with testing.raises(TypeError):
+        regionprops_table(SAMPLE.astype(float))
+
+
+def test_regionprops_table_chunks(tmpdir):
+    rng = np.random.RandomState(0)
+    label_image = label(rng.rand(45, 52) > 0.45)
+    intensity_image = rng.randint(1, 200, size=label_image.shape)
+    properties = sorted(BATCH_PROPS)
+    expected = regionprops_table(label_image, intensity_image,
+                                 properties=properties)
+
+    filename = str(tmpdir.join('labels.dat'))
+    memmap = np.memmap(filename, dtype=label_image.dtype, mode='w+',
+                       shape=label_image.shape)
+    memmap[:] = label_image
+    memmap.flush()
+
+    for image, chunks, num_workers in ((label_image, 10, 1),
+                                       (label_image, (7, 30), 3),
+                                       (label_image, ((20, 25), (2, 50)), 2),
+                                       (memmap, 16, 2)):
+        out = regionprops_table(image, intensity_image, properties=properties,
+                                chunks=chunks, num_workers=num_workers)
+        assert list(out) == list(expected)
+        for key in expected:
+            assert out[key].dtype == expected[key].dtype
+            assert_allclose(out[key], expected[key], atol=1e-8)
+
+    with testing.raises(ValueError):
+        regionprops_table(label_image, properties=('label', 'perimeter'),
+                          chunks=10)
+
+
 def test_props_dict_complete():
     region = regionprops(SAMPLE)[0]
     properties = [s for s in dir(region) if not s.startswith('_')]
@@ -13,7 +13,8 @@ from ._geometric import (estimate_transform,
                          EssentialMatrixTransform, PolynomialTransform,
                          PiecewiseAffineTransform)
 from ._warps import (swirl, resize, rotate, rescale,
-                     downscale_local_mean, warp, warp_coords)
+                     downscale_local_mean, warp, warp_coords, WarpPlan,
+                     make_warp_plan)
 from .pyramids import (pyramid_reduce, pyramid_expand,
                        pyramid_gaussian, pyramid_laplacian)
 
@@ -35,6 +36,8 @@ __all__ = ['match_histograms',
            'integrate',
            'warp',
            'warp_coords',
+           'WarpPlan',
+           'make_warp_plan',
            'estimate_transform',
            'matrix_transform',
            'EuclideanTransform',
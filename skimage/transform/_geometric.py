@@ -144,6 +144,110 @@ def _umeyama(src, dst, estimate_scale):
     return T
 
 
+def _center_and_normalize_points_batch(points):
+    """Center and normalize each of a batch of point sets.
+
+    Batched version of `_center_and_normalize_points`.
+
+    Parameters
+    ----------
+    points : (B, N, 2) array
+        The coordinates of the image points of each set.
+
+    Returns
+    -------
+    matrix : (B, 3, 3) array
+        The transformation matrices to obtain the new points.
+    new_points : (B, N, 2) array
+        The transformed image points.
+    valid : (B, ) array of bool
+        False for the sets whose points are all equal, which cannot be
+        normalized.
+
+    """
+
+    centroid = points.mean(axis=1)
+    rms = np.sqrt(np.sum((points - centroid[:, None]) ** 2, axis=(1, 2)) /
+                  points.shape[1])
+    valid = rms > 0
+    norm_factor = math.sqrt(2) / np.where(valid, rms, 1)
+
+    matrix = np.zeros((len(points), 3, 3))
+    matrix[:, 0, 0] = norm_factor
+    matrix[:, 1, 1] = norm_factor
+    matrix[:, :2, 2] = -norm_factor[:, None] * centroid
+    matrix[:, 2, 2] = 1
+
+    new_points = (points - centroid[:, None]) * norm_factor[:, None, None]
+
+    return matrix, new_points, valid
+
+
+def _umeyama_batch(src, dst, estimate_scale):
+    """Estimate N-D similarity transformations of a batch of point sets.
+
+    Batched version of `_umeyama`.
+
+    Parameters
+    ----------
+    src : (B, M, N) array
+        Source coordinates of each set.
+    dst : (B, M, N) array
+        Destination coordinates of each set.
+    estimate_scale : bool
+        Whether to estimate scaling factor.
+
+    Returns
+    -------
+    T : (B, N + 1, N + 1)
+        The homogeneous similarity transformation matrices, NaN for the sets
+        whose problem is not well-conditioned.
+
+    """
+
+    batch, num, dim = src.shape
+
+    src_mean = src.mean(axis=1)
+    dst_mean = dst.mean(axis=1)
+    src_demean = src - src_mean[:, None]
+    dst_demean = dst - dst_mean[:, None]
+
+    # Eq. (38).
+    A = np.swapaxes(dst_demean, 1, 2) @ src_demean / num
+
+    # Eq. (39).
+    d = np.ones((batch, dim))
+    d[np.linalg.det(A) < 0, dim - 1] = -1
+
+    U, S, V = np.linalg.svd(A)
+
+    # Eq. (40) and (43).
+    rank = np.linalg.matrix_rank(A)
+    rotation_d = d.copy()
+    deficient = rank == dim - 1
+    proper = np.linalg.det(U) * np.linalg.det(V) > 0
+    rotation_d[deficient & proper] = 1
+    rotation_d[deficient & ~proper, dim - 1] = -1
+    R = U @ (rotation_d[:, :, None] * V)
+
+    T = np.zeros((batch, dim + 1, dim + 1))
+    T[:, dim, dim] = 1
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if estimate_scale:
+            # Eq. (41) and (42).
+            scale = (np.sum(S * d, axis=1) /
+                     src_demean.var(axis=1).sum(axis=1))
+        else:
+            scale = np.ones(batch)
+
+        T[:, :dim, dim] = (dst_mean -
+                           scale[:, None] * (R @ src_mean[:, :, None])[..., 0])
+        T[:, :dim, :dim] = R * scale[:, None, None]
+    T[rank == 0] = np.nan
+
+    return T
+
+
 class GeometricTransform(object):
     """Base class for geometric transformations.
 
@@ -681,7 +785,9 @@ class ProjectiveTransform(GeometricTransform):
         # Select relevant columns, depending on params
         A = A[:, list(self._coeffs) + [8]]
 
-        _, _, V = np.linalg.svd(A)
+        # the left singular vectors are not needed, and computing all of them
+        # costs O(N**2) for N points
+        _, _, V = np.linalg.svd(A, full_matrices=A.shape[0] < A.shape[1])
         # if the last element of the vector corresponding to the smallest
         # singular value is close to zero, this implies a degenerate case
         # because it is a rank-defective transform, which would map points
@@ -702,6 +808,102 @@ class ProjectiveTransform(GeometricTransform):
 
         return True
 
+    @classmethod
+    def estimate_batch(cls, src, dst):
+        """Estimate a transformation from each of a batch of point sets.
+
+        Vectorized version of `estimate`, e.g. to score many hypotheses at
+        once in `skimage.measure.ransac`.
+
+        Parameters
+        ----------
+        src : (B, N, 2) array
+            Source coordinates of each of the `B` sets.
+        dst : (B, N, 2) array
+            Destination coordinates of each of the `B` sets.
+
+        Returns
+        -------
+        params : (B, 3, 3) array
+            Homogeneous transformation matrix of each set, NaN if the
+            estimation failed.
+        success : (B, ) array of bool
+            True for the sets whose estimation succeeded.
+
+        """
+
+        src_matrix, src, src_valid = _center_and_normalize_points_batch(src)
+        dst_matrix, dst, dst_valid = _center_and_normalize_points_batch(dst)
+
+        xs = src[:, :, 0]
+        ys = src[:, :, 1]
+        xd = dst[:, :, 0]
+        yd = dst[:, :, 1]
+        batch, rows = xs.shape
+
+        # params: a0, a1, a2, b0, b1, b2, c0, c1
+        A = np.zeros((batch, rows * 2, 9))
+        A[:, :rows, 0] = xs
+        A[:, :rows, 1] = ys
+        A[:, :rows, 2] = 1
+        A[:, :rows, 6] = - xd * xs
+        A[:, :rows, 7] = - xd * ys
+        A[:, rows:, 3] = xs
+        A[:, rows:, 4] = ys
+        A[:, rows:, 5] = 1
+        A[:, rows:, 6] = - yd * xs
+        A[:, rows:, 7] = - yd * ys
+        A[:, :rows, 8] = xd
+        A[:, rows:, 8] = yd
+
+        # Select relevant columns, depending on params
+        A = A[:, :, list(cls._coeffs) + [8]]
+
+        _, _, V = np.linalg.svd(A)
+        # degenerate, rank-defective transforms, as in `estimate`
+        success = src_valid & dst_valid & ~np.isclose(V[:, -1, -1], 0)
+
+        H = np.zeros((batch, 9))
+        H[:, 8] = 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            H[:, list(cls._coeffs)] = - V[:, -1, :-1] / V[:, -1, -1:]
+            H = H.reshape(batch, 3, 3)
+
+            # De-center and de-normalize
+            H = np.linalg.inv(dst_matrix) @ H @ src_matrix
+        H[~success] = np.nan
+
+        return H, success
+
+    @classmethod
+    def residuals_batch(cls, params, src, dst):
+        """Residuals of each of a batch of transformations.
+
+        Vectorized version of `residuals`.
+
+        Parameters
+        ----------
+        params : (B, 3, 3) array
+            Homogeneous transformation matrices.
+        src : (N, 2) array
+            Source coordinates.
+        dst : (N, 2) array
+            Destination coordinates.
+
+        Returns
+        -------
+        residuals : (B, N) array
+            Residual of each coordinate for each transformation.
+
+        """
+
+        src = np.column_stack([src, np.ones(len(src))])
+        out = params @ src.T
+        out[:, 2][out[:, 2] == 0] = np.finfo(float).eps
+        x = out[:, 0] / out[:, 2]
+        y = out[:, 1] / out[:, 2]
+        return np.sqrt((x - dst[:, 0]) ** 2 + (y - dst[:, 1]) ** 2)
+
     def __add__(self, other):
         """Combine this transformation with another.
 
@@ -843,20 +1045,52 @@ class PiecewiseAffineTransform(GeometricTransform):
     a Delaunay triangulation of the points to form a mesh. Each triangle is
     used to find a local affine transform.
 
+    Parameters
+    ----------
+    cache_simplices : bool, optional
+        Whether to remember the triangles of the last coordinates transformed
+        in each direction. When the same coordinates are transformed again,
+        e.g. the output grid of `warp` for several images, the triangles are
+        not searched again.
+
     Attributes
     ----------
     affines : list of AffineTransform objects
-        Affine transformations for each triangle in the mesh.
+        Affine transformations for each triangle in the mesh. Their matrices
+        are gathered when the list is assigned; after modifying the list or
+        the `params` of its transforms in place, assign it again, e.g.
+        ``tform.affines = tform.affines``.
     inverse_affines : list of AffineTransform objects
-        Inverse affine transformations for each triangle in the mesh.
+        Inverse affine transformations for each triangle in the mesh, gathered
+        in the same way as `affines`.
 
     """
 
-    def __init__(self):
+    def __init__(self, cache_simplices=False):
         self._tesselation = None
         self._inverse_tesselation = None
         self.affines = None
         self.inverse_affines = None
+        self.cache_simplices = cache_simplices
+        self._simplex_cache = {}
+
+    @property
+    def affines(self):
+        return self._affines
+
+    @affines.setter
+    def affines(self, affines):
+        self._affines = affines
+        self._matrices = self._stack_matrices(affines)
+
+    @property
+    def inverse_affines(self):
+        return self._inverse_affines
+
+    @inverse_affines.setter
+    def inverse_affines(self, affines):
+        self._inverse_affines = affines
+        self._inverse_matrices = self._stack_matrices(affines)
 
     def estimate(self, src, dst):
         """Estimate the transformation from a set of corresponding points.
@@ -881,24 +1115,66 @@ class PiecewiseAffineTransform(GeometricTransform):
         # triangulate input positions into mesh
         self._tesselation = spatial.Delaunay(src)
         # find affine mapping from source positions to destination
-        self.affines = []
+        affines = []
         for tri in self._tesselation.vertices:
             affine = AffineTransform()
             affine.estimate(src[tri, :], dst[tri, :])
-            self.affines.append(affine)
+            affines.append(affine)
+        self.affines = affines
 
         # inverse piecewise affine
         # triangulate input positions into mesh
         self._inverse_tesselation = spatial.Delaunay(dst)
         # find affine mapping from source positions to destination
-        self.inverse_affines = []
+        inverse_affines = []
         for tri in self._inverse_tesselation.vertices:
             affine = AffineTransform()
             affine.estimate(dst[tri, :], src[tri, :])
-            self.inverse_affines.append(affine)
+            inverse_affines.append(affine)
+        self.inverse_affines = inverse_affines
+
+        self._simplex_cache = {}
 
         return True
 
+    def _find_simplex(self, tesselation, coords, direction):
+        """Triangle index of each coordinate, -1 outside of the mesh."""
+        if not self.cache_simplices:
+            return tesselation.find_simplex(coords)
+        cached = self._simplex_cache.get(direction)
+        if (cached is not None and cached[0].shape == coords.shape and
+                np.array_equal(cached[0], coords)):
+            return cached[1]
+        simplex = tesselation.find_simplex(coords)
+        self._simplex_cache[direction] = (np.array(coords), simplex)
+        return simplex
+
+    @staticmethod
+    def _stack_matrices(affines):
+        """Matrices of `affines` stacked in a single array."""
+        if affines is None:
+            return None
+        return np.array([affine.params for affine in affines],
+                        dtype=np.double).reshape(-1, 3, 3)
+
+    @staticmethod
+    def _apply_affines(coords, simplex, matrices):
+        """Apply the affine matrix of its triangle to each coordinate."""
+        out = np.empty_like(coords, np.double)
+        if len(matrices) == 0:
+            out[...] = -1
+            return out
+        # one (3, 3) matrix per coordinate, the last one for -1
+        mat = matrices[simplex]
+        x = coords[:, 0]
+        y = coords[:, 1]
+        out[:, 0] = mat[:, 0, 0] * x + mat[:, 0, 1] * y + mat[:, 0, 2]
+        out[:, 1] = mat[:, 1, 0] * x + mat[:, 1, 1] * y + mat[:, 1, 2]
+
+        # coordinates outside of mesh
+        out[simplex == -1, :] = -1
+        return out
+
     def __call__(self, coords):
         """Apply forward transformation.
 
@@ -916,23 +1192,10 @@ class PiecewiseAffineTransform(GeometricTransform):
 
         """
 
-        out = np.empty_like(coords, np.double)
-
         # determine triangle index for each coordinate
-        simplex = self._tesselation.find_simplex(coords)
-
-        # coordinates outside of mesh
-        out[simplex == -1, :] = -1
-
-        for index in range(len(self._tesselation.vertices)):
-            # affine transform for triangle
-            affine = self.affines[index]
-            # all coordinates within triangle
-            index_mask = simplex == index
+        simplex = self._find_simplex(self._tesselation, coords, 'forward')
 
-            out[index_mask, :] = affine(coords[index_mask, :])
-
-        return out
+        return self._apply_affines(coords, simplex, self._matrices)
 
     def inverse(self, coords):
         """Apply inverse transformation.
@@ -951,23 +1214,11 @@ class PiecewiseAffineTransform(GeometricTransform):
 
         """
 
-        out = np.empty_like(coords, np.double)
-
         # determine triangle index for each coordinate
-        simplex = self._inverse_tesselation.find_simplex(coords)
-
-        # coordinates outside of mesh
-        out[simplex == -1, :] = -1
+        simplex = self._find_simplex(self._inverse_tesselation, coords,
+                                     'inverse')
 
-        for index in range(len(self._inverse_tesselation.vertices)):
-            # affine transform for triangle
-            affine = self.inverse_affines[index]
-            # all coordinates within triangle
-            index_mask = simplex == index
-
-            out[index_mask, :] = affine(coords[index_mask, :])
-
-        return out
+        return self._apply_affines(coords, simplex, self._inverse_matrices)
 
 
 class EuclideanTransform(ProjectiveTransform):
@@ -1060,6 +1311,32 @@ class EuclideanTransform(ProjectiveTransform):
 
         return True
 
+    @classmethod
+    def estimate_batch(cls, src, dst):
+        """Estimate a transformation from each of a batch of point sets.
+
+        Vectorized version of `estimate`.
+
+        Parameters
+        ----------
+        src : (B, N, 2) array
+            Source coordinates of each of the `B` sets.
+        dst : (B, N, 2) array
+            Destination coordinates of each of the `B` sets.
+
+        Returns
+        -------
+        params : (B, 3, 3) array
+            Homogeneous transformation matrix of each set, NaN if the
+            estimation failed.
+        success : (B, ) array of bool
+            True for the sets whose estimation succeeded.
+
+        """
+
+        params = _umeyama_batch(src, dst, False)
+        return params, np.all(np.isfinite(params), axis=(1, 2))
+
     @property
     def rotation(self):
         return math.atan2(self.params[1, 0], self.params[1, 1])
@@ -1165,6 +1442,32 @@ class SimilarityTransform(EuclideanTransform):
 
         return True
 
+    @classmethod
+    def estimate_batch(cls, src, dst):
+        """Estimate a transformation from each of a batch of point sets.
+
+        Vectorized version of `estimate`.
+
+        Parameters
+        ----------
+        src : (B, N, 2) array
+            Source coordinates of each of the `B` sets.
+        dst : (B, N, 2) array
+            Destination coordinates of each of the `B` sets.
+
+        Returns
+        -------
+        params : (B, 3, 3) array
+            Homogeneous transformation matrix of each set, NaN if the
+            estimation failed.
+        success : (B, ) array of bool
+            True for the sets whose estimation succeeded.
+
+        """
+
+        params = _umeyama_batch(src, dst, True)
+        return params, np.all(np.isfinite(params), axis=(1, 2))
+
     @property
     def scale(self):
         if abs(math.cos(self.rotation)) < np.spacing(1):
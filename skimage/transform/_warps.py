@@ -3,7 +3,8 @@ from scipy import ndimage as ndi
 
 from ._geometric import (SimilarityTransform, AffineTransform,
                          ProjectiveTransform, _to_ndimage_mode)
-from ._warps_cy import _warp_fast
+from ._warps_cy import (_warp_fast, _resample_axis, _gather, _tap_indices,
+                        _KERNEL_TYPES)
 from ..measure import block_reduce
 
 from .._shared.utils import (get_bound_method_class, safe_as_int, warn,
@@ -17,7 +18,8 @@ HOMOGRAPHY_TRANSFORMS = (
 
 
 def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
-           preserve_range=False, anti_aliasing=True, anti_aliasing_sigma=None):
+           preserve_range=False, anti_aliasing=True, anti_aliasing_sigma=None,
+           num_threads=1):
     """Resize image to match a certain size.
 
     Performs interpolation to up-size or down-size images. Note that anti-
@@ -59,15 +61,22 @@ def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
         Whether to keep the original range of values. Otherwise, the input
         image is converted according to the conventions of `img_as_float`.
         Also see https://scikit-image.org/docs/dev/user_guide/data_types.html
-    anti_aliasing : bool, optional
+    anti_aliasing : {True, False, 'area'}, optional
         Whether to apply a Gaussian filter to smooth the image prior to
         down-scaling. It is crucial to filter when down-sampling the image to
-        avoid aliasing artifacts.
+        avoid aliasing artifacts. With 'area', each output pixel of a
+        down-sampled axis is instead the mean of the input pixels it covers,
+        weighted by their overlap; up-sampled axes are interpolated, which
+        requires `order` to be 0, 1 or 3.
     anti_aliasing_sigma : {float, tuple of floats}, optional
         Standard deviation for Gaussian filtering to avoid aliasing artifacts.
         By default, this value is chosen as (s - 1) / 2 where s is the
         down-scaling factor, where s > 1. For the up-size case, s < 1, no
-        anti-aliasing is performed prior to rescaling.
+        anti-aliasing is performed prior to rescaling. Ignored with
+        ``anti_aliasing='area'``.
+    num_threads : int, optional
+        Number of threads used to interpolate the image, each processing a
+        part of the output rows. See `warp`.
 
     Notes
     -----
@@ -77,6 +86,11 @@ def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
     symmetric, the result would be [0, 1, 2, 2, 1, 0, 0], while for reflect it
     would be [0, 1, 2, 1, 0, 1, 2].
 
+    Orders 0 and 1, order 3 for 2-D images and area averaging are computed
+    one axis at a time, with ``order + 1`` interpolation taps per axis, order
+    3 using the cubic convolution kernel of `warp`. Float32 images then give
+    float32 output.
+
     Examples
     --------
     >>> from skimage import data
@@ -103,7 +117,11 @@ def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
     factors = (np.asarray(input_shape, dtype=float) /
                np.asarray(output_shape, dtype=float))
 
-    if anti_aliasing:
+    area = isinstance(anti_aliasing, str)
+    if area and anti_aliasing != 'area':
+        raise ValueError("anti_aliasing must be a boolean or 'area'.")
+
+    if anti_aliasing and not area:
         if anti_aliasing_sigma is None:
             anti_aliasing_sigma = np.maximum(0, (factors - 1) / 2)
         else:
@@ -135,9 +153,19 @@ def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
         image = ndi.gaussian_filter(image, anti_aliasing_sigma,
                                     cval=cval, mode=ndi_mode)
 
+    spatial_2d = (len(output_shape) == 2 or
+                  (len(output_shape) == 3 and
+                   output_shape[2] == input_shape[2]))
+
+    if order in (0, 1) or (order == 3 and spatial_2d) or area:
+        # separable resampling, one axis at a time
+        out = _resize_separable(image, output_shape, order=order, mode=mode,
+                                cval=cval, clip=clip,
+                                preserve_range=preserve_range, area=area,
+                                num_threads=num_threads)
+
     # 2-dimensional interpolation
-    if len(output_shape) == 2 or (len(output_shape) == 3 and
-                                  output_shape[2] == input_shape[2]):
+    elif spatial_2d:
         rows = output_shape[0]
         cols = output_shape[1]
         input_rows = input_shape[0]
@@ -163,7 +191,7 @@ def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
 
         out = warp(image, tform, output_shape=output_shape, order=order,
                    mode=mode, cval=cval, clip=clip,
-                   preserve_range=preserve_range)
+                   preserve_range=preserve_range, num_threads=num_threads)
 
     else:  # n-dimensional interpolation
         coord_arrays = [factors[i] * (np.arange(d) + 0.5) - 0.5
@@ -184,9 +212,179 @@ def resize(image, output_shape, order=1, mode='reflect', cval=0, clip=True,
     return out
 
 
+def _resize_weights(n_in, n_out, order, mode, area=False):
+    """Interpolation taps of a resize along one axis.
+
+    Parameters
+    ----------
+    n_in, n_out : int
+        Input and output lengths of the axis.
+    order : {0, 1, 3}
+        Order of interpolation, with the kernels of `warp`.
+    mode : {'constant', 'edge', 'symmetric', 'reflect', 'wrap'}
+        Mapping of the taps outside the input.
+    area : bool, optional
+        If True and the axis is down-sampled, each output pixel is the mean of
+        the input pixels it covers, weighted by their overlap.
+
+    Returns
+    -------
+    index : (n_out, n_taps) array of intp
+        Input index of each tap, -1 for `cval` in constant mode.
+    weights : (n_out, n_taps) array of double
+        Weight of each tap.
+    """
+    factor = n_in / n_out
+    out_index = np.arange(n_out)
+
+    if area and factor > 1:
+        start = out_index * factor
+        stop = np.minimum(start + factor, n_in)
+        first = np.floor(start).astype(np.intp)
+        coords = first[:, None] + np.arange(int(np.ceil(factor)) + 1)
+        overlap = (np.minimum(stop[:, None], coords + 1) -
+                   np.maximum(start[:, None], coords))
+        weights = np.clip(overlap, 0, None) / factor
+        coords = np.minimum(coords, n_in - 1)
+        index = _tap_indices(coords.ravel(), n_in, mode).reshape(coords.shape)
+        return index, weights
+
+    # center of the output pixels in input coordinates, as in `warp`
+    x = factor * (out_index + 0.5) - 0.5
+    return _interpolation_taps(x, n_in, order, mode)
+
+
+def _interpolation_taps(x, n_in, order, mode):
+    """Interpolation taps of coordinates along an axis, as in `warp`.
+
+    Parameters
+    ----------
+    x : (N,) array
+        Coordinates along an axis of length `n_in`.
+    n_in : int
+        Length of the axis.
+    order : {0, 1, 3}
+        Order of interpolation: nearest neighbor, linear or Catmull-Rom cubic
+        convolution.
+    mode : {'constant', 'edge', 'symmetric', 'reflect', 'wrap'}
+        Mapping of the taps outside the input.
+
+    Returns
+    -------
+    index : (N, order + 1) array of intp
+        Input index of each tap, -1 for `cval` in constant mode.
+    weights : (N, order + 1) array of double
+        Weight of each tap.
+    """
+    low = np.floor(x)
+    dx = x - low
+    low = low.astype(np.intp)
+    if order == 0:
+        coords = np.where(x > 0, np.floor(x + 0.5), np.ceil(x - 0.5))
+        coords = coords.astype(np.intp)[:, None]
+        weights = np.ones(coords.shape)
+    elif order == 1:
+        coords = np.stack([low, np.ceil(x).astype(np.intp)], axis=1)
+        weights = np.stack([1 - dx, dx], axis=1)
+    else:
+        # Catmull-Rom cubic convolution
+        coords = low[:, None] + np.arange(-1, 3)
+        dx2 = dx * dx
+        dx3 = dx2 * dx
+        weights = np.stack([-0.5 * dx3 + dx2 - 0.5 * dx,
+                            1.5 * dx3 - 2.5 * dx2 + 1,
+                            -1.5 * dx3 + 2 * dx2 + 0.5 * dx,
+                            0.5 * dx3 - 0.5 * dx2], axis=1)
+    index = _tap_indices(np.ascontiguousarray(coords).ravel(), n_in, mode)
+    return index.reshape(coords.shape), weights
+
+
+def _kernel_input(image):
+    """View or copy of `image` with a type read by the native kernels."""
+    if image.dtype == bool:
+        return image.view(np.uint8)
+    if image.dtype.type not in _KERNEL_TYPES or not image.dtype.isnative:
+        return image.astype(np.double)
+    return image
+
+
+def _resize_separable(image, output_shape, order=1, mode='reflect', cval=0,
+                      clip=True, preserve_range=False, area=False,
+                      num_threads=1):
+    """Resize an image by interpolating along one axis at a time.
+
+    Each pass resamples an axis with the taps of `_resize_weights`, so that an
+    output pixel costs ``order + 1`` taps per axis instead of
+    ``(order + 1) ** ndim``. The axes are processed from the most reduced to
+    the most enlarged one to keep the intermediate images small.
+
+    Parameters
+    ----------
+    image : ndarray
+        Input image, with as many dimensions as `output_shape`.
+    output_shape : tuple
+        Shape of the output image.
+
+    Returns
+    -------
+    resized : ndarray
+        Resized image, of type float32 for float32 images and float64
+        otherwise.
+
+    Other parameters
+    ----------------
+    See `resize`. If `area` is True, down-sampled axes are reduced by area
+    averaging instead of being interpolated.
+    """
+    if mode not in ('constant', 'edge', 'symmetric', 'reflect', 'wrap'):
+        raise ValueError("Invalid mode specified.  Please use `constant`, "
+                         "`edge`, `wrap`, `reflect` or `symmetric`.")
+    output_shape = tuple(int(n) for n in output_shape)
+    if order not in (0, 1, 3):
+        raise ValueError("Separable resizing, used for area averaging, only "
+                         "supports orders 0, 1 and 3, got {}.".format(order))
+
+    image, scale, offset = _warp_fast_input(image, preserve_range)
+    input_range = (np.array([image.min(), image.max()], dtype=np.double)
+                   + offset) * scale if image.size else None
+    image = _kernel_input(image)
+    out_dtype = np.float32 if image.dtype == np.float32 else np.double
+    cval_in = cval / scale - offset
+
+    ratios = np.asarray(output_shape, dtype=float) / np.maximum(image.shape, 1)
+    out = np.ascontiguousarray(image)
+    for axis in np.argsort(ratios, kind='stable'):
+        n_in = out.shape[axis]
+        n_out = output_shape[axis]
+        if n_in == n_out:
+            # the output pixels are centered on the input pixels
+            continue
+        shape = out.shape[:axis] + (n_out,) + out.shape[axis + 1:]
+        resampled = np.empty(shape, dtype=out_dtype)
+        if resampled.size and out.size:
+            index, weights = _resize_weights(n_in, n_out, order, mode, area)
+            outer = int(np.prod(out.shape[:axis]))
+            inner = int(np.prod(out.shape[axis + 1:]))
+            _resample_axis(out.reshape(outer, n_in, inner),
+                           resampled.reshape(outer, n_out, inner),
+                           index, weights, cval_in, num_threads)
+        else:
+            resampled[...] = cval_in
+        out = resampled
+
+    out = out.astype(out_dtype, copy=out is image)
+    if scale != 1 or offset != 0:
+        out += offset
+        out *= scale
+
+    if input_range is not None:
+        _clip_warp_output(input_range, out, order, mode, cval, clip)
+    return out
+
+
 def rescale(image, scale, order=1, mode='reflect', cval=0, clip=True,
             preserve_range=False, multichannel=False,
-            anti_aliasing=True, anti_aliasing_sigma=None):
+            anti_aliasing=True, anti_aliasing_sigma=None, num_threads=1):
     """Scale image by a certain factor.
 
     Performs interpolation to up-scale or down-scale images. Note that anti-
@@ -230,14 +428,18 @@ def rescale(image, scale, order=1, mode='reflect', cval=0, clip=True,
     multichannel : bool, optional
         Whether the last axis of the image is to be interpreted as multiple
         channels or another spatial dimension.
-    anti_aliasing : bool, optional
+    anti_aliasing : {True, False, 'area'}, optional
         Whether to apply a Gaussian filter to smooth the image prior to
         down-scaling. It is crucial to filter when down-sampling the image to
-        avoid aliasing artifacts.
+        avoid aliasing artifacts. See `resize` for area averaging, which
+        requires `order` to be 0, 1 or 3.
     anti_aliasing_sigma : {float, tuple of floats}, optional
         Standard deviation for Gaussian filtering to avoid aliasing artifacts.
         By default, this value is chosen as (1 - s) / 2 where s is the
         down-scaling factor.
+    num_threads : int, optional
+        Number of threads used to interpolate the image, each processing a
+        part of the output rows. See `warp`.
 
     Notes
     -----
@@ -274,11 +476,12 @@ def rescale(image, scale, order=1, mode='reflect', cval=0, clip=True,
     return resize(image, output_shape, order=order, mode=mode, cval=cval,
                   clip=clip, preserve_range=preserve_range,
                   anti_aliasing=anti_aliasing,
-                  anti_aliasing_sigma=anti_aliasing_sigma)
+                  anti_aliasing_sigma=anti_aliasing_sigma,
+                  num_threads=num_threads)
 
 
 def rotate(image, angle, resize=False, center=None, order=1, mode='constant',
-           cval=0, clip=True, preserve_range=False):
+           cval=0, clip=True, preserve_range=False, num_threads=1):
     """Rotate image by a certain angle around its center.
 
     Parameters
@@ -322,6 +525,9 @@ def rotate(image, angle, resize=False, center=None, order=1, mode='constant',
         image is converted according to the conventions of `img_as_float`.
         Also see
         https://scikit-image.org/docs/dev/user_guide/data_types.html
+    num_threads : int, optional
+        Number of threads used to interpolate the image, each processing a
+        part of the output rows. See `warp`.
 
     Notes
     -----
@@ -384,7 +590,8 @@ def rotate(image, angle, resize=False, center=None, order=1, mode='constant',
     tform.params[2] = (0, 0, 1)
 
     return warp(image, tform, output_shape=output_shape, order=order,
-                mode=mode, cval=cval, clip=clip, preserve_range=preserve_range)
+                mode=mode, cval=cval, clip=clip, preserve_range=preserve_range,
+                num_threads=num_threads)
 
 
 def downscale_local_mean(image, factors, cval=0, clip=True):
@@ -657,8 +864,67 @@ def _clip_warp_output(input_image, output_image, order, mode, cval, clip):
             output_image[cval_mask] = cval
 
 
+def _warp_fast_input(image, preserve_range):
+    """Image read by `_warp_fast` and the conversion of its values.
+
+    Integer images are read without conversion: `_warp_fast` applies the
+    conversion of `convert_to_float` to the interpolated values instead, as
+    ``(value + offset) * scale``.
+
+    Parameters
+    ----------
+    image : ndarray
+        Input image.
+    preserve_range : bool
+        Whether to keep the original range of values, see `convert_to_float`.
+
+    Returns
+    -------
+    image : ndarray
+        Image to warp.
+    scale, offset : float
+        Conversion of the interpolated values.
+    """
+    kind = image.dtype.kind
+    if preserve_range or kind in 'bf':
+        return image, 1., 0.
+    if kind == 'u':
+        return image, 1. / np.iinfo(image.dtype).max, 0.
+    if kind == 'i':
+        info = np.iinfo(image.dtype)
+        return image, 2. / (info.max - info.min), 0.5
+    return convert_to_float(image, preserve_range), 1., 0.
+
+
+def _matrix_coords(matrix, output_shape):
+    """Input coordinates of the output pixels of a 3-D homogeneous warp.
+
+    Parameters
+    ----------
+    matrix : (4, 4) array
+        Homogeneous matrix mapping ``(col, row, plane)`` output coordinates
+        to the input image.
+    output_shape : tuple of 3 int
+        Shape of the output image.
+
+    Returns
+    -------
+    coords : (3, *output_shape) array
+        Coordinates for `scipy.ndimage.map_coordinates`.
+    """
+    output_shape = tuple(int(n) for n in output_shape)
+    planes, rows, cols = np.indices(output_shape, dtype=np.double)
+    xyz = np.stack([cols.ravel(), rows.ravel(), planes.ravel(),
+                    np.ones(rows.size)])
+    src = np.asarray(matrix, dtype=np.double).dot(xyz)
+    src = src[:3] / src[3]
+    # (plane, row, col) axes from (col, row, plane) coordinates
+    return src[::-1].reshape((3, ) + output_shape)
+
+
 def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
-         mode='constant', cval=0., clip=True, preserve_range=False):
+         mode='constant', cval=0., clip=True, preserve_range=False,
+         num_threads=1):
     """Warp an image according to a given coordinate transformation.
 
     Parameters
@@ -679,6 +945,9 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
          - For 2-D images, you can pass a ``(3, 3)`` homogeneous
            transformation matrix, e.g.
            `skimage.transform.SimilarityTransform.params`.
+         - For 3-D images, you can pass a ``(4, 4)`` homogeneous
+           transformation matrix, which maps ``(col, row, plane)``
+           coordinates in the output image to the input image.
          - For 2-D images, a function that transforms a ``(M, 2)`` array of
            ``(col, row)`` coordinates in the output image to their
            corresponding coordinates in the input image. Extra parameters to
@@ -694,7 +963,8 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
 
         Note, that a ``(3, 3)`` matrix is interpreted as a homogeneous
         transformation matrix, so you cannot interpolate values from a 3-D
-        input, if the output is of shape ``(3,)``.
+        input, if the output is of shape ``(3,)``. Likewise, a ``(4, 4)``
+        matrix is always interpreted as a homogeneous transformation matrix.
 
         See example section for usage.
     map_args : dict, optional
@@ -726,19 +996,26 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
         image is converted according to the conventions of `img_as_float`.
         Also see
         https://scikit-image.org/docs/dev/user_guide/data_types.html
+    num_threads : int, optional
+        Number of threads used by the fast routine described in the notes,
+        each processing a part of the output rows.
 
     Returns
     -------
-    warped : double ndarray
-        The warped input image.
+    warped : float ndarray
+        The warped input image. Its type is float32 for float32 images and
+        double otherwise.
 
     Notes
     -----
-    - The input image is converted to a `double` image.
+    - The input image is converted to a floating point image.
     - In case of a `SimilarityTransform`, `AffineTransform` and
-      `ProjectiveTransform` and `order` in [0, 3] this function uses the
-      underlying transformation matrix to warp the image with a much faster
-      routine.
+      `ProjectiveTransform`, or of a ``(3, 3)`` or ``(4, 4)`` matrix, and
+      `order` in [0, 1, 3] this function uses the underlying transformation
+      matrix to warp the image with a much faster routine. This routine
+      interpolates all the channels in a single pass, reads integer and
+      float32 images without converting them first and can run on several
+      threads.
 
     Examples
     --------
@@ -800,8 +1077,6 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
     if image.size == 0:
         raise ValueError("Cannot warp empty image with dimensions", image.shape)
 
-    image = convert_to_float(image, preserve_range)
-
     input_shape = np.array(image.shape)
 
     if output_shape is None:
@@ -825,35 +1100,23 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
     if order in (0, 1, 3) and not map_args:
         # use fast Cython version for specific interpolation orders and input
 
-        matrix = None
-
-        if isinstance(inverse_map, np.ndarray) and inverse_map.shape == (3, 3):
-            # inverse_map is a transformation matrix as numpy array
-            matrix = inverse_map
-
-        elif isinstance(inverse_map, HOMOGRAPHY_TRANSFORMS):
-            # inverse_map is a homography
-            matrix = inverse_map.params
-
-        elif (hasattr(inverse_map, '__name__') and
-              inverse_map.__name__ == 'inverse' and
-              get_bound_method_class(inverse_map) in HOMOGRAPHY_TRANSFORMS):
-            # inverse_map is the inverse of a homography
-            matrix = np.linalg.inv(inverse_map.__self__.params)
-
-        if matrix is not None:
-            matrix = matrix.astype(np.double)
-            if image.ndim == 2:
-                warped = _warp_fast(image, matrix,
-                                    output_shape=output_shape,
-                                    order=order, mode=mode, cval=cval)
-            elif image.ndim == 3:
-                dims = []
-                for dim in range(image.shape[2]):
-                    dims.append(_warp_fast(image[..., dim], matrix,
-                                           output_shape=output_shape,
-                                           order=order, mode=mode, cval=cval))
-                warped = np.dstack(dims)
+        # transformation matrix of a homography or of its inverse
+        matrix = _inverse_matrix(inverse_map)
+
+        ndim = None if matrix is None else matrix.shape[0] - 1
+        if matrix is not None and image.ndim in (ndim, ndim + 1):
+            # the fast routine converts the values to float on the fly
+            image, scale, offset = _warp_fast_input(image, preserve_range)
+            warped = _warp_fast(image, matrix.astype(np.double),
+                                output_shape=output_shape, order=order,
+                                mode=mode, cval=cval, scale=scale,
+                                offset=offset, num_threads=num_threads)
+            input_range = (np.array([image.min(), image.max()],
+                                    dtype=np.double) + offset) * scale
+            _clip_warp_output(input_range, warped, order, mode, cval, clip)
+            return warped
+
+    image = convert_to_float(image, preserve_range)
 
     if warped is None:
         # use ndi.map_coordinates
@@ -864,6 +1127,25 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
             # this is only used for order >= 4.
             inverse_map = ProjectiveTransform(matrix=inverse_map)
 
+        elif (isinstance(inverse_map, np.ndarray) and
+                inverse_map.shape == (4, 4)):
+            # inverse_map is a 3-D transformation matrix as numpy array,
+            # this is only used for orders 2, 4 and 5.
+            if image.ndim not in (3, 4):
+                raise ValueError("A (4, 4) `inverse_map` requires a 3-D "
+                                 "image, with or without channels.")
+            inverse_map = _matrix_coords(inverse_map, output_shape[:3])
+            if image.ndim == 4:
+                # interpolate the channels independently, as the fast routine
+                ndi_mode = _to_ndimage_mode(mode)
+                warped = np.stack([
+                    ndi.map_coordinates(image[..., channel], inverse_map,
+                                        mode=ndi_mode, order=order,
+                                        cval=cval)
+                    for channel in range(image.shape[3])], axis=-1)
+                _clip_warp_output(image, warped, order, mode, cval, clip)
+                return warped
+
         if isinstance(inverse_map, np.ndarray):
             # inverse_map is directly given as coordinates
             coords = inverse_map
@@ -899,3 +1181,241 @@ def warp(image, inverse_map, map_args={}, output_shape=None, order=1,
     _clip_warp_output(image, warped, order, mode, cval, clip)
 
     return warped
+
+
+def _inverse_matrix(inverse_map):
+    """Homogeneous matrix of `inverse_map`, or None if it has none."""
+    if (isinstance(inverse_map, np.ndarray) and
+            inverse_map.shape in ((3, 3), (4, 4))):
+        return inverse_map.astype(np.double)
+    if isinstance(inverse_map, HOMOGRAPHY_TRANSFORMS):
+        return inverse_map.params
+    if (hasattr(inverse_map, '__name__') and
+            inverse_map.__name__ == 'inverse' and
+            get_bound_method_class(inverse_map) in HOMOGRAPHY_TRANSFORMS):
+        return np.linalg.inv(inverse_map.__self__.params)
+    return None
+
+
+class WarpPlan(object):
+    """Precomputed warp of images of a given shape.
+
+    A plan stores, for every output pixel, the input pixels it is
+    interpolated from and their weights, so that warping an image is a single
+    weighted gather. Use `make_warp_plan` to build one.
+
+    Parameters
+    ----------
+    index : (N, n_taps) array of int32 or int64
+        Flat index of the input pixels of each of the `N` output pixels, -1
+        for `cval`.
+    weights : (N, n_taps) array of float32 or float64
+        Weights of the input pixels.
+    input_shape : tuple
+        Shape of the input images, without the channel axis.
+    output_shape : tuple
+        Shape of the output images, without the channel axis.
+    order : int, optional
+        Order of interpolation.
+    mode : str, optional
+        Mode of the points outside the boundaries of the input.
+    cval : float, optional
+        Value of the output pixels outside the input in mode 'constant'.
+
+    Attributes
+    ----------
+    nbytes : int
+        Memory used by the index and weights of the plan.
+
+    """
+
+    def __init__(self, index, weights, input_shape, output_shape, order=1,
+                 mode='constant', cval=0.):
+        self.index = index
+        self.weights = weights
+        self.input_shape = tuple(input_shape)
+        self.output_shape = tuple(output_shape)
+        self.order = order
+        self.mode = mode
+        self.cval = cval
+
+    @property
+    def nbytes(self):
+        return self.index.nbytes + self.weights.nbytes
+
+    def __call__(self, image, clip=True, preserve_range=False,
+                 num_threads=1):
+        """Warp an image.
+
+        Parameters
+        ----------
+        image : ndarray
+            Input image, of shape ``input_shape`` with an optional channel
+            axis.
+        clip : bool, optional
+            Whether to clip the output to the range of values of the input
+            image.
+        preserve_range : bool, optional
+            Whether to keep the original range of values. Otherwise, the input
+            image is converted according to the conventions of
+            `img_as_float`.
+        num_threads : int, optional
+            Number of threads, each processing a part of the output pixels.
+
+        Returns
+        -------
+        warped : float ndarray
+            The warped image, of shape ``output_shape`` followed by the
+            channel axis of `image`. Its type is float32 for float32 images
+            and double otherwise.
+
+        """
+        ndim = len(self.input_shape)
+        if (image.shape[:ndim] != self.input_shape or
+                image.ndim not in (ndim, ndim + 1)):
+            raise ValueError("The plan warps images of shape {}, with an "
+                             "optional channel axis, not {}."
+                             .format(self.input_shape, image.shape))
+        channel_shape = image.shape[ndim:]
+
+        image, scale, offset = _warp_fast_input(image, preserve_range)
+        input_range = (np.array([image.min(), image.max()], dtype=np.double)
+                       + offset) * scale
+        image = np.ascontiguousarray(_kernel_input(image))
+        out_dtype = np.float32 if image.dtype == np.float32 else np.double
+
+        warped = np.empty((len(self.index), int(np.prod(channel_shape))),
+                          dtype=out_dtype)
+        _gather(image.reshape(-1, warped.shape[1]), warped, self.index,
+                self.weights, self.cval / scale - offset, num_threads)
+        if scale != 1 or offset != 0:
+            warped += offset
+            warped *= scale
+        warped = warped.reshape(self.output_shape + channel_shape)
+
+        _clip_warp_output(input_range, warped, self.order, self.mode,
+                          self.cval, clip)
+        return warped
+
+
+def make_warp_plan(inverse_map, input_shape, output_shape=None, order=1,
+                   mode='constant', cval=0., map_args={}, dtype=np.float32):
+    """Precompute the warp of images of a given shape.
+
+    The inverse map is evaluated once, and the returned plan warps images of
+    shape `input_shape` by gathering and weighting their pixels, e.g. to apply
+    a transform to the frames of a video.
+
+    Parameters
+    ----------
+    inverse_map : transformation object, callable ``cr = f(cr, **kwargs)``, or ndarray
+        Inverse coordinate map, which transforms coordinates in the output
+        images into their corresponding coordinates in the input image. See
+        `warp`.
+    input_shape : tuple
+        Shape of the input images. A trailing channel axis is ignored.
+    output_shape : tuple, optional
+        Shape of the output images, without the channel axis. By default the
+        shape of the input images, or of the coordinates array.
+    order : {0, 1, 3}, optional
+        Order of interpolation: nearest neighbor, linear (default) or cubic
+        convolution.
+    mode : {'constant', 'edge', 'symmetric', 'reflect', 'wrap'}, optional
+        Points outside the boundaries of the input are filled according
+        to the given mode.  Modes match the behaviour of `numpy.pad`.
+    cval : float, optional
+        Used in conjunction with mode 'constant', the value outside
+        the image boundaries.
+    map_args : dict, optional
+        Keyword arguments passed to `inverse_map`.
+    dtype : {np.float32, np.float64}, optional
+        Type of the interpolation weights. Single precision halves the
+        memory of the plan.
+
+    Returns
+    -------
+    plan : WarpPlan
+        Callable warping images, see `WarpPlan.__call__`.
+
+    Notes
+    -----
+    The plan interpolates with the kernels and boundary modes of the fast
+    routine of `warp`, so that it gives the same result as `warp` for
+    homographies, up to the precision of the weights. For other maps, the
+    results of modes 'constant' and 'wrap' can differ from those of `warp`
+    within a pixel of the image boundaries.
+
+    Each output pixel stores ``(order + 1) ** ndim`` weights and indices,
+    indices being 32-bit integers for images of less than 2**31 pixels.
+
+    Examples
+    --------
+    >>> from skimage.transform import SimilarityTransform, make_warp_plan
+    >>> frames = np.random.rand(10, 32, 32)
+    >>> tform = SimilarityTransform(rotation=0.1, translation=(2, -1))
+    >>> plan = make_warp_plan(tform, frames.shape[1:])
+    >>> stabilized = np.stack([plan(frame) for frame in frames])
+    >>> stabilized.shape
+    (10, 32, 32)
+
+    """
+    if order not in (0, 1, 3):
+        raise ValueError("Warp plans support orders 0, 1 and 3.")
+    if mode not in ('constant', 'edge', 'symmetric', 'reflect', 'wrap'):
+        raise ValueError("Invalid mode specified.  Please use `constant`, "
+                         "`edge`, `wrap`, `reflect` or `symmetric`.")
+
+    matrix = None if map_args else _inverse_matrix(inverse_map)
+    if matrix is not None:
+        ndim = matrix.shape[0] - 1
+    elif isinstance(inverse_map, np.ndarray):
+        ndim = inverse_map.shape[0]
+        output_shape = inverse_map.shape[1:]
+    else:
+        ndim = 2
+    input_shape = tuple(input_shape[:ndim])
+    if output_shape is None:
+        output_shape = input_shape
+    output_shape = tuple(safe_as_int(output_shape)[:ndim])
+
+    # input coordinates of the output pixels, in (row, col[, ...]) order
+    if matrix is not None:
+        grid = np.indices(output_shape[::-1], dtype=np.double)
+        grid = np.concatenate([grid.reshape(ndim, -1),
+                               np.ones((1, grid[0].size))])
+        coords = matrix.dot(grid)
+        coords = coords[:ndim] / coords[ndim]
+        coords = coords.reshape((ndim,) + output_shape[::-1]).T[..., ::-1]
+        coords = np.moveaxis(coords, -1, 0)
+    elif isinstance(inverse_map, np.ndarray):
+        coords = inverse_map
+    else:
+        def coord_map(*args):
+            return inverse_map(*args, **map_args)
+        coords = warp_coords(coord_map, output_shape)
+    coords = np.asarray(coords, dtype=np.double).reshape(ndim, -1)
+
+    # combine the taps of every axis
+    index = np.zeros((coords.shape[1], 1), dtype=np.intp)
+    weights = np.ones((coords.shape[1], 1))
+    for axis in range(ndim):
+        axis_index, axis_weights = _interpolation_taps(
+            coords[axis], input_shape[axis], order, mode)
+        outside = (index[:, :, None] < 0) | (axis_index[:, None, :] < 0)
+        index = index[:, :, None] * input_shape[axis] + axis_index[:, None, :]
+        index[outside] = -1
+        index = index.reshape(len(index), -1)
+        weights = (weights[:, :, None] *
+                   axis_weights[:, None, :]).reshape(len(weights), -1)
+
+    # output pixels outside the image are exactly cval, as in `warp`
+    outside = np.all(index < 0, axis=1)
+    weights[outside] = 0
+    weights[outside, 0] = 1
+
+    if np.prod(input_shape) < 2 ** 31:
+        index = index.astype(np.int32)
+    return WarpPlan(np.ascontiguousarray(index),
+                    np.ascontiguousarray(weights, dtype=dtype),
+                    input_shape, output_shape, order=order, mode=mode,
+                    cval=cval)
@@ -4,74 +4,246 @@
 #cython: wraparound=False
 import numpy as np
 cimport numpy as cnp
-from .._shared.interpolation cimport (nearest_neighbour_interpolation,
-                                      bilinear_interpolation,
-                                      biquadratic_interpolation,
-                                      bicubic_interpolation)
+from libc.math cimport ceil, floor
+from cython.parallel import prange
+from .._shared.fused_numerics cimport np_real_numeric, np_floats
+from .._shared.interpolation cimport coord_map
 
 
-cdef inline void _transform_metric(double x, double y, double* H,
-                                   double *x_, double *y_) nogil:
-    """Apply a metric transformation to a coordinate.
+ctypedef fused index_t:
+    cnp.int32_t
+    cnp.int64_t
 
-    Parameters
-    ----------
-    x, y : double
-        Input coordinate.
-    H : (3,3) *double
-        Transformation matrix.
-    x_, y_ : *double
-        Output coordinate.
+ctypedef fused weight_t:
+    cnp.float32_t
+    cnp.float64_t
+
+
+# image types interpolated without conversion
+_KERNEL_TYPES = (np.uint8, np.uint16, np.uint32, np.uint64,
+                 np.int8, np.int16, np.int32, np.int64,
+                 np.float32, np.float64)
+
+
+cdef inline Py_ssize_t _round(double r) nogil:
+    return <Py_ssize_t>((r + 0.5) if (r > 0.0) else (r - 0.5))
+
+
+cdef inline Py_ssize_t _tap_index(Py_ssize_t dim, long coord,
+                                  char mode) nogil:
+    """Index of a tap along an axis, or -1 outside the image in mode 'C'."""
+    if mode == b'C':
+        if coord < 0 or coord >= dim:
+            return -1
+        return coord
+    return coord_map(dim, coord, mode)
+
+
+cdef inline double _taps(double x, int order, Py_ssize_t dim, char mode,
+                         Py_ssize_t* index) nogil:
+    """Indices of the interpolation taps of coordinate `x` along an axis.
 
+    Returns the position of `x` relative to its lower tap.
     """
-    x_[0] = H[0] * x + H[2]
-    y_[0] = H[4] * y + H[5]
+    cdef long low = <long>floor(x)
+    cdef int k
+    if order == 0:
+        index[0] = _tap_index(dim, _round(x), mode)
+        return 0
+    elif order == 1:
+        index[0] = _tap_index(dim, low, mode)
+        index[1] = _tap_index(dim, <long>ceil(x), mode)
+    else:
+        for k in range(4):
+            index[k] = _tap_index(dim, low - 1 + k, mode)
+    return x - low
 
 
-cdef inline void _transform_affine(double x, double y, double* H,
-                                   double *x_, double *y_) nogil:
-    """Apply an affine transformation to a coordinate.
+cdef inline double _cubic(double x, double* f) nogil:
+    """Catmull-Rom interpolation at `x` in [0, 1] of values at [-1, 0, 1, 2].
+    """
+    return (f[1] + 0.5 * x *
+            (f[2] - f[0] + x *
+             (2.0 * f[0] - 5.0 * f[1] + 4.0 * f[2] - f[3] + x *
+              (3.0 * (f[1] - f[2]) + f[3] - f[0]))))
 
-    Parameters
-    ----------
-    x, y : double
-        Input coordinate.
-    H : (3,3) *double
-        Transformation matrix.
-    x_, y_ : *double
-        Output coordinate.
 
+cdef inline double _pixel(np_real_numeric* image, Py_ssize_t rows,
+                          Py_ssize_t cols, Py_ssize_t channels,
+                          Py_ssize_t p, Py_ssize_t r, Py_ssize_t c,
+                          Py_ssize_t channel, double cval) nogil:
+    if p < 0 or r < 0 or c < 0:
+        return cval
+    return <double>image[((p * rows + r) * cols + c) * channels + channel]
+
+
+cdef inline double _interpolate_plane(np_real_numeric* image, Py_ssize_t rows,
+                                      Py_ssize_t cols, Py_ssize_t channels,
+                                      Py_ssize_t p, Py_ssize_t channel,
+                                      int order, Py_ssize_t* r_index,
+                                      Py_ssize_t* c_index, double dr,
+                                      double dc, double cval) nogil:
+    """Interpolate one channel of plane `p` at the given row and col taps."""
+    cdef double top, bottom
+    cdef double fc[4]
+    cdef double fr[4]
+    cdef int pr, pc
+
+    if order == 0:
+        return _pixel(image, rows, cols, channels, p, r_index[0], c_index[0],
+                      channel, cval)
+    elif order == 1:
+        top = ((1 - dc) * _pixel(image, rows, cols, channels, p, r_index[0],
+                                 c_index[0], channel, cval) +
+               dc * _pixel(image, rows, cols, channels, p, r_index[0],
+                           c_index[1], channel, cval))
+        bottom = ((1 - dc) * _pixel(image, rows, cols, channels, p,
+                                    r_index[1], c_index[0], channel, cval) +
+                  dc * _pixel(image, rows, cols, channels, p, r_index[1],
+                              c_index[1], channel, cval))
+        return (1 - dr) * top + dr * bottom
+    else:
+        for pr in range(4):
+            for pc in range(4):
+                fc[pc] = _pixel(image, rows, cols, channels, p, r_index[pr],
+                                c_index[pc], channel, cval)
+            fr[pr] = _cubic(dc, fc)
+        return _cubic(dr, fr)
+
+
+cdef inline bint _all_outside(Py_ssize_t* index, int n_taps) nogil:
+    cdef int k
+    for k in range(n_taps):
+        if index[k] >= 0:
+            return False
+    return True
+
+
+cdef void _warp_row(np_real_numeric* image, np_floats* out,
+                    Py_ssize_t planes, Py_ssize_t rows, Py_ssize_t cols,
+                    Py_ssize_t channels, Py_ssize_t out_cols,
+                    Py_ssize_t out_p, Py_ssize_t out_r, double* M,
+                    Py_ssize_t ndim, bint projective, int order, char mode,
+                    double cval, double scale, double offset) nogil:
+    """Warp the output row `out_r` of the output plane `out_p`.
+
+    The output value of an interpolated input value ``v`` is
+    ``(v + offset) * scale``.
     """
-    x_[0] = H[0] * x + H[1] * y + H[2]
-    y_[0] = H[3] * x + H[4] * y + H[5]
+    cdef Py_ssize_t out_c, channel, k, j
+    cdef Py_ssize_t p_index[4]
+    cdef Py_ssize_t r_index[4]
+    cdef Py_ssize_t c_index[4]
+    cdef double fp[4]
+    cdef double position[3]
+    cdef double source[3]
+    cdef double dp = 0, dr, dc, w, value
+    cdef double cval_in = cval / scale - offset
+    cdef int n_taps = 1 if order == 0 else (2 if order == 1 else 4)
+    cdef np_floats* out_pixel
+    cdef bint outside
 
+    # output coordinates in (col, row, plane) order
+    position[1] = out_r
+    position[2] = out_p
 
-cdef inline void _transform_projective(double x, double y, double* H,
-                                       double *x_, double *y_) nogil:
-    """Apply a homography to a coordinate.
+    for out_c in range(out_cols):
+        position[0] = out_c
+        for j in range(ndim):
+            source[j] = 0
+            for k in range(ndim):
+                source[j] += M[j * (ndim + 1) + k] * position[k]
+            source[j] += M[j * (ndim + 1) + ndim]
+        if projective:
+            w = 0
+            for k in range(ndim):
+                w += M[ndim * (ndim + 1) + k] * position[k]
+            w += M[ndim * (ndim + 1) + ndim]
+            for j in range(ndim):
+                source[j] /= w
+
+        dc = _taps(source[0], order, cols, mode, c_index)
+        dr = _taps(source[1], order, rows, mode, r_index)
+        outside = (_all_outside(c_index, n_taps) or
+                   _all_outside(r_index, n_taps))
+        if ndim == 3:
+            dp = _taps(source[2], order, planes, mode, p_index)
+            outside = outside or _all_outside(p_index, n_taps)
+        else:
+            p_index[0] = 0
+
+        out_pixel = &out[out_c * channels]
+        for channel in range(channels):
+            if outside:
+                out_pixel[channel] = <np_floats>cval
+                continue
+            if ndim == 2 or order == 0:
+                value = _interpolate_plane(image, rows, cols, channels,
+                                           p_index[0], channel, order,
+                                           r_index, c_index, dr, dc, cval_in)
+            else:
+                for k in range(n_taps):
+                    fp[k] = _interpolate_plane(image, rows, cols, channels,
+                                               p_index[k], channel, order,
+                                               r_index, c_index, dr, dc,
+                                               cval_in)
+                if order == 1:
+                    value = (1 - dp) * fp[0] + dp * fp[1]
+                else:
+                    value = _cubic(dp, fp)
+            out_pixel[channel] = <np_floats>((value + offset) * scale)
 
-    Parameters
-    ----------
-    x, y : double
-        Input coordinate.
-    H : (3,3) *double
-        Transformation matrix.
-    x_, y_ : *double
-        Output coordinate.
 
+def _warp_kernel(np_real_numeric[:, :, :, ::1] image,
+                 np_floats[:, :, :, ::1] out, double[:, ::1] M,
+                 int order, char mode, double cval, double scale,
+                 double offset, Py_ssize_t num_threads):
+    """Warp a ``(planes, rows, cols, channels)`` image into `out`.
+
+    `M` is a ``(3, 3)`` matrix for images with a single plane and a
+    ``(4, 4)`` matrix otherwise, mapping ``(col, row[, plane])`` output
+    coordinates to input coordinates.
     """
-    cdef double z_
-    z_ = H[6] * x + H[7] * y + H[8]
-    x_[0] = (H[0] * x + H[1] * y + H[2]) / z_
-    y_[0] = (H[3] * x + H[4] * y + H[5]) / z_
+    cdef Py_ssize_t ndim = M.shape[0] - 1
+    cdef Py_ssize_t planes = image.shape[0]
+    cdef Py_ssize_t rows = image.shape[1]
+    cdef Py_ssize_t cols = image.shape[2]
+    cdef Py_ssize_t channels = image.shape[3]
+    cdef Py_ssize_t out_rows = out.shape[1]
+    cdef Py_ssize_t out_cols = out.shape[2]
+    cdef Py_ssize_t n_lines = out.shape[0] * out_rows
+    cdef Py_ssize_t line, k
+    cdef bint projective = False
+
+    for k in range(ndim):
+        if M[ndim, k] != 0:
+            projective = True
+    if M[ndim, ndim] != 1:
+        projective = True
+
+    cdef np_real_numeric* image_data = &image[0, 0, 0, 0]
+    cdef np_floats* out_data = &out[0, 0, 0, 0]
+    cdef double* M_data = &M[0, 0]
+
+    if num_threads < 1:
+        num_threads = 1
+
+    with nogil:
+        for line in prange(n_lines, num_threads=num_threads,
+                           schedule='static'):
+            _warp_row(image_data, &out_data[line * out_cols * channels],
+                      planes, rows, cols, channels, out_cols,
+                      line // out_rows, line % out_rows, M_data, ndim,
+                      projective, order, mode, cval, scale, offset)
 
 
-def _warp_fast(cnp.ndarray image, cnp.ndarray H, output_shape=None,
-               int order=1, mode='constant', double cval=0):
+def _warp_fast(image, H, output_shape=None,
+               int order=1, mode='constant', double cval=0,
+               double scale=1, double offset=0, Py_ssize_t num_threads=1):
     """Projective transformation (homography).
 
-    Perform a projective transformation (homography) of a
-    floating point image, using interpolation.
+    Perform a projective transformation (homography) of an image, using
+    interpolation.
 
     For each pixel, given its homogeneous coordinate :math:`\mathbf{x}
     = [x, y, 1]^T`, its target position is calculated by multiplying
@@ -88,26 +260,42 @@ def _warp_fast(cnp.ndarray image, cnp.ndarray H, output_shape=None,
        [0 1 20]
        [0 0 1 ]].
 
+    Volumes are transformed by a ``(4, 4)`` matrix acting on the homogeneous
+    coordinate :math:`[x, y, z, 1]^T`, where `z` is the plane index.
+
     Parameters
     ----------
-    image : 2-D array
-        Input image.
-    H : array of shape ``(3, 3)``
-        Transformation matrix H that defines the homography.
-    output_shape : tuple (rows, cols), optional
+    image : (rows, cols[, channels]) or (planes, rows, cols[, channels]) array
+        Input image. Floating point and integer images are interpolated
+        without conversion, all the channels in a single pass.
+    H : array of shape ``(3, 3)`` or ``(4, 4)``
+        Transformation matrix H that defines the homography, ``(4, 4)`` for
+        volumes.
+    output_shape : tuple (rows, cols) or (planes, rows, cols), optional
         Shape of the output image generated (default None).
-    order : {0, 1, 2, 3}, optional
+    order : {0, 1, 3}, optional
         Order of interpolation::
         * 0: Nearest-neighbor
         * 1: Bi-linear (default)
-        * 2: Bi-quadratic
         * 3: Bi-cubic
     mode : {'constant', 'edge', 'symmetric', 'reflect', 'wrap'}, optional
         Points outside the boundaries of the input are filled according
         to the given mode.  Modes match the behaviour of `numpy.pad`.
-    cval : string, optional (default 0)
-        Used in conjunction with mode 'C' (constant), the value
+    cval : float, optional (default 0)
+        Used in conjunction with mode 'C' (constant), the output value
         outside the image boundaries.
+    scale, offset : float, optional
+        An interpolated input value ``v`` gives the output value
+        ``(v + offset) * scale``, e.g. to convert integer images to the
+        conventions of `img_as_float` on the fly.
+    num_threads : int, optional
+        Number of threads, each processing a part of the output rows.
+
+    Returns
+    -------
+    out : array
+        Warped image, of type float32 for float32 images and float64
+        otherwise.
 
     Notes
     -----
@@ -119,56 +307,180 @@ def _warp_fast(cnp.ndarray image, cnp.ndarray H, output_shape=None,
 
     """
 
-    cdef double[:, ::1] img = np.ascontiguousarray(image, dtype=np.double)
-    cdef double[:, ::1] M = np.ascontiguousarray(H)
+    cdef double[:, ::1] M = np.ascontiguousarray(H, dtype=np.double)
+    cdef Py_ssize_t ndim = M.shape[0] - 1
+
+    if ndim not in (2, 3) or M.shape[1] != ndim + 1:
+        raise ValueError("The transformation matrix must have shape (3, 3) "
+                         "or (4, 4).")
+    if image.ndim not in (ndim, ndim + 1):
+        raise ValueError("A ({0}, {0}) matrix requires a {1}-D image, with "
+                         "an optional channel axis."
+                         .format(ndim + 1, ndim))
 
     if mode not in ('constant', 'wrap', 'symmetric', 'reflect', 'edge'):
         raise ValueError("Invalid mode specified.  Please use `constant`, "
                          "`edge`, `wrap`, `reflect` or `symmetric`.")
     cdef char mode_c = ord(mode[0].upper())
 
-    cdef Py_ssize_t out_r, out_c
+    if order not in (0, 1, 3):
+        raise ValueError("Unsupported interpolation order", order)
+
+    if image.dtype == bool:
+        image = image.view(np.uint8)
+    elif (image.dtype.type not in _KERNEL_TYPES or
+            not image.dtype.isnative):
+        image = image.astype(np.double)
+    image = np.ascontiguousarray(image)
+
+    spatial_shape = tuple(image.shape[:ndim])
+    channel_shape = tuple(image.shape[ndim:])
+    channels = image.shape[ndim] if image.ndim > ndim else 1
     if output_shape is None:
-        out_r = int(img.shape[0])
-        out_c = int(img.shape[1])
+        output_shape = spatial_shape
     else:
-        out_r = int(output_shape[0])
-        out_c = int(output_shape[1])
+        output_shape = tuple(int(n) for n in output_shape[:ndim])
+
+    # every image is warped as (planes, rows, cols, channels)
+    padding = (1,) * (3 - ndim)
+    image = image.reshape(padding + spatial_shape + (channels,))
+    out_dtype = np.float32 if image.dtype == np.float32 else np.double
+    out = np.zeros(padding + output_shape + (channels,), dtype=out_dtype)
+
+    if out.size:
+        _warp_kernel(image, out, M, order, mode_c, cval, scale, offset,
+                     num_threads)
 
-    cdef double[:, ::1] out = np.zeros((out_r, out_c), dtype=np.double)
+    return out.reshape(output_shape + channel_shape)
 
-    cdef Py_ssize_t tfr, tfc
-    cdef double r, c
-    cdef Py_ssize_t rows = img.shape[0]
-    cdef Py_ssize_t cols = img.shape[1]
 
-    cdef void (*transform_func)(double, double, double*, double*, double*) nogil
-    if M[2, 0] == 0 and M[2, 1] == 0 and M[2, 2] == 1:
-        if M[0, 1] == 0 and M[1, 0] == 0:
-            transform_func = _transform_metric
+def _tap_indices(Py_ssize_t[::1] coords, Py_ssize_t dim, mode):
+    """Indices of the taps `coords` along an axis of length `dim`.
+
+    Taps outside the image are mapped according to `mode`, or to -1 in
+    constant mode.
+    """
+    cdef char mode_c = ord(mode[0].upper())
+    cdef Py_ssize_t[::1] index = np.empty(coords.shape[0], dtype=np.intp)
+    cdef Py_ssize_t k
+    for k in range(coords.shape[0]):
+        index[k] = _tap_index(dim, coords[k], mode_c)
+    return np.asarray(index)
+
+
+cdef void _resample_line(np_real_numeric* image, np_floats* out,
+                         Py_ssize_t n_in, Py_ssize_t inner,
+                         Py_ssize_t* index, double* weights,
+                         Py_ssize_t n_taps, double cval) nogil:
+    """Weighted sum of `n_taps` input lines into the output line `out`."""
+    cdef Py_ssize_t k, t, j
+    cdef double w
+    cdef np_real_numeric* line
+
+    for t in range(inner):
+        out[t] = 0
+    for k in range(n_taps):
+        w = weights[k]
+        if w == 0:
+            continue
+        j = index[k]
+        if j < 0:
+            for t in range(inner):
+                out[t] += <np_floats>(w * cval)
         else:
-            transform_func = _transform_affine
-    else:
-        transform_func = _transform_projective
+            line = &image[j * inner]
+            for t in range(inner):
+                out[t] += <np_floats>(w * line[t])
 
-    cdef void (*interp_func)(double*, Py_ssize_t , Py_ssize_t ,
-                             double, double, char, double, double*) nogil
-    if order == 0:
-        interp_func = nearest_neighbour_interpolation[cnp.float64_t, double, double]
-    elif order == 1:
-        interp_func = bilinear_interpolation[cnp.float64_t, double, double]
-    elif order == 2:
-        interp_func = biquadratic_interpolation[cnp.float64_t, double, double]
-    elif order == 3:
-        interp_func = bicubic_interpolation[cnp.float64_t, double, double]
-    else:
-        raise ValueError("Unsupported interpolation order", order)
+
+def _resample_axis(np_real_numeric[:, :, ::1] image,
+                   np_floats[:, :, ::1] out, Py_ssize_t[:, ::1] index,
+                   double[:, ::1] weights, double cval,
+                   Py_ssize_t num_threads=1):
+    """Resample the middle axis of an ``(outer, n_in, inner)`` image.
+
+    Output line ``i`` is the sum of the input lines ``index[i]`` weighted by
+    ``weights[i]``, lines of index -1 having the value `cval`.
+    """
+    cdef Py_ssize_t outer = image.shape[0]
+    cdef Py_ssize_t n_in = image.shape[1]
+    cdef Py_ssize_t inner = image.shape[2]
+    cdef Py_ssize_t n_out = out.shape[1]
+    cdef Py_ssize_t n_taps = index.shape[1]
+    cdef Py_ssize_t line, o, i
+
+    if out.size == 0 or image.size == 0:
+        return
+
+    cdef np_real_numeric* image_data = &image[0, 0, 0]
+    cdef np_floats* out_data = &out[0, 0, 0]
+    cdef Py_ssize_t* index_data = &index[0, 0]
+    cdef double* weights_data = &weights[0, 0]
+
+    if num_threads < 1:
+        num_threads = 1
 
     with nogil:
-        for tfr in range(out_r):
-            for tfc in range(out_c):
-                transform_func(tfc, tfr, &M[0, 0], &c, &r)
-                interp_func(&img[0, 0], rows, cols, r, c,
-                            mode_c, cval, &out[tfr, tfc])
+        for line in prange(outer * n_out, num_threads=num_threads,
+                           schedule='static'):
+            o = line // n_out
+            i = line % n_out
+            _resample_line(&image_data[o * n_in * inner],
+                           &out_data[line * inner], n_in, inner,
+                           &index_data[i * n_taps],
+                           &weights_data[i * n_taps], n_taps, cval)
+
+
+cdef void _gather_pixel(np_real_numeric* image, np_floats* out,
+                        Py_ssize_t channels, index_t* index,
+                        weight_t* weights, Py_ssize_t n_taps,
+                        double cval) nogil:
+    """Weighted sum of the `n_taps` input pixels of an output pixel."""
+    cdef Py_ssize_t k, channel
+    cdef double w
+    cdef np_real_numeric* pixel
+
+    for channel in range(channels):
+        out[channel] = 0
+    for k in range(n_taps):
+        w = weights[k]
+        if w == 0:
+            continue
+        if index[k] < 0:
+            for channel in range(channels):
+                out[channel] += <np_floats>(w * cval)
+        else:
+            pixel = &image[index[k] * channels]
+            for channel in range(channels):
+                out[channel] += <np_floats>(w * pixel[channel])
+
+
+def _gather(np_real_numeric[:, ::1] image, np_floats[:, ::1] out,
+            index_t[:, ::1] index, weight_t[:, ::1] weights, double cval,
+            Py_ssize_t num_threads=1):
+    """Interpolate the pixels of an ``(n_in, channels)`` image.
+
+    Output pixel ``i`` is the sum of the input pixels ``index[i]`` weighted by
+    ``weights[i]``, pixels of index -1 having the value `cval`.
+    """
+    cdef Py_ssize_t channels = image.shape[1]
+    cdef Py_ssize_t n_out = out.shape[0]
+    cdef Py_ssize_t n_taps = index.shape[1]
+    cdef Py_ssize_t i
 
-    return np.asarray(out)
+    if out.size == 0 or image.size == 0:
+        return
+
+    cdef np_real_numeric* image_data = &image[0, 0]
+    cdef np_floats* out_data = &out[0, 0]
+    cdef index_t* index_data = &index[0, 0]
+    cdef weight_t* weights_data = &weights[0, 0]
+
+    if num_threads < 1:
+        num_threads = 1
+
+    with nogil:
+        for i in prange(n_out, num_threads=num_threads, schedule='static'):
+            _gather_pixel(image_data, &out_data[i * channels], channels,
+                          &index_data[i * n_taps], &weights_data[i * n_taps],
+                          n_taps, cval)
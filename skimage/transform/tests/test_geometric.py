@@ -195,6 +195,87 @@ def test_piecewise_affine():
     assert_almost_equal(tform.inverse(DST), SRC)
 
 
+@testing.parametrize('tform_class, min_samples',
+                     [(EuclideanTransform, 2), (SimilarityTransform, 2),
+                      (AffineTransform, 3), (ProjectiveTransform, 4),
+                      (ProjectiveTransform, 6)])
+def test_estimate_batch(tform_class, min_samples):
+    random_state = np.random.RandomState(0)
+    src = 100 * random_state.random_sample((20, min_samples, 2))
+    tform0 = SimilarityTransform(scale=0.7, rotation=0.5,
+                                 translation=(5, -3))
+    dst = tform0(src.reshape(-1, 2)).reshape(src.shape)
+    dst += random_state.normal(size=dst.shape)
+    # degenerate set
+    src[3] = src[3, 0]
+
+    params, success = tform_class.estimate_batch(src, dst)
+    assert_equal(success, np.arange(20) != 3)
+    assert np.all(np.isnan(params[3]))
+
+    coords = 100 * random_state.random_sample((30, 2))
+    residuals = tform_class.residuals_batch(params, coords, tform0(coords))
+    for i in np.flatnonzero(success):
+        tform = tform_class()
+        assert tform.estimate(src[i], dst[i])
+        assert_almost_equal(params[i], tform.params)
+        assert_almost_equal(residuals[i],
+                            tform.residuals(coords, tform0(coords)))
+
+
+def test_piecewise_affine_points():
+    tform = PiecewiseAffineTransform()
+    tform.estimate(SRC, DST)
+    coords = np.random.RandomState(0).uniform(-15, 15, (200, 2))
+
+    # each point is mapped by the affine transform of its triangle
+    simplex = tform._tesselation.find_simplex(coords)
+    out = tform(coords)
+    assert_equal(out[simplex == -1], -1)
+    for index in np.unique(simplex[simplex >= 0]):
+        inside = simplex == index
+        assert_almost_equal(out[inside], tform.affines[index](coords[inside]))
+
+    # replacing the affine transforms updates the mapping
+    tform.affines = [AffineTransform(translation=(1, 2))] * len(tform.affines)
+    assert_almost_equal(tform(coords)[simplex >= 0],
+                        coords[simplex >= 0] + (1, 2))
+
+    # in-place changes are taken into account once the list is reassigned
+    tform.estimate(SRC, DST)
+    params = tform.affines[0].params
+    tform(coords)
+    assert tform.affines[0].params is params
+    tform.affines[0].params[:2, 2] += (1, 2)
+    tform.affines[1] = AffineTransform(translation=(3, 4))
+    tform.affines = tform.affines
+    inside = simplex == 0
+    assert_almost_equal(tform(coords)[inside],
+                        tform.affines[0](coords[inside]))
+    inside = simplex == 1
+    assert_almost_equal(tform(coords)[inside], coords[inside] + (3, 4))
+
+
+def test_piecewise_affine_cache_simplices():
+    tform = PiecewiseAffineTransform(cache_simplices=True)
+    tform.estimate(SRC, DST)
+    coords = np.random.RandomState(0).uniform(-15, 15, (200, 2))
+
+    expected = tform.inverse(coords)
+    cached_coords, simplex = tform._simplex_cache['inverse']
+    assert_equal(cached_coords, coords)
+    assert_equal(tform.inverse(coords.copy()), expected)
+    assert tform._simplex_cache['inverse'][1] is simplex
+
+    # other coordinates are located again
+    assert_almost_equal(tform.inverse(coords[:10]), expected[:10])
+    assert_almost_equal(tform(SRC), DST)
+
+    # the cache is cleared by a new estimation
+    tform.estimate(DST, SRC)
+    assert tform._simplex_cache == {}
+
+
 def test_fundamental_matrix_estimation():
     src = np.array([1.839035, 1.924743, 0.543582,  0.375221,
                     0.473240, 0.142522, 0.964910,  0.598376,
@@ -6,9 +6,10 @@ from skimage.transform import (warp, warp_coords, rotate, resize, rescale,
                                AffineTransform,
                                ProjectiveTransform,
                                SimilarityTransform,
-                               downscale_local_mean)
+                               downscale_local_mean, make_warp_plan)
 from skimage import transform as tf, data, img_as_float
 from skimage.color import rgb2gray
+from skimage._shared.utils import convert_to_float
 
 from skimage._shared import testing
 from skimage._shared.testing import (assert_almost_equal, assert_equal,
@@ -517,3 +518,221 @@ def test_zero_image_size():
     with testing.raises(ValueError):
         warp(np.zeros((10, 10, 0)),
              SimilarityTransform())
+
+
+@testing.parametrize('dtype', [np.uint8, np.int16, np.float32, bool])
+def test_warp_fast_dtypes(dtype):
+    image = (np.random.rand(20, 21) * 100).astype(dtype)
+    tform = AffineTransform(rotation=0.2, translation=(1.5, -2))
+    for preserve_range in (False, True):
+        expected = warp(convert_to_float(image, preserve_range)
+                        .astype(np.double), tform, order=1)
+        out = warp(image, tform, order=1, preserve_range=preserve_range)
+        assert out.dtype == (np.float32 if dtype == np.float32 else np.double)
+        assert_almost_equal(out, expected, decimal=5)
+
+
+def test_warp_fast_multichannel():
+    image = np.random.rand(20, 21, 4)
+    tform = ProjectiveTransform(np.array([[1, 0.1, 2],
+                                          [0.05, 0.9, -1],
+                                          [0.001, 0.002, 1]]))
+    for order in (0, 1, 3):
+        out = warp(image, tform, order=order, mode='reflect', clip=False)
+        for channel in range(image.shape[2]):
+            assert_equal(out[..., channel],
+                         warp(image[..., channel], tform, order=order,
+                              mode='reflect', clip=False))
+
+
+def test_warp_fast_3d():
+    image = np.random.rand(8, 9, 10)
+    # (col, row, plane) coordinates
+    matrix = np.array([[0.9, 0.1, 0, 1.2],
+                       [-0.1, 1.1, 0.05, 0.3],
+                       [0.02, 0, 0.95, -0.4],
+                       [0, 0, 0, 1]])
+    output_shape = (7, 8, 9)
+    pln, row, col = np.meshgrid(*[np.arange(n) for n in output_shape],
+                                indexing='ij')
+    col, row, pln, _ = np.tensordot(matrix, [col, row, pln, np.ones_like(col)],
+                                    axes=1)
+    for mode, ndi_mode in (('edge', 'nearest'), ('wrap', 'grid-wrap'),
+                           ('constant', 'grid-constant')):
+        expected = map_coordinates(image, [pln, row, col], order=1,
+                                   mode=ndi_mode, cval=0.5)
+        out = warp(image, matrix, output_shape=output_shape, order=1,
+                   mode=mode, cval=0.5, clip=False)
+        assert_almost_equal(out, expected)
+
+    # channels are interpolated independently
+    volumes = np.stack([image, 1 - image], axis=-1)
+    out = warp(volumes, matrix, output_shape=output_shape, order=3,
+               clip=False)
+    assert_almost_equal(out[..., 1], warp(1 - image, matrix,
+                                          output_shape=output_shape,
+                                          order=3, clip=False))
+
+    # other orders interpolate the same coordinates with map_coordinates
+    for order in (2, 4, 5):
+        expected = map_coordinates(image, [pln, row, col], order=order,
+                                   mode='reflect')
+        out = warp(image, matrix, output_shape=output_shape, order=order,
+                   mode='symmetric', clip=False)
+        assert_almost_equal(out, expected)
+        out = warp(volumes, matrix, output_shape=output_shape, order=order,
+                   mode='symmetric', clip=False)
+        assert_almost_equal(out[..., 0], expected)
+    assert warp(image, np.eye(4), order=2).shape == image.shape
+    with testing.raises(ValueError):
+        warp(image[0], np.eye(4), order=2)
+
+
+def test_warp_fast_num_threads():
+    image = np.random.rand(31, 30, 3)
+    tform = AffineTransform(scale=(1.2, 0.8), rotation=0.4)
+    expected = warp(image, tform, order=3)
+    for num_threads in (2, 3, 8):
+        assert_equal(warp(image, tform, order=3, num_threads=num_threads),
+                     expected)
+    assert_equal(rotate(image, 30, num_threads=2), rotate(image, 30))
+    assert_equal(resize(image, (40, 17), num_threads=2),
+                 resize(image, (40, 17)))
+
+
+def test_resize_3d_fast():
+    image = np.random.rand(6, 7, 8)
+    output_shape = (9, 5, 12)
+    factors = np.array(image.shape) / np.array(output_shape)
+    coords = np.meshgrid(*[f * (np.arange(n) + 0.5) - 0.5
+                           for f, n in zip(factors, output_shape)],
+                         indexing='ij')
+    expected = map_coordinates(image, coords, order=1, mode='nearest')
+    out = resize(image, output_shape, order=1, mode='edge',
+                 anti_aliasing=False)
+    assert_almost_equal(out, expected)
+
+
+@testing.parametrize('order', [0, 1, 3])
+@testing.parametrize('mode', ['constant', 'edge', 'symmetric', 'reflect',
+                              'wrap'])
+def test_resize_separable(order, mode):
+    image = np.random.rand(23, 17, 3)
+    for output_shape in [(7, 40), (50, 5), (1, 1)]:
+        factors = np.array(image.shape[:2]) / output_shape
+        matrix = np.array([[factors[1], 0, factors[1] / 2 - 0.5],
+                           [0, factors[0], factors[0] / 2 - 0.5],
+                           [0, 0, 1]])
+        expected = warp(image, matrix, output_shape=output_shape, order=order,
+                        mode=mode, cval=0.3)
+        out = resize(image, output_shape, order=order, mode=mode, cval=0.3,
+                     anti_aliasing=False)
+        assert_almost_equal(out, expected)
+
+
+def test_resize_separable_dtype():
+    image = np.random.rand(10, 12).astype(np.float32)
+    out = resize(image, (5, 30), order=3, anti_aliasing=False)
+    assert out.dtype == np.float32
+    assert_almost_equal(out, resize(image.astype(np.double), (5, 30),
+                                    order=3, anti_aliasing=False),
+                        decimal=5)
+
+    image = (image * 255).astype(np.uint8)
+    assert_almost_equal(resize(image, (5, 30), anti_aliasing=False),
+                        resize(img_as_float(image), (5, 30),
+                               anti_aliasing=False))
+
+
+def test_resize_area():
+    image = np.random.rand(12, 18, 9)
+    out = resize(image, (4, 6, 3), anti_aliasing='area')
+    assert_almost_equal(out, downscale_local_mean(image, (3, 3, 3)))
+
+    # the weights of every output pixel sum to one
+    out = resize(image, (5, 7, 4), anti_aliasing='area')
+    assert_almost_equal(out.mean(), image.mean())
+    out = resize(np.ones((10, 11)), (3, 4), anti_aliasing='area')
+    assert_almost_equal(out, 1)
+
+    # up-sampled axes are interpolated
+    out = resize(image[..., 0], (24, 6), anti_aliasing='area')
+    expected = resize(downscale_local_mean(image[..., 0], (1, 3)), (24, 6),
+                      anti_aliasing=False)
+    assert_almost_equal(out, expected)
+
+    with testing.raises(ValueError):
+        resize(image, (4, 6, 3), anti_aliasing='box')
+    for order in (2, 4, 5):
+        with testing.raises(ValueError):
+            resize(image[..., 0], (24, 6), order=order, anti_aliasing='area')
+
+
+@testing.parametrize('order', [0, 1, 3])
+@testing.parametrize('mode', ['constant', 'edge', 'symmetric', 'reflect',
+                              'wrap'])
+def test_warp_plan(order, mode):
+    image = np.random.rand(40, 50, 3)
+    tform = ProjectiveTransform(np.array([[1, 0.1, 2],
+                                          [0.05, 0.9, -1],
+                                          [0.001, 0.002, 1]]))
+    plan = make_warp_plan(tform, image.shape, output_shape=(45, 47),
+                          order=order, mode=mode, cval=0.2, dtype=np.double)
+    expected = warp(image, tform, output_shape=(45, 47), order=order,
+                    mode=mode, cval=0.2)
+    assert_almost_equal(plan(image), expected)
+    # the output is clipped to the range of the warped channels
+    assert_almost_equal(plan(image[..., 1], clip=False),
+                        warp(image[..., 1], tform, output_shape=(45, 47),
+                             order=order, mode=mode, cval=0.2, clip=False))
+
+    plan = make_warp_plan(tform.inverse, image.shape[:2], order=order,
+                          mode=mode)
+    assert plan.weights.dtype == np.float32
+    assert plan.index.dtype == np.int32
+    assert_almost_equal(plan(image), warp(image, tform.inverse, order=order,
+                                          mode=mode), decimal=5)
+
+
+def test_warp_plan_dtypes():
+    image = (np.random.rand(30, 20) * 255).astype(np.uint8)
+    tform = SimilarityTransform(scale=1.1, rotation=0.3)
+    plan = make_warp_plan(tform, image.shape)
+    assert_almost_equal(plan(image), warp(image, tform), decimal=5)
+    assert_almost_equal(plan(image, preserve_range=True),
+                        warp(image, tform, preserve_range=True), decimal=4)
+    assert plan(image.astype(np.float32)).dtype == np.float32
+
+    with testing.raises(ValueError):
+        plan(image[1:])
+
+
+def test_warp_plan_maps():
+    image = np.random.rand(40, 50)
+
+    def shift(xy):
+        xy[:, 1] -= 3.5
+        xy[:, 0] += 0.3
+        return xy
+
+    plan = make_warp_plan(shift, image.shape, mode='edge', dtype=np.double)
+    assert_almost_equal(plan(image), warp(image, shift, mode='edge'))
+
+    # 3-D matrices and coordinate arrays
+    volume = np.random.rand(8, 9, 10)
+    matrix = np.array([[0.9, 0.1, 0, 1.2],
+                       [-0.1, 1.1, 0.05, 0.3],
+                       [0.02, 0, 0.95, -0.4],
+                       [0, 0, 0, 1]])
+    plan = make_warp_plan(matrix, volume.shape, dtype=np.double)
+    assert_almost_equal(plan(volume), warp(volume, matrix))
+
+    coords = np.mgrid[:5, :6, :7] * 1.3
+    plan = make_warp_plan(coords, volume.shape, mode='edge')
+    assert plan.output_shape == (5, 6, 7)
+    assert_almost_equal(plan(volume),
+                        map_coordinates(volume, coords, order=1,
+                                        mode='nearest'), decimal=5)
+
+    with testing.raises(ValueError):
+        make_warp_plan(matrix, volume.shape, order=2)